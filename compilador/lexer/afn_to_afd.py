@@ -1,13 +1,22 @@
+from collections import deque
+
+# Tipo de token dos estados finais quando o AFN não informa `token_types`
+DEFAULT_TOKEN = 'ACCEPT'
+
+
 class NFA:
     """
     Estrutura para representar um Autômato Finito Não-Determinístico (AFN).
     """
-    def __init__(self, states, alphabet, transitions, start_state, final_states):
+    def __init__(self, states, alphabet, transitions, start_state, final_states, token_types=None):
         self.states = states
         self.alphabet = alphabet
         self.transitions = transitions  # Dicionário: (state, symbol) -> set of states
         self.start_state = start_state
         self.final_states = final_states
+        # Dicionário opcional: estado final -> tipo de token. A ordem das chaves
+        # é a prioridade usada quando um estado do AFD contém vários finais.
+        self.token_types = token_types
 
 def epsilon_closure(nfa: NFA, states: set):
     """
@@ -36,48 +45,89 @@ def move(nfa: NFA, states: set, symbol: str):
         result.update(next_states)
     return frozenset(result)
 
+def _token_resolver(nfa: NFA):
+    """
+    Retorna a função que dá o tipo de token de um estado do AFD (None se
+    ele não for final). A prioridade dos tipos é calculada uma única vez.
+    """
+    final_states = nfa.final_states
+    token_types = nfa.token_types or {}
+    priority = {state: i for i, state in enumerate(token_types)}
+    lowest = len(priority)
+
+    def state_token(nfa_states):
+        finals = [s for s in nfa_states if s in final_states]
+        if not finals:
+            return None
+        best = min(finals, key=lambda s: priority.get(s, lowest))
+        return token_types.get(best, DEFAULT_TOKEN)
+    return state_token
+
 def convert_nfa_to_dfa(nfa: NFA):
     """
     Implementação do algoritmo de construção de subconjuntos para converter um AFN em AFD.
+
+    Os estados pendentes ficam em uma fila (deque) e os fechos-épsilon são
+    memorizados: por estado do AFN e por conjunto (frozenset) já visto.
     """
-    dfa_states = set()
+    # Índice estado -> [(símbolo, destinos)], sem as transições em épsilon
+    symbol_moves = {}
+    for (state, symbol), targets in nfa.transitions.items():
+        if symbol != '' and symbol in nfa.alphabet:
+            symbol_moves.setdefault(state, []).append((symbol, targets))
+
+    state_token = _token_resolver(nfa)
+    state_closures = {}
+    set_closures = {}
+
+    def closure(states):
+        result = set_closures.get(states)
+        if result is None:
+            union = set()
+            for state in states:
+                state_closure = state_closures.get(state)
+                if state_closure is None:
+                    state_closure = state_closures[state] = epsilon_closure(nfa, {state})
+                union |= state_closure
+            result = set_closures[states] = frozenset(union)
+        return result
+
     dfa_transitions = {}
-    dfa_start_state = epsilon_closure(nfa, {nfa.start_state})
+    dfa_start_state = closure(frozenset([nfa.start_state]))
     dfa_final_states = set()
+    dfa_token_types = {}
+
+    unmarked_states = deque([dfa_start_state])
 
-    unmarked_states = [dfa_start_state]
-    dfa_states.add(dfa_start_state)
-    
     # Mapeia os estados do AFD (frozensets) para nomes mais simples (ex: S0, S1)
     state_map = {dfa_start_state: "S0"}
-    next_state_id = 1
 
     while unmarked_states:
-        current_dfa_state_set = unmarked_states.pop(0)
-        
+        current_dfa_state_set = unmarked_states.popleft()
+        current_state_name = state_map[current_dfa_state_set]
+
         # Se qualquer estado do AFN no conjunto atual for final, o estado do AFD é final.
-        if any(s in nfa.final_states for s in current_dfa_state_set):
-            dfa_final_states.add(state_map[current_dfa_state_set])
+        token_type = state_token(current_dfa_state_set)
+        if token_type is not None:
+            dfa_final_states.add(current_state_name)
+            dfa_token_types[current_state_name] = token_type
 
-        for symbol in nfa.alphabet:
-            # Calcula o próximo estado do AFD
-            next_nfa_states = move(nfa, current_dfa_state_set, symbol)
-            next_dfa_state_set = epsilon_closure(nfa, next_nfa_states)
+        # Agrupa, em uma só passada, os destinos de cada símbolo
+        moves = {}
+        for state in current_dfa_state_set:
+            for symbol, targets in symbol_moves.get(state, ()):
+                moves.setdefault(symbol, set()).update(targets)
 
-            if not next_dfa_state_set:
-                continue
+        for symbol in sorted(moves):
+            next_dfa_state_set = closure(frozenset(moves[symbol]))
 
-            if next_dfa_state_set not in dfa_states:
-                dfa_states.add(next_dfa_state_set)
+            if next_dfa_state_set not in state_map:
                 unmarked_states.append(next_dfa_state_set)
                 # Adiciona um novo nome para o novo estado do AFD
-                state_map[next_dfa_state_set] = f"S{next_state_id}"
-                next_state_id += 1
-            
+                state_map[next_dfa_state_set] = f"S{len(state_map)}"
+
             # Adiciona a transição ao AFD
-            current_state_name = state_map[current_dfa_state_set]
-            next_state_name = state_map[next_dfa_state_set]
-            dfa_transitions[(current_state_name, symbol)] = next_state_name
+            dfa_transitions[(current_state_name, symbol)] = state_map[next_dfa_state_set]
 
     # Retorna uma representação simplificada do AFD
     return {
@@ -85,5 +135,137 @@ def convert_nfa_to_dfa(nfa: NFA):
         "alphabet": nfa.alphabet,
         "transitions": dfa_transitions,
         "start_state": state_map[dfa_start_state],
-        "final_states": dfa_final_states
-    }
\ No newline at end of file
+        "final_states": dfa_final_states,
+        "token_types": dfa_token_types
+    }
+
+def minimize_dfa(dfa: dict):
+    """
+    Minimiza o AFD (no formato retornado por `convert_nfa_to_dfa`) com o
+    algoritmo de Hopcroft.
+
+    A partição inicial separa os estados por tipo de token, de modo que
+    tokens diferentes nunca são fundidos. Transições ausentes levam a um
+    estado morto implícito; estados equivalentes a ele (que nunca chegam
+    a aceitar) são descartados, junto com as transições para eles.
+    """
+    names = sorted(dfa["states"], key=lambda name: (len(name), name))
+    index = {name: i for i, name in enumerate(names)}
+    dead = len(names)
+    symbols = sorted({symbol for (_, symbol) in dfa["transitions"]})
+    token_types = dfa.get("token_types", {})
+
+    # Transições inversas: símbolo -> destino -> origens
+    inverse = {symbol: {} for symbol in symbols}
+    defined = {symbol: set() for symbol in symbols}
+    for (source, symbol), target in dfa["transitions"].items():
+        inverse[symbol].setdefault(index[target], []).append(index[source])
+        defined[symbol].add(index[source])
+    for symbol in symbols:
+        missing = [state for state in range(dead + 1) if state not in defined[symbol]]
+        inverse[symbol].setdefault(dead, []).extend(missing)
+
+    # Partição inicial: um bloco por tipo de token, mais os não finais
+    groups = {}
+    for name in names:
+        label = token_types.get(name, DEFAULT_TOKEN) if name in dfa["final_states"] else None
+        groups.setdefault(label, set()).add(index[name])
+    groups.setdefault(None, set()).add(dead)
+
+    blocks = []
+    block_of = [0] * (dead + 1)
+    for label in sorted(groups, key=lambda label: (label is not None, str(label))):
+        for state in groups[label]:
+            block_of[state] = len(blocks)
+        blocks.append(groups[label])
+
+    worklist = deque(range(len(blocks)))
+    in_worklist = set(worklist)
+
+    while worklist:
+        splitter = worklist.popleft()
+        in_worklist.discard(splitter)
+        splitter_states = list(blocks[splitter])
+        for symbol in symbols:
+            inverse_symbol = inverse[symbol]
+            # Estados com transição, por este símbolo, para dentro do bloco
+            touched = {}
+            for target in splitter_states:
+                for source in inverse_symbol.get(target, ()):
+                    touched.setdefault(block_of[source], set()).add(source)
+
+            for block, inside in touched.items():
+                if len(inside) == len(blocks[block]):
+                    continue
+                blocks[block] -= inside
+                new_block = len(blocks)
+                blocks.append(inside)
+                for state in inside:
+                    block_of[state] = new_block
+                if block in in_worklist:
+                    worklist.append(new_block)
+                    in_worklist.add(new_block)
+                else:
+                    smaller = new_block if len(inside) <= len(blocks[block]) else block
+                    worklist.append(smaller)
+                    in_worklist.add(smaller)
+
+    # Renomeia os blocos em largura a partir do estado inicial (S0, S1, ...)
+    dead_block = block_of[dead]
+    representative = {}
+    for state in range(dead):
+        representative.setdefault(block_of[state], state)
+    moves = {}
+    for (source, symbol), target in dfa["transitions"].items():
+        moves.setdefault(index[source], []).append((symbol, index[target]))
+
+    start_block = block_of[index[dfa["start_state"]]]
+    block_names = {}
+    transitions = {}
+    final_states = set()
+    minimized_tokens = {}
+    queue = deque()
+    if start_block != dead_block:
+        block_names[start_block] = "S0"
+        queue.append(start_block)
+    while queue:
+        block = queue.popleft()
+        name = block_names[block]
+        state = names[representative[block]]
+        if state in dfa["final_states"]:
+            final_states.add(name)
+            minimized_tokens[name] = token_types.get(state, DEFAULT_TOKEN)
+        for symbol, target in sorted(moves.get(representative[block], ())):
+            target_block = block_of[target]
+            if target_block == dead_block:
+                continue
+            if target_block not in block_names:
+                block_names[target_block] = f"S{len(block_names)}"
+                queue.append(target_block)
+            transitions[(name, symbol)] = block_names[target_block]
+
+    return {
+        "states": set(block_names.values()),
+        "alphabet": dfa["alphabet"],
+        "transitions": transitions,
+        "start_state": "S0" if block_names else None,
+        "final_states": final_states,
+        "token_types": minimized_tokens
+    }
+
+def to_runtime_tables(dfa: dict):
+    """
+    Converte o AFD para o formato do `DFA` usado pelo lexer (parser.py):
+    transições {estado: {símbolo: próximo}} e estados de aceitação
+    {estado: tipo de token}. O estado inicial precisa se chamar 'S0',
+    como nos AFDs gerados por `convert_nfa_to_dfa` e `minimize_dfa`.
+    """
+    if dfa["start_state"] not in (None, "S0"):
+        raise ValueError(f"O estado inicial deve ser 'S0', não '{dfa['start_state']}'")
+    transitions = {}
+    for (state, symbol), target in dfa["transitions"].items():
+        transitions.setdefault(state, {})[symbol] = target
+    token_types = dfa.get("token_types", {})
+    accepting_states = {state: token_types.get(state, DEFAULT_TOKEN)
+                        for state in dfa["final_states"]}
+    return transitions, accepting_states
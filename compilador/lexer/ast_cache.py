@@ -0,0 +1,248 @@
+"""
+CACHE DE PROGRAMAS COMPILADOS (.coffeec)
+========================================
+
+Guarda, em um diretório `.coffeec` ao lado de cada programa (como o
+`__pycache__` do Python), a AST já validada pela análise semântica e a
+tabela de símbolos produzida por SemanticAnalyzer.analyze.
+
+A chave de cada entrada é o hash do código-fonte junto com a versão do
+compilador (hash dos módulos do front-end e versão do Python); qualquer
+mudança em um dos dois invalida a entrada. A AST é gravada como tuplas
+aninhadas com `marshal` (comprimidas com zlib), com a posição de cada
+nó e sem referências a classes, o que deixa o arquivo pequeno e a
+leitura mais rápida que refazer as três fases.
+
+O programa nunca é lido inteiro na memória: o hash é calculado em
+blocos e, quando o cache não tem a entrada, o lexer lê o arquivo em
+blocos (StreamLexer). A chave gravada é o hash dos bytes que o lexer
+leu, então uma mudança no arquivo entre as duas leituras não associa a
+AST nova à chave antiga.
+
+Só programas sem erros entram no cache.
+"""
+
+import hashlib
+import io
+import marshal
+import os
+import sys
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(__file__))
+from parser import (Parser, ProgramNode, DisplayStatementNode, AssignmentStatementNode,
+                    LoadExpressionNode, FilterExpressionNode, SelectExpressionNode,
+                    RelationalExpressionNode, TermNode)
+from fast_lexer import create_lexer
+from semantic_analyzer import SemanticAnalyzer, Symbol, DataType
+
+CACHE_DIR = '.coffeec'
+CACHE_FORMAT = 2
+
+# Bytes lidos por vez ao calcular o hash do código-fonte
+HASH_BLOCK_SIZE = 1 << 16
+
+# Módulos cujo conteúdo define a versão do compilador
+COMPILER_MODULES = ('parser.py', 'semantic_analyzer.py', 'tabelas_lexicas.py', 'fast_lexer.py',
+                    'ast_cache.py', os.path.join('..', 'lib', 'utils', 'source_location.py'))
+
+# Rótulos das tuplas que representam cada tipo de nó
+DISPLAY, ASSIGNMENT, LOAD, FILTER, SELECT, RELATIONAL, TERM = range(7)
+
+
+@dataclass
+class CompiledProgram:
+    """Resultado da compilação de um arquivo, vindo do cache ou não"""
+    ast: ProgramNode
+    symbol_table: Dict[str, Symbol]
+    warnings: List[str] = field(default_factory=list)
+    errors: List[Any] = field(default_factory=list)
+    from_cache: bool = False
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+
+@lru_cache(maxsize=1)
+def compiler_version() -> str:
+    """Identifica o compilador: hash dos módulos do front-end e da versão do Python"""
+    digest = hashlib.sha256(repr((CACHE_FORMAT, sys.version_info[:2])).encode('utf-8'))
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in COMPILER_MODULES:
+        with open(os.path.join(directory, module), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def source_digest():
+    """Hash de um código-fonte, já iniciado com a versão do compilador"""
+    return hashlib.sha256(compiler_version().encode('ascii'))
+
+def cache_key(source) -> str:
+    """
+    Chave de uma entrada: hash do código-fonte com a versão do compilador.
+    `source` são os bytes do programa ou um arquivo binário aberto, lido
+    em blocos de HASH_BLOCK_SIZE.
+    """
+    digest = source_digest()
+    if isinstance(source, bytes):
+        digest.update(source)
+    else:
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_path(path: str) -> str:
+    """Arquivo do cache correspondente ao programa em `path`"""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIR, name + '.ast')
+
+
+def encode_node(node):
+    """Converte um nó da AST em tuplas aninhadas (apenas tipos do marshal)"""
+    if isinstance(node, DisplayStatementNode):
+        return (DISPLAY, node.line, node.col, node.identifier)
+    if isinstance(node, AssignmentStatementNode):
+        return (ASSIGNMENT, node.line, node.col, node.identifier, encode_node(node.expression))
+    if isinstance(node, LoadExpressionNode):
+        return (LOAD, node.line, node.col, node.file_path)
+    if isinstance(node, FilterExpressionNode):
+        return (FILTER, node.line, node.col, node.dataset, encode_node(node.condition))
+    if isinstance(node, SelectExpressionNode):
+        return (SELECT, node.line, node.col, node.dataset, tuple(node.columns))
+    if isinstance(node, RelationalExpressionNode):
+        return (RELATIONAL, node.line, node.col, encode_node(node.left), node.operator,
+                encode_node(node.right))
+    if isinstance(node, TermNode):
+        return (TERM, node.line, node.col, node.value, node.type)
+    raise TypeError(f"Nó sem representação no cache: {type(node).__name__}")
+
+def decode_node(data):
+    """Reconstrói o nó da AST a partir das tuplas de encode_node"""
+    tag, line, col = data[0], data[1], data[2]
+    if tag == DISPLAY:
+        return DisplayStatementNode(data[3], line, col)
+    if tag == ASSIGNMENT:
+        return AssignmentStatementNode(data[3], decode_node(data[4]), line, col)
+    if tag == LOAD:
+        return LoadExpressionNode(data[3], line, col)
+    if tag == FILTER:
+        return FilterExpressionNode(data[3], decode_node(data[4]), line, col)
+    if tag == SELECT:
+        return SelectExpressionNode(data[3], list(data[4]), line, col)
+    if tag == RELATIONAL:
+        return RelationalExpressionNode(decode_node(data[3]), data[4], decode_node(data[5]), line, col)
+    if tag == TERM:
+        return TermNode(data[3], data[4], line, col)
+    raise ValueError(f"Rótulo de nó desconhecido no cache: {tag}")
+
+def encode_symbols(symbol_table: Dict[str, Symbol]):
+    return tuple((symbol.name, symbol.type.value, symbol.is_initialized, symbol.metadata,
+                  symbol.usage_count)
+                 for symbol in symbol_table.values())
+
+def decode_symbols(data) -> Dict[str, Symbol]:
+    symbol_table = {}
+    for name, type_value, is_initialized, metadata, usage_count in data:
+        symbol = Symbol(name, DataType(type_value), is_initialized, metadata)
+        symbol.usage_count = usage_count
+        symbol_table[name] = symbol
+    return symbol_table
+
+
+def read_cache(path: str, key: str):
+    """Entrada do cache para `key`, ou None se ausente, corrompida ou de outra versão"""
+    try:
+        with open(cache_path(path), 'rb') as f:
+            entry = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, EOFError, ValueError, TypeError, zlib.error):
+        return None
+    if not isinstance(entry, dict) or entry.get('key') != key:
+        return None
+    return CompiledProgram(
+        ast=ProgramNode([decode_node(statement) for statement in entry['ast']], 1, 1),
+        symbol_table=decode_symbols(entry['symbols']),
+        warnings=list(entry['warnings']),
+        from_cache=True,
+    )
+
+def write_cache(path: str, key: str, program: CompiledProgram) -> bool:
+    """Grava a entrada de forma atômica; falhas de escrita apenas desativam o cache"""
+    entry = {
+        'key': key,
+        'ast': tuple(encode_node(statement) for statement in program.ast.statements),
+        'symbols': encode_symbols(program.symbol_table),
+        'warnings': tuple(program.warnings),
+    }
+    target = cache_path(path)
+    temporary = f'{target}.{os.getpid()}.tmp'
+    try:
+        data = zlib.compress(marshal.dumps(entry), 1)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, target)
+    except (OSError, ValueError):
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+class HashingReader(io.RawIOBase):
+    """Arquivo binário que atualiza `digest` com cada bloco lido dele"""
+
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.raw.readinto(buffer)
+        if count:
+            self.digest.update(memoryview(buffer)[:count])
+        return count
+
+def compile_source(source, fast: bool = False) -> CompiledProgram:
+    """
+    Executa as fases léxica, sintática e semântica (lança SyntaxError/
+    ValueError). `source` é uma string ou um stream de texto.
+    """
+    ast = Parser(create_lexer(source, fast=fast)).parse()
+    success, errors, info = SemanticAnalyzer(debug=False).analyze(ast)
+    return CompiledProgram(ast, info['symbol_table'], list(info['warnings']), list(errors))
+
+def load_program(path: str, fast: bool = False, use_cache: bool = True) -> CompiledProgram:
+    """
+    Compila o programa em `path`, usando a entrada do `.coffeec` quando
+    o código-fonte e o compilador não mudaram desde a última compilação.
+    """
+    if not use_cache:
+        with open(path, 'r', encoding='utf-8') as f:
+            return compile_source(f, fast=fast)
+
+    with open(path, 'rb') as f:
+        program = read_cache(path, cache_key(f))
+    if program is not None:
+        return program
+
+    # O lexer lê o texto em blocos (com novas linhas universais, como o
+    # open() em modo texto) enquanto os bytes lidos entram no hash
+    digest = source_digest()
+    with open(path, 'rb') as f:
+        reader = HashingReader(f, digest)
+        text = io.TextIOWrapper(io.BufferedReader(reader, HASH_BLOCK_SIZE), encoding='utf-8')
+        program = compile_source(text, fast=fast)
+        # Bytes que o lexer não chegou a pedir (o parser para no EOF)
+        for _ in iter(lambda: reader.read(HASH_BLOCK_SIZE), b''):
+            pass
+    if program.success:
+        write_cache(path, digest.hexdigest(), program)
+    return program
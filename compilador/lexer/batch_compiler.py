@@ -0,0 +1,142 @@
+"""
+COMPILAÇÃO EM LOTE DE PROGRAMAS COFFEE
+======================================
+
+Percorre uma árvore de diretórios e executa as fases léxica, sintática
+e semântica de cada programa (.coffee e .dg) em um ProcessPoolExecutor.
+O resultado de cada arquivo é emitido assim que fica pronto, como uma
+linha JSON:
+
+    {"file": ..., "success": ..., "stage": ..., "errors": [...],
+     "warnings": [...], "times": {"parse": ..., "semantic": ..., "total": ...}}
+
+`stage` indica a última fase executada ('io', 'parse' ou 'semantic').
+A análise sintática usa o modo de recuperação do Parser, então todos os
+erros de sintaxe de um arquivo aparecem na mesma linha.
+
+Uso:
+    python batch_compiler.py DIRETORIO [--workers N] [--saida ARQUIVO] [--fast-lexer]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(__file__))
+from parser import Parser
+from fast_lexer import create_lexer
+from semantic_analyzer import SemanticAnalyzer
+
+DEFAULT_EXTENSIONS = ('.coffee', '.dg')
+
+# Arquivos enviados a um processo por vez: amortiza o custo de IPC
+# sem deixar processos ociosos no fim do lote
+MAX_CHUNK_SIZE = 64
+
+
+def available_cpus():
+    """Núcleos que este processo pode usar"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def find_sources(root, extensions=DEFAULT_EXTENSIONS):
+    """Caminhos dos programas sob `root`, em ordem determinística"""
+    sources = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        sources.extend(os.path.join(directory, name) for name in sorted(files)
+                       if name.endswith(extensions))
+    return sources
+
+def compile_file(path, fast=False):
+    """
+    Analisa um arquivo e devolve o resultado como um dicionário serializável
+    em JSON. Exceções viram erros do arquivo, na fase em que ocorreram, sem
+    interromper o lote.
+    """
+    result = {'file': path, 'success': False, 'stage': 'io', 'errors': [], 'warnings': [],
+              'times': {}}
+    start = time.perf_counter()
+    try:
+        with open(path, 'r', encoding='utf-8') as source_file:
+            result['stage'] = 'parse'
+            parser = Parser(create_lexer(source_file, fast=fast), recover=True)
+            ast = parser.parse()
+        parsed = time.perf_counter()
+        result['times']['parse'] = parsed - start
+
+        if parser.errors:
+            result['errors'] = [str(error) for error in parser.errors]
+        else:
+            result['stage'] = 'semantic'
+            success, errors, info = SemanticAnalyzer(debug=False).analyze(ast)
+            result['success'] = success
+            result['errors'] = [str(error) for error in errors]
+            result['warnings'] = list(info['warnings'])
+            result['times']['semantic'] = time.perf_counter() - parsed
+    except (OSError, UnicodeDecodeError) as e:
+        result['errors'].append(str(e))
+    except Exception as e:
+        # Falha do próprio compilador com este arquivo
+        result['success'] = False
+        result['errors'].append(f"{type(e).__name__}: {e}")
+
+    result['times']['total'] = time.perf_counter() - start
+    return result
+
+def _compile_fast(path):
+    return compile_file(path, fast=True)
+
+def compile_files(paths, workers=None, fast=False):
+    """
+    Gera os resultados de `paths` na ordem da entrada, cada um assim que
+    ele e os anteriores ficam prontos. Com workers=1 tudo roda no
+    próprio processo.
+    """
+    workers = workers or available_cpus()
+    function = _compile_fast if fast else compile_file
+    if workers == 1:
+        yield from map(function, paths)
+        return
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, paths, chunksize=chunk_size)
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        prog='batch_compiler.py',
+        description='Analisa em paralelo todos os programas Coffee de um diretório')
+    arg_parser.add_argument('diretorio', help='raiz da árvore de programas')
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help='número de processos (padrão: núcleos disponíveis)')
+    arg_parser.add_argument('--saida', default=None,
+                            help='arquivo JSON lines de saída (padrão: saída padrão)')
+    arg_parser.add_argument('--fast-lexer', action='store_true',
+                            help='usa o FastLexer (regex) na análise léxica')
+    args = arg_parser.parse_args()
+
+    paths = find_sources(args.diretorio)
+    output = open(args.saida, 'w', encoding='utf-8') if args.saida else sys.stdout
+    failures = 0
+    start = time.perf_counter()
+    try:
+        for result in compile_files(paths, workers=args.workers, fast=args.fast_lexer):
+            failures += not result['success']
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    rate = len(paths) / elapsed if elapsed > 0 else 0
+    print(f"{len(paths)} arquivos | {len(paths) - failures} sem erros | {failures} com erros | "
+          f"{elapsed:.2f}s ({rate:,.0f} arquivos/s)", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -4,15 +4,34 @@ do interpretador Coffee. Inclui programas de teste e comparações
 com implementações equivalentes.
 """
 
+import contextlib
+import gc
+import io
 import time
 import sys
+import tracemalloc
 import os
+import tempfile
 import pandas as pd
 from typing import Dict, List, Tuple, Any
 
 # Importa o interpretador
 sys.path.append(os.path.dirname(__file__))
 from coffee_interpreter import *
+from semantic_analyzer import SemanticAnalyzer
+from fast_lexer import FastLexer, create_lexer, precompiled_dfa
+from token_buffer import tokenize_all
+from incremental_lexer import IncrementalLexer
+from afn_to_afd import NFA, convert_nfa_to_dfa, minimize_dfa, to_runtime_tables
+from batch_compiler import available_cpus, compile_files, find_sources
+from flat_ast import FlatAST, FILTER
+from skeleton_parser import parse_skeleton, statement_dependencies
+from incremental_semantic import IncrementalSemanticAnalyzer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from lib.lexer.analisador_lexico import AnalisadorLexico, AnalisadorLexicoPorAfd
+from lib.parser.descendente.parser_ll1 import ParserLL1
+from lib.parser.ascendente.parser_lr import ParserLR
 
 class BenchmarkSuite:
     """Suite de benchmarks para o interpretador Coffee"""
@@ -51,7 +70,7 @@ class BenchmarkSuite:
         """Executa um benchmark individual"""
         try:
             # Parse do programa
-            coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
+            coffee_dfa = CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
             lexer = Lexer(program, coffee_dfa)
             parser = Parser(lexer)
             ast = parser.parse()
@@ -209,7 +228,7 @@ resultado = select filtrados (produto, preco)
             # Tempo Coffee
             start = time.time()
             try:
-                coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
+                coffee_dfa = CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
                 lexer = Lexer(coffee_program, coffee_dfa)
                 parser = Parser(lexer)
                 ast = parser.parse()
@@ -255,6 +274,718 @@ resultado = select filtrados (produto, preco)
             'pandas_times': pandas_times
         }
 
+def generate_pipeline_program(target_bytes: int) -> str:
+    """Gera um programa Coffee sintético com aproximadamente `target_bytes` caracteres"""
+    blocks = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        block = (
+            f'# etapa {i} do pipeline gerado\n'
+            f'base_{i} = load "dados_{i}.csv"\n'
+            f'filtro_{i} = filter base_{i} where valor >= {i}.5\n'
+            f'final_{i} = select filtro_{i} (id, nome, valor)\n'
+            f'display final_{i}\n'
+        )
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    return ''.join(blocks)
+
+class LexerScalingBenchmark:
+    """Mede a vazão do lexer (tokens/s) em entradas de tamanhos crescentes"""
+    
+    DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000, 50_000_000]
+    
+    def __init__(self, sizes: List[int] = None, engines: Dict[str, Any] = None):
+        self.sizes = sizes or self.DEFAULT_SIZES
+        # Cada motor é uma fábrica: código-fonte -> lexer
+        self.engines = engines or {
+            'DFA': lambda source: Lexer(source, DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)),
+            'CompiledDFA': lambda source: Lexer(source, CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)),
+            'Tabelas pré-compiladas': lambda source: Lexer(source, precompiled_dfa()),
+            'FastLexer': FastLexer
+        }
+        self.results: List[Dict[str, Any]] = []
+    
+    def run(self) -> Dict[str, Any]:
+        """Tokeniza cada entrada e verifica se a vazão se mantém estável"""
+        print("\n" + "="*60)
+        print("ESCALABILIDADE DO LEXER")
+        print("="*60)
+        
+        stability = {}
+        for engine_name, create_engine_lexer in self.engines.items():
+            print(f"\nMotor: {engine_name}")
+            engine_results = []
+            
+            for size in self.sizes:
+                program = generate_pipeline_program(size)
+                lexer = create_engine_lexer(program)
+                
+                token_count = 0
+                start = time.perf_counter()
+                while lexer.next_token().type != TokenType.EOF:
+                    token_count += 1
+                elapsed = time.perf_counter() - start
+                
+                tokens_per_second = token_count / elapsed if elapsed > 0 else 0
+                engine_results.append({
+                    'engine': engine_name,
+                    'bytes': len(program),
+                    'tokens': token_count,
+                    'time': elapsed,
+                    'tokens_per_second': tokens_per_second
+                })
+                print(f"{len(program):>12,} bytes | {token_count:>10,} tokens | "
+                      f"{elapsed:8.3f}s | {tokens_per_second:>12,.0f} tokens/s")
+            
+            rates = [r['tokens_per_second'] for r in engine_results]
+            # Com varredura linear a vazão da maior entrada deve ficar próxima à da menor
+            stability[engine_name] = min(rates) / max(rates) if rates and max(rates) > 0 else 0
+            print(f"Estabilidade da vazão (mín/máx): {stability[engine_name]:.2f}")
+            self.results.extend(engine_results)
+        
+        return {
+            'results': self.results,
+            'throughput_stability': stability
+        }
+
+class IncrementalLexerBenchmark:
+    """Compara re-tokenização incremental com tokenização completa após uma edição"""
+    
+    def __init__(self, total_lines: int = 50_000, edited_line: int = 10_000, keystrokes: int = 20):
+        self.total_lines = total_lines
+        self.edited_line = edited_line
+        self.keystrokes = keystrokes
+    
+    def run(self) -> Dict[str, Any]:
+        """Simula a digitação de um identificador na linha editada"""
+        print("\n" + "="*60)
+        print("LEXER INCREMENTAL")
+        print("="*60)
+        
+        # As linhas geradas têm em média ~37 caracteres
+        program = generate_pipeline_program(self.total_lines * 37)
+        lines = program.split('\n')
+        offset = sum(len(line) + 1 for line in lines[:self.edited_line - 1])
+        
+        incremental = IncrementalLexer(program)
+        incremental_times = []
+        full_times = []
+        changed_tokens = 0
+        
+        for i in range(self.keystrokes):
+            start = time.perf_counter()
+            change = incremental.edit(offset + i, 0, 'x')
+            incremental_times.append(time.perf_counter() - start)
+            changed_tokens = max(changed_tokens, change.new_stop - change.first)
+            
+            start = time.perf_counter()
+            full = tokenize_all(incremental.source)
+            full_times.append(time.perf_counter() - start)
+        
+        consistent = (list(full.types) == list(incremental.buffer.types) and
+                      list(full.starts) == list(incremental.buffer.starts) and
+                      list(full.source_map.line_starts) ==
+                      list(incremental.buffer.source_map.line_starts))
+        
+        incremental_avg = sum(incremental_times) / len(incremental_times)
+        full_avg = sum(full_times) / len(full_times)
+        speedup = full_avg / incremental_avg if incremental_avg > 0 else 0
+        
+        print(f"Linhas: {len(lines):,} | Tokens: {len(full):,} | Linha editada: {self.edited_line:,}")
+        print(f"Tokenização completa (média): {full_avg*1000:.3f} ms")
+        print(f"Re-tokenização incremental (média): {incremental_avg*1000:.3f} ms")
+        print(f"Tokens re-varridos por edição: {changed_tokens}")
+        print(f"Speedup: {speedup:.1f}x | Resultado idêntico: {'✓' if consistent else '✗'}")
+        
+        return {
+            'lines': len(lines),
+            'tokens': len(full),
+            'full_avg_time': full_avg,
+            'incremental_avg_time': incremental_avg,
+            'speedup': speedup,
+            'consistent': consistent
+        }
+
+def generate_word_nfa(num_words: int, seed: int = 42) -> Tuple[NFA, List[str]]:
+    """
+    Gera um AFN no estilo de Thompson para a união de `num_words` palavras
+    aleatórias: um estado inicial com transições épsilon para uma cadeia
+    de estados por palavra. O tipo de token depende do tamanho da palavra.
+    """
+    import random
+    rng = random.Random(seed)
+    words = sorted({''.join(rng.choice('abcdefgh') for _ in range(rng.randint(3, 10)))
+                    for _ in range(num_words)})
+    transitions = {}
+    final_states = set()
+    token_types = {}
+    next_state = 1
+    for word in words:
+        transitions.setdefault((0, ''), set()).add(next_state)
+        for char in word:
+            transitions[(next_state, char)] = {next_state + 1}
+            next_state += 1
+        final_states.add(next_state)
+        token_types[next_state] = 'CURTA' if len(word) < 6 else 'LONGA'
+        next_state += 1
+    nfa = NFA(set(range(next_state)), set('abcdefgh'), transitions, 0, final_states, token_types)
+    return nfa, words
+
+class NfaConversionBenchmark:
+    """Mede a conversão AFN -> AFD e a minimização de Hopcroft em um AFN grande"""
+    
+    def __init__(self, num_words: int = 2_000):
+        self.num_words = num_words
+    
+    def run(self) -> Dict[str, Any]:
+        """Converte, minimiza e valida o AFD resultante no DFA do lexer"""
+        print("\n" + "="*60)
+        print("CONVERSÃO AFN -> AFD")
+        print("="*60)
+        
+        nfa, words = generate_word_nfa(self.num_words)
+        
+        start = time.perf_counter()
+        dfa = convert_nfa_to_dfa(nfa)
+        convert_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        minimized = minimize_dfa(dfa)
+        minimize_time = time.perf_counter() - start
+        
+        transitions, accepting_states = to_runtime_tables(minimized)
+        runtime_dfa = DFA(transitions, accepting_states)
+        expected = {word: 'CURTA' if len(word) < 6 else 'LONGA' for word in words}
+        consistent = all(runtime_dfa.run(word) == (len(word), token_type)
+                         for word, token_type in expected.items())
+        
+        print(f"Estados do AFN: {len(nfa.states):,} | Palavras: {len(words):,}")
+        print(f"AFD (subconjuntos): {len(dfa['states']):,} estados em {convert_time*1000:.1f} ms")
+        print(f"AFD mínimo (Hopcroft): {len(minimized['states']):,} estados em {minimize_time*1000:.1f} ms")
+        print(f"Reconhece todas as palavras no DFA do lexer: {'✓' if consistent else '✗'}")
+        
+        return {
+            'nfa_states': len(nfa.states),
+            'dfa_states': len(dfa['states']),
+            'minimized_states': len(minimized['states']),
+            'convert_time': convert_time,
+            'minimize_time': minimize_time,
+            'consistent': consistent
+        }
+
+class AfdScannerBenchmark:
+    """Compara o autômato produto de lib/lexer com a execução de um AFD por vez"""
+    
+    def __init__(self, lines: int = 20_000, repetitions: int = 3):
+        self.lines = lines
+        self.repetitions = repetitions
+    
+    def _best_time(self, function) -> float:
+        times = []
+        for _ in range(self.repetitions):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    
+    def run(self) -> Dict[str, Any]:
+        """Mede o reconhecimento em cada posição e a tokenização completa"""
+        print("\n" + "="*60)
+        print("AFDS DE lib/lexer: PRODUTO x UM AFD POR VEZ")
+        print("="*60)
+        
+        source = ''.join(f'valor_{i} >= {i}.5 != total{i} == 42 < limite_{i}\n'
+                         for i in range(self.lines))
+        engines = {'Um AFD por vez': AnalisadorLexicoPorAfd(), 'Autômato produto': AnalisadorLexico()}
+        offsets = range(0, len(source), 7)
+        
+        results = {}
+        for name, engine in engines.items():
+            def match_everywhere():
+                for offset in offsets:
+                    engine.proximo_token(source, offset)
+            results[name] = {
+                'proximo_token': self._best_time(match_everywhere),
+                'tokenize': self._best_time(lambda: engine.tokenize(source)),
+            }
+            print(f"{name:>17}: proximo_token x{len(offsets):,} {results[name]['proximo_token']:.3f}s | "
+                  f"tokenize {results[name]['tokenize']:.3f}s")
+        
+        baseline, merged = results['Um AFD por vez'], results['Autômato produto']
+        consistent = ([(t.type, t.lexeme) for t in engines['Um AFD por vez'].tokenize(source)] ==
+                      [(t.type, t.lexeme) for t in engines['Autômato produto'].tokenize(source)])
+        print(f"Speedup proximo_token: {baseline['proximo_token'] / merged['proximo_token']:.1f}x | "
+              f"tokenize: {baseline['tokenize'] / merged['tokenize']:.1f}x | "
+              f"Resultado idêntico: {'✓' if consistent else '✗'}")
+        
+        results['consistent'] = consistent
+        return results
+
+def generate_statements(num_statements: int) -> str:
+    """Gera um script Coffee com `num_statements` comandos (load, filter, select e display)"""
+    templates = (
+        'base_{i} = load "dados_{i}.csv"\n',
+        'filtro_{i} = filter base_{i} where valor >= {i}.5\n',
+        'final_{i} = select filtro_{i} (id, nome, valor)\n',
+        'display final_{i}\n',
+    )
+    return ''.join(templates[n % 4].format(i=n // 4) for n in range(num_statements))
+
+class ParserBenchmark:
+    """Compara a vazão do Parser descendente recursivo, do ParserLL1 e do ParserLR"""
+    
+    def __init__(self, num_statements: int = 100_000, repetitions: int = 3):
+        self.num_statements = num_statements
+        self.repetitions = repetitions
+    
+    def run(self) -> Dict[str, Any]:
+        """Analisa o mesmo buffer de tokens com cada parser"""
+        print("\n" + "="*60)
+        print("PARSERS: RECURSIVO x LL(1) x LALR(1)")
+        print("="*60)
+        
+        # Os tokens são gerados uma vez para medir apenas a análise sintática
+        buffer = tokenize_all(generate_statements(self.num_statements))
+        parsers = {'Parser': Parser, 'ParserLL1': ParserLL1, 'ParserLR': ParserLR}
+        
+        results = {}
+        asts = {}
+        for name, parser_class in parsers.items():
+            times = []
+            for _ in range(self.repetitions):
+                start = time.perf_counter()
+                asts[name] = parser_class(buffer).parse()
+                times.append(time.perf_counter() - start)
+            results[name] = min(times)
+            print(f"{name:>10}: {self.num_statements:,} comandos em {results[name]:.3f}s "
+                  f"({self.num_statements / results[name]:,.0f} comandos/s)")
+        
+        reference = repr(asts['Parser'])
+        consistent = all(repr(ast) == reference for ast in asts.values())
+        print(f"LL(1) / recursivo: {results['ParserLL1'] / results['Parser']:.2f}x | "
+              f"LALR(1) / recursivo: {results['ParserLR'] / results['Parser']:.2f}x do tempo | "
+              f"AST idêntica: {'✓' if consistent else '✗'}")
+        
+        results['consistent'] = consistent
+        return results
+
+class AstMemoryBenchmark:
+    """Mede a memória da AST de objetos (nós com __slots__) e da FlatAST"""
+    
+    def __init__(self, num_statements: int = 100_000):
+        self.num_statements = num_statements
+    
+    def run(self) -> Dict[str, Any]:
+        """Constrói as duas representações sob o tracemalloc"""
+        print("\n" + "="*60)
+        print("MEMÓRIA DA AST: OBJETOS x ARRAYS")
+        print("="*60)
+        
+        buffer = tokenize_all(generate_statements(self.num_statements))
+        parser_file = [tracemalloc.Filter(True, Parser.parse.__code__.co_filename)]
+        
+        gc.collect()
+        tracemalloc.start()
+        try:
+            ast = Parser(buffer).parse()
+            snapshot = tracemalloc.take_snapshot()
+            # Só o que foi alocado em parser.py: os nós e as listas da AST
+            objects = sum(stat.size for stat in snapshot.filter_traces(parser_file).statistics('filename'))
+            
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            flat = FlatAST.from_ast(ast)
+            flatten_time = time.perf_counter() - start
+            arrays = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        
+        nodes = len(flat)
+        print(f"{nodes:,} nós ({self.num_statements:,} comandos)")
+        print(f"   Objetos: {objects / 1e6:6.1f} MB ({objects / nodes:.0f} B/nó)")
+        print(f"  FlatAST: {arrays / 1e6:6.1f} MB ({arrays / nodes:.0f} B/nó) | "
+              f"construída em {flatten_time:.3f}s | {objects / arrays:.1f}x menor")
+        
+        start = time.perf_counter()
+        filters = len(flat.find(FILTER))
+        print(f"  {filters:,} filters localizados na FlatAST em {time.perf_counter() - start:.4f}s")
+        
+        return {'nodes': nodes, 'objects': objects, 'flat': arrays, 'flatten_time': flatten_time}
+
+class _GetattrVisit:
+    """visit anterior à tabela de despacho do NodeVisitor: um getattr por nó visitado"""
+    
+    def visit(self, node):
+        method_name = f'visit_{type(node).__name__}'
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+class VisitorDispatchBenchmark:
+    """Compara o despacho por tabela do NodeVisitor com o getattr por nó"""
+    
+    def __init__(self, num_nodes: int = 100_000, repetitions: int = 3):
+        self.num_nodes = num_nodes
+        self.repetitions = repetitions
+    
+    def _compare(self, label: str, nodes: int, visitor_class, run) -> Dict[str, float]:
+        """Alterna as duas versões a cada repetição, para que ambas sofram o mesmo ruído"""
+        legacy_class = type(f'{visitor_class.__name__}Getattr', (_GetattrVisit, visitor_class), {})
+        times = {'getattr': [], 'tabela': []}
+        for _ in range(self.repetitions):
+            for name, cls in (('getattr', legacy_class), ('tabela', visitor_class)):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run(cls)
+                times[name].append(time.perf_counter() - start)
+        results = {name: min(values) for name, values in times.items()}
+        print(f"{label:>10}: {nodes:,} nós | getattr {results['getattr']:.3f}s | "
+              f"tabela {results['tabela']:.3f}s | {results['getattr'] / results['tabela']:.2f}x")
+        return results
+    
+    def run(self) -> Dict[str, Any]:
+        """Análise semântica e interpretação de ASTs com ~num_nodes nós"""
+        print("\n" + "="*60)
+        print("DESPACHO DOS VISITORS: TABELA x GETATTR")
+        print("="*60)
+        
+        # generate_statements produz 2,5 nós por comando, em média
+        program = Parser(tokenize_all(generate_statements(self.num_nodes * 2 // 5))).parse()
+        results = {'semantica': self._compare(
+            'Semântica', len(FlatAST.from_ast(program)), SemanticAnalyzer,
+            lambda analyzer_class: analyzer_class(debug=False).analyze(program))}
+        
+        # O interpretador executa cada select com o pandas (2 nós por comando)
+        source = 'base = load "vendas.csv"\n' + ''.join(
+            f'coluna_{i} = select base (produto)\n' for i in range(self.num_nodes // 2))
+        program = Parser(tokenize_all(source)).parse()
+        results['interpretacao'] = self._compare(
+            'Execução', len(FlatAST.from_ast(program)), CoffeeInterpreter,
+            lambda interpreter_class: interpreter_class(debug=False).interpret(program))
+        
+        return results
+
+class SkeletonParseBenchmark:
+    """Compara a extração de dependências pelo parse() completo e pelo modo esqueleto"""
+    
+    def __init__(self, num_statements: int = 1_000_000, repetitions: int = 2):
+        self.num_statements = num_statements
+        self.repetitions = repetitions
+    
+    def run(self) -> Dict[str, Any]:
+        """Lista (definido, lidos, load) de cada comando de um script de num_statements linhas"""
+        print("\n" + "="*60)
+        print("DEPENDÊNCIAS: PARSE COMPLETO x ESQUELETO")
+        print("="*60)
+        
+        source = generate_statements(self.num_statements)
+        modes = {
+            'completo': lambda: Parser(create_lexer(source, fast=True)).parse(),
+            'esqueleto': lambda: parse_skeleton(source),
+        }
+        times = {name: [] for name in modes}
+        dependencies = {}
+        # Alterna os modos a cada repetição, para que ambos sofram o mesmo ruído
+        for _ in range(self.repetitions):
+            for name, parse in modes.items():
+                start = time.perf_counter()
+                dependencies[name] = [statement_dependencies(statement)
+                                      for statement in parse().statements]
+                times[name].append(time.perf_counter() - start)
+        results = {name: min(values) for name, values in times.items()}
+        
+        for name, elapsed in results.items():
+            print(f"{name:>10}: {self.num_statements:,} linhas em {elapsed:.3f}s "
+                  f"({self.num_statements / elapsed:,.0f} linhas/s)")
+        consistent = dependencies['completo'] == dependencies['esqueleto']
+        print(f"Esqueleto {results['completo'] / results['esqueleto']:.1f}x mais rápido | "
+              f"dependências idênticas: {'✓' if consistent else '✗'}")
+        
+        results['consistent'] = consistent
+        return results
+
+class IncrementalSemanticBenchmark:
+    """Compara a reanálise semântica completa com a incremental após cada edição"""
+    
+    def __init__(self, num_statements: int = 100_000, num_edits: int = 300):
+        self.num_statements = num_statements
+        self.num_edits = num_edits
+    
+    def run(self) -> Dict[str, Any]:
+        """Troca, insere e remove comandos de um script de num_statements comandos"""
+        print("\n" + "="*60)
+        print("ANÁLISE SEMÂNTICA: COMPLETA x INCREMENTAL")
+        print("="*60)
+        
+        program = Parser(tokenize_all(generate_statements(self.num_statements))).parse()
+        start = time.perf_counter()
+        SemanticAnalyzer().analyze(program)
+        full_time = time.perf_counter() - start
+        start = time.perf_counter()
+        analyzer = IncrementalSemanticAnalyzer(program)
+        build_time = time.perf_counter() - start
+        print(f"Análise completa: {self.num_statements:,} comandos em {full_time:.3f}s | "
+              f"construção do grafo def-use: {build_time:.3f}s")
+        
+        # Edições típicas de um editor (os comandos vêm do generate_statements, 4 por grupo)
+        def statement(text):
+            return Parser(tokenize_all(text)).parse().statements
+        edits = {
+            'condição do filter': lambda i: (4 * i + 1, 4 * i + 2, statement(
+                f'filtro_{i} = filter base_{i} where valor < {i}\n')),
+            'renomear um load': lambda i: (4 * i, 4 * i + 1, statement(
+                f'outra_{i} = load "dados_{i}.csv"\n')),
+            'inserir display': lambda i: (4 * i + 4, 4 * i + 4, statement(f'display final_{i}\n')),
+        }
+        groups = self.num_statements // 4 - 1
+        results = {'full': full_time, 'build': build_time}
+        for label, make_edit in edits.items():
+            times, rechecked = [], 0
+            for n in range(self.num_edits):
+                # Grupos diferentes a cada edição, espalhados pelo script
+                edit_start, edit_stop, statements = make_edit(n * 7919 % groups)
+                begin = time.perf_counter()
+                rechecked += len(analyzer.edit(edit_start, edit_stop, statements))
+                times.append(time.perf_counter() - begin)
+            times.sort()
+            median = times[len(times) // 2]
+            results[label] = median
+            print(f"{label:>20}: mediana {median * 1e3:.3f} ms | máximo {times[-1] * 1e3:.3f} ms | "
+                  f"{rechecked / self.num_edits:.1f} comandos reverificados | "
+                  f"{full_time / median:,.0f}x mais rápido que a análise completa")
+        
+        reference = SemanticAnalyzer().analyze(ProgramNode(analyzer.statements))
+        success, errors, info = analyzer.result()
+        consistent = (success == reference[0] and list(map(str, errors)) == list(map(str, reference[1]))
+                      and info['warnings'] == reference[2]['warnings'])
+        print(f"Erros e avisos idênticos aos da análise completa: {'✓' if consistent else '✗'}")
+        
+        results['consistent'] = consistent
+        return results
+
+def write_dataset_csv(path: str, num_rows: int, extra_columns: int = 0, seed: int = 42) -> None:
+    """Grava um CSV com as colunas id, nome, valor, ativo, categoria e `extra_columns` colunas numéricas"""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    columns = {
+        'id': np.arange(num_rows),
+        'nome': np.char.add('item_', (np.arange(num_rows) % 1000).astype(str)),
+        'valor': rng.integers(0, 2000, num_rows),
+        'ativo': np.where(rng.random(num_rows) < 0.5, 'sim', 'nao'),
+        'categoria': rng.choice(['a', 'b', 'c', 'd'], num_rows),
+    }
+    for i in range(extra_columns):
+        columns[f'extra_{i}'] = rng.random(num_rows).round(4)
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+def run_program(source: str, **interpreter_options) -> Tuple[Dict[str, Any], float, int, int]:
+    """
+    Executa `source` com a saída descartada. Retorna (resultado, segundos,
+    pico de memória, memória retida pelo interpretador ao final), em bytes.
+    """
+    ast = Parser(tokenize_all(source)).parse()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreter = CoffeeInterpreter(**interpreter_options)
+            result = interpreter.interpret(ast)
+        elapsed = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak, retained
+
+class LazyPlanBenchmark:
+    """Compara a execução imediata com a execução por plano lógico (lazy=True)"""
+    
+    def __init__(self, num_rows: int = 2_000_000):
+        self.num_rows = num_rows
+    
+    def run(self) -> Dict[str, Any]:
+        """Pipeline com intermediários que só alimentam outro comando ou nunca são exibidos"""
+        print("\n" + "="*60)
+        print("EXECUÇÃO: IMEDIATA x PLANO LÓGICO")
+        print("="*60)
+        
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'dados.csv')
+            write_dataset_csv(path, self.num_rows)
+            source = (f'base = load "{path}"\n'
+                      'caros = filter base where valor > 500\n'
+                      'ativos = filter caros where ativo == "sim"\n'
+                      'final = select ativos (id, nome, valor)\n'
+                      'categorias = select base (id, categoria)\n'
+                      'display final\n')
+            results = {}
+            for label, lazy in (('imediata', False), ('plano', True)):
+                result, elapsed, peak, retained = run_program(source, lazy=lazy)
+                results[label] = {'time': elapsed, 'peak': peak, 'retained': retained,
+                                  'operations': result['statistics']['operations_executed']}
+                print(f"{label:>10}: {self.num_rows:,} linhas em {elapsed:.3f}s | "
+                      f"pico {peak / 1e6:,.1f} MB | retida ao final {retained / 1e6:,.1f} MB | "
+                      f"{results[label]['operations']} operações executadas")
+        
+        eager, lazy = results['imediata'], results['plano']
+        print(f"Plano lógico: tempo {lazy['time'] / eager['time']:.2f}x o da execução imediata | "
+              f"memória retida {eager['retained'] / 1e6:,.1f} MB -> {lazy['retained'] / 1e6:,.1f} MB")
+        return results
+
+class ProjectionPushdownBenchmark:
+    """Mede a leitura de um CSV largo com e sem o pushdown de projeção (usecols)"""
+    
+    def __init__(self, num_rows: int = 500_000, extra_columns: int = 45):
+        self.num_rows = num_rows
+        self.extra_columns = extra_columns
+    
+    def run(self) -> Dict[str, Any]:
+        """Programa que usa 3 das 5 + extra_columns colunas do arquivo"""
+        print("\n" + "="*60)
+        print("PUSHDOWN DE PROJEÇÃO: TODAS AS COLUNAS x USECOLS")
+        print("="*60)
+        
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'largo.csv')
+            write_dataset_csv(path, self.num_rows, self.extra_columns)
+            source = (f'vendas = load "{path}"\n'
+                      'filtrados = filter vendas where valor > 500\n'
+                      'final = select filtrados (id, nome)\n'
+                      'display final\n')
+            results = {}
+            for label, pushdown in (('completa', False), ('usecols', True)):
+                result, elapsed, peak, _ = run_program(source, pushdown=pushdown)
+                results[label] = {'time': elapsed, 'peak': peak}
+                print(f"{label:>10}: {self.num_rows:,} linhas x {5 + self.extra_columns} colunas "
+                      f"em {elapsed:.3f}s | pico de memória {peak / 1e6:,.1f} MB")
+        
+        full, pruned = results['completa'], results['usecols']
+        print(f"Pushdown: {full['time'] / pruned['time']:.2f}x mais rápido | "
+              f"{full['peak'] / pruned['peak']:.2f}x menos memória no pico")
+        return results
+
+class PredicatePushdownBenchmark:
+    """Compara o pico de memória do filter após o load com o filter aplicado bloco a bloco"""
+    
+    def __init__(self, num_rows: int = 3_000_000):
+        self.num_rows = num_rows
+    
+    def run(self) -> Dict[str, Any]:
+        """load seguido de um filter seletivo (~5% das linhas), sem display do load"""
+        print("\n" + "="*60)
+        print("PUSHDOWN DE PREDICADO: LEITURA COMPLETA x BLOCOS FILTRADOS")
+        print("="*60)
+        
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'vendas.csv')
+            write_dataset_csv(path, self.num_rows)
+            source = (f'vendas = load "{path}"\n'
+                      'altas = filter vendas where valor >= 1900\n'
+                      'display altas\n')
+            size = os.path.getsize(path)
+            results = {}
+            for label, options in (('imediata', {}),
+                                   ('plano', {'lazy': True, 'pushdown': False}),
+                                   ('blocos', {'lazy': True})):
+                result, elapsed, peak, _ = run_program(source, **options)
+                results[label] = {'time': elapsed, 'peak': peak}
+                print(f"{label:>10}: {self.num_rows:,} linhas ({size / 1e6:,.0f} MB) em {elapsed:.3f}s | "
+                      f"pico de memória {peak / 1e6:,.1f} MB")
+            
+            rows = len(pd.read_csv(path, usecols=['valor']).query('valor >= 1900'))
+        
+        full, chunked = results['imediata'], results['blocos']
+        print(f"Blocos filtrados: {full['peak'] / chunked['peak']:.1f}x menos memória no pico | "
+              f"tempo {chunked['time'] / full['time']:.2f}x o da leitura completa | "
+              f"resultado: {rows:,} linhas")
+        return results
+
+class FilterFusionBenchmark:
+    """Compara um programa com 5 filters encadeados executados um a um e com a fusão em uma máscara"""
+    
+    def __init__(self, num_rows: int = 10_000_000, repetitions: int = 2):
+        self.num_rows = num_rows
+        self.repetitions = repetitions
+    
+    def run(self) -> Dict[str, Any]:
+        """Filters que mantêm de 50% a quase 100% das linhas: os intermediários são grandes"""
+        print("\n" + "="*60)
+        print("FUSÃO DE FILTROS: UM FILTRO POR VEZ x MÁSCARA ÚNICA")
+        print("="*60)
+        
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'vendas.csv')
+            write_dataset_csv(path, self.num_rows)
+            source = (f'vendas = load "{path}"\n'
+                      'f1 = filter vendas where valor > 100\n'
+                      'f2 = filter f1 where valor < 1950\n'
+                      'f3 = filter f2 where id >= 1000\n'
+                      'f4 = filter f3 where ativo == "sim"\n'
+                      'f5 = filter f4 where categoria != "d"\n'
+                      'display f5\n')
+            results = {}
+            rows = {}
+            for label, fusion in (('sequencial', False), ('fusao', True)):
+                runs = [run_program(source, fusion=fusion) for _ in range(self.repetitions)]
+                rows[label] = runs[-1][0]['environment']['f5']['rows']
+                results[label] = {'time': min(run[1] for run in runs), 'peak': max(run[2] for run in runs)}
+                print(f"{label:>10}: load + 5 filters sobre {self.num_rows:,} linhas em "
+                      f"{results[label]['time']:.3f}s | pico de memória {results[label]['peak'] / 1e6:,.1f} MB")
+        
+        sequential, fused = results['sequencial'], results['fusao']
+        identical = rows['sequencial'] == rows['fusao']
+        print(f"Fusão: {sequential['time'] / fused['time']:.2f}x mais rápido | "
+              f"{sequential['peak'] / fused['peak']:.2f}x menos memória no pico")
+        print(f"Mesmo número de linhas da execução sequencial ({rows['fusao']:,}): "
+              f"{'✓' if identical else '✗'}")
+        
+        results['identical'] = identical
+        return results
+
+class BatchCompilerBenchmark:
+    """Mede a escalabilidade do compilador em lote com o número de processos"""
+    
+    def __init__(self, num_files: int = 2_000, statements_per_file: int = 40):
+        self.num_files = num_files
+        self.statements_per_file = statements_per_file
+    
+    def run(self) -> Dict[str, Any]:
+        """Compila o mesmo diretório com 1, 2, 4, ... processos"""
+        print("\n" + "="*60)
+        print("COMPILAÇÃO EM LOTE: ESCALABILIDADE COM NÚCLEOS")
+        print("="*60)
+        
+        cpus = available_cpus()
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpus:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != cpus:
+            worker_counts.append(cpus)
+        
+        program = generate_statements(self.statements_per_file)
+        results = {}
+        with tempfile.TemporaryDirectory() as root:
+            for i in range(self.num_files):
+                directory = os.path.join(root, f'modulo_{i % 20}')
+                os.makedirs(directory, exist_ok=True)
+                with open(os.path.join(directory, f'script_{i}.coffee'), 'w', encoding='utf-8') as f:
+                    f.write(program)
+            paths = find_sources(root)
+            
+            for workers in worker_counts:
+                start = time.perf_counter()
+                compiled = sum(1 for result in compile_files(paths, workers=workers) if result['success'])
+                elapsed = time.perf_counter() - start
+                results[workers] = elapsed
+                speedup = results[1] / elapsed
+                print(f"{workers:>3} processo(s): {len(paths):,} arquivos em {elapsed:.2f}s | "
+                      f"{len(paths) / elapsed:,.0f} arquivos/s | speedup {speedup:.2f}x "
+                      f"(eficiência {speedup / workers:.0%}) | {compiled:,} sem erros")
+        
+        return {'cpus': cpus, 'times': results}
+
 def run_correctness_tests() -> bool:
     """Executa testes de correção para validar o interpretador"""
     print("="*60)
@@ -285,7 +1016,7 @@ def run_correctness_tests() -> bool:
         print(f"\nExecutando: {test['name']}")
         
         try:
-            coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
+            coffee_dfa = CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
             lexer = Lexer(test['program'], coffee_dfa)
             parser = Parser(lexer)
             ast = parser.parse()
@@ -328,6 +1059,27 @@ def main():
     print("SISTEMA DE BENCHMARKS E TESTES - INTERPRETADOR COFFEE")
     print("="*60)
     
+    # Benchmarks específicos do front-end: python benchmark_suite.py <modo>
+    frontend_benchmarks = {
+        'lexer': LexerScalingBenchmark,
+        'incremental': IncrementalLexerBenchmark,
+        'afn': NfaConversionBenchmark,
+        'afds': AfdScannerBenchmark,
+        'parsers': ParserBenchmark,
+        'ast': AstMemoryBenchmark,
+        'visitor': VisitorDispatchBenchmark,
+        'esqueleto': SkeletonParseBenchmark,
+        'semantica': IncrementalSemanticBenchmark,
+        'plano': LazyPlanBenchmark,
+        'colunas': ProjectionPushdownBenchmark,
+        'predicados': PredicatePushdownBenchmark,
+        'fusao': FilterFusionBenchmark,
+        'lote': BatchCompilerBenchmark,
+    }
+    if len(sys.argv) > 1 and sys.argv[1] in frontend_benchmarks:
+        frontend_benchmarks[sys.argv[1]]().run()
+        return
+    
     # Testes de correção
     correctness_passed = run_correctness_tests()
     
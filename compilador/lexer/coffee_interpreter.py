@@ -5,21 +5,36 @@ Funcionalidades:
 - Operações de filtragem, seleção e exibição
 - Ambiente de execução com escopo de variáveis
 - Sistema de tipos em runtime
+- Modo preguiçoso (lazy=True): load/filter/select montam um plano lógico
+  que só é executado quando um display consome a variável
+- Leitura só das colunas usadas pelo programa (pushdown de projeção)
+- No modo preguiçoso, filters aplicados bloco a bloco durante a leitura
+  do CSV (pushdown de predicado)
+- Filters encadeados avaliados com uma única máscara (fusão de filtros),
+  nos dois modos
 """
 
 import sys
 import os
+import argparse
 import csv
 import json
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, FrozenSet, Iterator, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
 # Importa classes do parser e analisador semântico
 sys.path.append(os.path.dirname(__file__))
 from parser import *
-from semantic_analyzer import SemanticAnalyzer, DataType
+from semantic_analyzer import DataType
+from ast_cache import CACHE_DIR, load_program
+from logical_plan import PlanNode, Scan, Filter, Project
+from query_planner import filter_chain, fusible_filters, required_columns
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from lib.codegen.otimizador import NIVEIS, formatar_relatorio, otimizar
 
 @dataclass
 class RuntimeValue:
@@ -32,6 +47,16 @@ class RuntimeValue:
         if self.metadata is None:
             self.metadata = {}
 
+@dataclass
+class PendingFilters:
+    """
+    Valor de um filter adiado no modo imediato: o dataset base e os
+    predicados (coluna, operador, valor) ainda não aplicados, que o filter
+    seguinte aplica junto com o seu
+    """
+    dataset: pd.DataFrame
+    predicates: List[Tuple[str, str, Any]]
+
 class RuntimeError(Exception):
     """Exceção para erros em tempo de execução"""
     def __init__(self, message: str, context: str = ""):
@@ -67,9 +92,23 @@ class Environment:
 class DatasetOperations:
     """Operações para manipulação de datasets"""
     
+    # Linhas por bloco na leitura de CSV com filtro (load_csv_chunks)
+    CSV_CHUNK_ROWS = 100_000
+    
+    @staticmethod
+    def load(file_path: str, columns: Optional[FrozenSet[str]] = None) -> pd.DataFrame:
+        """Carrega um arquivo de dados conforme a extensão (CSV por padrão)"""
+        clean_path = file_path.strip('"')
+        try:
+            if clean_path.endswith('.json'):
+                return DatasetOperations.load_json(file_path)
+            return DatasetOperations.load_csv(file_path, columns)
+        except Exception as e:
+            raise RuntimeError(f"Erro ao carregar arquivo '{clean_path}': {e}")
+    
     @staticmethod
-    def load_csv(file_path: str) -> pd.DataFrame:
-        """Carrega arquivo CSV"""
+    def load_csv(file_path: str, columns: Optional[FrozenSet[str]] = None) -> pd.DataFrame:
+        """Carrega arquivo CSV; com `columns`, só essas colunas são lidas"""
         try:
             # Remove aspas do caminho
             clean_path = file_path.strip('"')
@@ -79,10 +118,49 @@ class DatasetOperations:
                 print(f"Aviso: Arquivo '{clean_path}' não encontrado. Criando dados de demonstração.")
                 return DatasetOperations._create_demo_data(clean_path)
             
-            return pd.read_csv(clean_path)
+            return pd.read_csv(clean_path, usecols=DatasetOperations._usecols(clean_path, columns))
         except Exception as e:
             raise RuntimeError(f"Erro ao carregar arquivo CSV '{file_path}': {e}", file_path)
     
+    @staticmethod
+    def load_csv_chunks(file_path: str, columns: Optional[FrozenSet[str]] = None,
+                        chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lê o CSV em blocos de `chunk_rows` linhas. Arquivos JSON ou
+        inexistentes (dados de demonstração) vêm em um único bloco.
+        """
+        clean_path = file_path.strip('"')
+        if clean_path.endswith('.json') or not os.path.exists(clean_path):
+            yield DatasetOperations.load(file_path, columns)
+            return
+        
+        try:
+            reader = pd.read_csv(clean_path, usecols=DatasetOperations._usecols(clean_path, columns),
+                                 chunksize=chunk_rows or DatasetOperations.CSV_CHUNK_ROWS)
+        except Exception as e:
+            raise RuntimeError(f"Erro ao carregar arquivo CSV '{file_path}': {e}", file_path)
+        with reader:
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    raise RuntimeError(f"Erro ao carregar arquivo CSV '{file_path}': {e}", file_path)
+                yield chunk
+    
+    @staticmethod
+    def _usecols(clean_path: str, columns: Optional[FrozenSet[str]]) -> Optional[List[str]]:
+        """Colunas de `columns` na ordem do arquivo, ou None para ler todas"""
+        if not columns:
+            return None
+        header = pd.read_csv(clean_path, nrows=0).columns
+        # Se falta alguma coluna, lê tudo: o erro aparece na operação
+        # que a usa, com a lista completa de colunas disponíveis
+        if not columns.issubset(header):
+            return None
+        return [c for c in header if c in columns]
+    
     @staticmethod
     def load_json(file_path: str) -> pd.DataFrame:
         """Carrega arquivo JSON"""
@@ -148,30 +226,54 @@ class DatasetOperations:
     def filter_dataset(df: pd.DataFrame, column: str, operator: str, value: Any) -> pd.DataFrame:
         """Aplica filtro em dataset"""
         try:
-            if column not in df.columns:
-                available_cols = ', '.join(df.columns.tolist())
-                raise RuntimeError(f"Coluna '{column}' não existe. Colunas disponíveis: {available_cols}", column)
-            
-            if operator == '>':
-                return df[df[column] > value]
-            elif operator == '<':
-                return df[df[column] < value]
-            elif operator == '>=':
-                return df[df[column] >= value]
-            elif operator == '<=':
-                return df[df[column] <= value]
-            elif operator == '==':
-                return df[df[column] == value]
-            elif operator == '!=':
-                return df[df[column] != value]
-            else:
-                raise RuntimeError(f"Operador '{operator}' não suportado", operator)
-                
+            return df[DatasetOperations._comparison_mask(df, column, operator, value)]
         except Exception as e:
             if isinstance(e, RuntimeError):
                 raise
             raise RuntimeError(f"Erro ao filtrar dataset: {e}", f"{column} {operator} {value}")
     
+    @staticmethod
+    def filter_dataset_all(df: pd.DataFrame, predicates: List[Tuple[str, str, Any]]) -> pd.DataFrame:
+        """
+        Aplica a conjunção de `predicates` (coluna, operador, valor) com uma
+        única máscara e uma única cópia, em vez de uma cópia por filtro
+        """
+        if len(predicates) == 1:
+            return DatasetOperations.filter_dataset(df, *predicates[0])
+        try:
+            mask = np.ones(len(df), dtype=bool)
+            for column, operator, value in predicates:
+                mask &= DatasetOperations._comparison_mask(df, column, operator, value).to_numpy()
+            return df[mask]
+        except Exception:
+            # Um filtro de cada vez: os mesmos erros que os filters separados
+            # (um filtro pode falhar só nas linhas que os anteriores removeriam)
+            for predicate in predicates:
+                df = DatasetOperations.filter_dataset(df, *predicate)
+            return df
+    
+    @staticmethod
+    def _comparison_mask(df: pd.DataFrame, column: str, operator: str, value: Any) -> pd.Series:
+        """Máscara booleana das linhas em que `column operator value`"""
+        if column not in df.columns:
+            available_cols = ', '.join(df.columns.tolist())
+            raise RuntimeError(f"Coluna '{column}' não existe. Colunas disponíveis: {available_cols}", column)
+        
+        if operator == '>':
+            return df[column] > value
+        elif operator == '<':
+            return df[column] < value
+        elif operator == '>=':
+            return df[column] >= value
+        elif operator == '<=':
+            return df[column] <= value
+        elif operator == '==':
+            return df[column] == value
+        elif operator == '!=':
+            return df[column] != value
+        else:
+            raise RuntimeError(f"Operador '{operator}' não suportado", operator)
+    
     @staticmethod
     def select_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
         """Seleciona colunas específicas do dataset"""
@@ -183,7 +285,7 @@ class DatasetOperations:
                 raise RuntimeError(f"Colunas não encontradas: {', '.join(missing_cols)}. "
                                  f"Colunas disponíveis: {available_cols}", str(missing_cols))
             
-            return df[columns]
+            return df[list(columns)]
             
         except Exception as e:
             if isinstance(e, RuntimeError):
@@ -213,10 +315,123 @@ class DatasetOperations:
         
         print(f"{'='*60}\n")
 
-class CoffeeInterpreter:
+class PlanExecutor:
+    """
+    Executa planos lógicos. O resultado de um nó fica guardado enquanto
+    ainda há consumidores dele por vir (`remaining`), de modo que
+    subplanos compartilhados são calculados uma vez e liberados depois
+    do último uso.
+    
+    Com `fusion`, Filters encadeados cujos intermediários não têm outros
+    consumidores são avaliados juntos: uma máscara conjuntiva sobre o
+    dataset base e uma única cópia. Com `pushdown`, se a base é um Scan
+    sem outros consumidores, esses filtros são aplicados a cada bloco do
+    CSV durante a leitura: só as linhas que passam ficam na memória, em
+    vez do arquivo inteiro.
+    """
+    
+    def __init__(self, stats: Dict[str, int], debug: bool = False, pushdown: bool = True,
+                 fusion: bool = True):
+        self.stats = stats
+        self.debug = debug
+        self.pushdown = pushdown
+        self.fusion = fusion
+        self.remaining: Dict[PlanNode, int] = {}
+        self.cache: Dict[PlanNode, pd.DataFrame] = {}
+    
+    def expect(self, plan: PlanNode, uses: int) -> None:
+        """Registra quantas vezes o resultado de `plan` será consumido"""
+        if uses:
+            self.remaining[plan] = uses
+    
+    def materialize(self, plan: PlanNode) -> pd.DataFrame:
+        """Resultado de `plan`, consumindo um dos seus usos"""
+        if plan in self.cache:
+            result = self.cache[plan]
+        else:
+            result = self._execute(plan)
+        
+        self._consume(plan, result)
+        return result
+    
+    def _consume(self, plan: PlanNode, result: pd.DataFrame) -> None:
+        """Desconta um uso de `plan`; guarda o resultado se ainda houver outros"""
+        remaining = self.remaining.get(plan, 0) - 1
+        if remaining > 0:
+            self.remaining[plan] = remaining
+            self.cache[plan] = result
+        else:
+            self.remaining.pop(plan, None)
+            self.cache.pop(plan, None)
+    
+    def _execute(self, plan: PlanNode) -> pd.DataFrame:
+        if self.debug:
+            print(f"Executando {plan.describe()}")
+        
+        if isinstance(plan, Scan):
+            result = DatasetOperations.load(plan.file_path, plan.columns)
+            self.stats['datasets_loaded'] += 1
+        elif isinstance(plan, Filter):
+            return self._execute_filters(plan)
+        elif isinstance(plan, Project):
+            result = DatasetOperations.select_columns(self.materialize(plan.child), plan.columns)
+        else:
+            raise RuntimeError(f"Nó de plano não suportado: {type(plan).__name__}")
+        
+        self.stats['operations_executed'] += 1
+        return result
+    
+    def _operand(self, value: Any) -> Any:
+        """Valor comparado por um Filter; uma variável é um plano, executado só agora"""
+        if isinstance(value, PlanNode):
+            return self.materialize(value)
+        return value
+    
+    def _is_private(self, plan: PlanNode) -> bool:
+        """Se `plan` ainda não foi calculado e não tem outro consumidor além do atual"""
+        return plan not in self.cache and self.remaining.get(plan, 0) <= 1
+    
+    def _execute_filters(self, plan: Filter) -> pd.DataFrame:
+        """Executa `plan` e, com fusion, os Filters privados abaixo dele de uma só vez"""
+        if self.fusion:
+            base, chain = filter_chain(plan, self._is_private)
+        else:
+            base, chain = plan.child, [plan]
+        predicates = [(node.column, node.operator, self._operand(node.value)) for node in chain]
+        if self.debug and len(chain) > 1:
+            print(f"Fundindo {len(chain)} filtros: {' e '.join(node.describe() for node in chain)}")
+        
+        if self.pushdown and isinstance(base, Scan) and self._is_private(base):
+            result = self._filtered_scan(base, predicates)
+        else:
+            result = DatasetOperations.filter_dataset_all(self.materialize(base), predicates)
+        
+        # Os Filters intermediários foram executados (e consumidos) junto com `plan`
+        for node in chain[:-1]:
+            self.remaining.pop(node, None)
+        self.stats['operations_executed'] += len(chain)
+        return result
+    
+    def _filtered_scan(self, scan: Scan, predicates: List[Tuple[str, str, Any]]) -> pd.DataFrame:
+        """Lê o CSV de `scan` em blocos, mantendo só as linhas que passam em `predicates`"""
+        if self.debug:
+            print(f"Executando {scan.describe()} em blocos")
+        
+        kept = [DatasetOperations.filter_dataset_all(chunk, predicates)
+                for chunk in DatasetOperations.load_csv_chunks(scan.file_path, scan.columns)]
+        result = kept[0] if len(kept) == 1 else pd.concat(kept)
+        
+        # O Scan foi executado (e consumido) junto com os filtros
+        self.stats['datasets_loaded'] += 1
+        self.stats['operations_executed'] += 1
+        self.remaining.pop(scan, None)
+        return result
+
+class CoffeeInterpreter(NodeVisitor):
     """Interpretador principal para programas Coffee"""
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, lazy: bool = False, pushdown: bool = True,
+                 fusion: bool = True):
         self.debug = debug
         self.global_env = Environment()
         self.current_env = self.global_env
@@ -228,6 +443,19 @@ class CoffeeInterpreter:
             'variables_created': 0,
             'displays_performed': 0
         }
+        
+        # No modo preguiçoso as variáveis de dataset guardam planos lógicos
+        self.lazy = lazy
+        self.executor = PlanExecutor(self.stats, debug, pushdown, fusion)
+        self.uses: Dict[str, int] = {}
+        
+        # Colunas que cada load precisa ler (pushdown de projeção)
+        self.pushdown = pushdown
+        self.load_columns: Dict[LoadExpressionNode, FrozenSet[str]] = {}
+        
+        # Filters do modo imediato adiados para o filter seguinte (fusão)
+        self.fusion = fusion
+        self.fused_filters: FrozenSet[FilterExpressionNode] = frozenset()
     
     def interpret(self, ast: ProgramNode) -> Dict[str, Any]:
         """
@@ -242,6 +470,13 @@ class CoffeeInterpreter:
         if self.debug:
             print("Iniciando execução do programa Coffee...")
         
+        if self.lazy:
+            self.uses = self._count_uses(ast)
+        if self.pushdown:
+            self.load_columns = required_columns(ast)
+        if self.fusion and not self.lazy:
+            self.fused_filters = fusible_filters(ast)
+        
         try:
             self.visit(ast)
             
@@ -266,12 +501,6 @@ class CoffeeInterpreter:
                 'statistics': self.stats
             }
     
-    def visit(self, node: ASTNode) -> RuntimeValue:
-        """Padrão Visitor para interpretar nós da AST"""
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-    
     def generic_visit(self, node: ASTNode) -> RuntimeValue:
         """Método genérico para nós não implementados"""
         raise RuntimeError(f"Interpretador não implementado para: {type(node).__name__}")
@@ -297,6 +526,9 @@ class CoffeeInterpreter:
         # Avalia a expressão do lado direito
         value = self.visit(node.expression)
         
+        if isinstance(value.value, PlanNode):
+            self.executor.expect(value.value, self.uses.get(node.identifier, 0))
+        
         # Define a variável no ambiente
         self.current_env.define(node.identifier, value)
         self.stats['variables_created'] += 1
@@ -319,7 +551,7 @@ class CoffeeInterpreter:
                              f"'{node.identifier}' é do tipo {variable.type.value}")
         
         # Exibe o dataset
-        DatasetOperations.display_dataset(variable.value, node.identifier)
+        DatasetOperations.display_dataset(self._dataframe(variable), node.identifier)
         self.stats['displays_performed'] += 1
         
         return RuntimeValue(None, DataType.UNKNOWN)
@@ -330,27 +562,22 @@ class CoffeeInterpreter:
             print(f"Executando load: {node.file_path}")
         
         file_path = node.file_path.strip('"')
+        columns = self.load_columns.get(node)
         
-        try:
-            # Determina o tipo de arquivo e carrega apropriadamente
-            if file_path.endswith('.csv'):
-                df = DatasetOperations.load_csv(node.file_path)
-            elif file_path.endswith('.json'):
-                df = DatasetOperations.load_json(node.file_path)
-            else:
-                # Assume CSV por padrão
-                df = DatasetOperations.load_csv(node.file_path)
-            
-            self.stats['datasets_loaded'] += 1
-            self.stats['operations_executed'] += 1
-            
-            if self.debug:
-                print(f"Dataset carregado: {len(df)} linhas, {len(df.columns)} colunas")
-            
-            return RuntimeValue(df, DataType.DATASET, {'file_path': file_path})
-            
-        except Exception as e:
-            raise RuntimeError(f"Erro ao carregar arquivo '{file_path}': {e}")
+        if self.lazy:
+            return RuntimeValue(Scan(node.file_path, columns), DataType.DATASET,
+                                {'file_path': file_path})
+        
+        # Determina o tipo de arquivo e carrega apropriadamente
+        df = DatasetOperations.load(node.file_path, columns)
+        
+        self.stats['datasets_loaded'] += 1
+        self.stats['operations_executed'] += 1
+        
+        if self.debug:
+            print(f"Dataset carregado: {len(df)} linhas, {len(df.columns)} colunas")
+        
+        return RuntimeValue(df, DataType.DATASET, {'file_path': file_path})
     
     def visit_FilterExpressionNode(self, node: FilterExpressionNode) -> RuntimeValue:
         """Executa operações de filter"""
@@ -381,17 +608,32 @@ class CoffeeInterpreter:
         # Avalia o lado direito
         right_value = self._evaluate_term(right_term)
         
+        if self.lazy:
+            return RuntimeValue(Filter(dataset_var.value, column_name, operator, right_value),
+                                DataType.DATASET)
+        
+        # Filters adiados pelos comandos anteriores são aplicados junto com este
+        dataset = dataset_var.value
+        predicates = [(column_name, operator, right_value)]
+        if isinstance(dataset, PendingFilters):
+            predicates = dataset.predicates + predicates
+            dataset = dataset.dataset
+        
+        if node in self.fused_filters:
+            if self.debug:
+                print("Filter adiado para o comando seguinte")
+            return RuntimeValue(PendingFilters(dataset, predicates), DataType.DATASET)
+        
         # Aplica o filtro
-        filtered_df = DatasetOperations.filter_dataset(
-            dataset_var.value, column_name, operator, right_value
-        )
+        filtered_df = DatasetOperations.filter_dataset_all(dataset, predicates)
         
-        self.stats['operations_executed'] += 1
+        self.stats['operations_executed'] += len(predicates)
         
         if self.debug:
-            original_rows = len(dataset_var.value)
+            original_rows = len(dataset)
             filtered_rows = len(filtered_df)
-            print(f"Filter aplicado: {original_rows} -> {filtered_rows} linhas")
+            print(f"Filter aplicado: {original_rows} -> {filtered_rows} linhas"
+                  + (f" ({len(predicates)} filtros fundidos)" if len(predicates) > 1 else ""))
         
         return RuntimeValue(filtered_df, DataType.DATASET)
     
@@ -406,6 +648,10 @@ class CoffeeInterpreter:
         if dataset_var.type != DataType.DATASET:
             raise RuntimeError(f"Select só pode ser aplicado a datasets")
         
+        if self.lazy:
+            return RuntimeValue(Project(dataset_var.value, node.columns), DataType.DATASET,
+                                {'selected_columns': node.columns})
+        
         # Seleciona as colunas
         selected_df = DatasetOperations.select_columns(dataset_var.value, node.columns)
         
@@ -436,16 +682,66 @@ class CoffeeInterpreter:
         elif term.type == 'IDENTIFIER':
             # Busca variável no ambiente
             var = self.current_env.get(term.value)
-            return var.value
+            if self.lazy:
+                # O plano da variável só é executado com o filter (PlanExecutor)
+                return var.value
+            return self._dataframe(var)
         
         else:
             raise RuntimeError(f"Tipo de termo não suportado: {term.type}")
     
+    def _dataframe(self, variable: RuntimeValue) -> Any:
+        """Valor da variável; no modo preguiçoso, executa o plano dela"""
+        if isinstance(variable.value, PlanNode):
+            return self.executor.materialize(variable.value)
+        return variable.value
+    
+    @staticmethod
+    def _count_uses(ast: ProgramNode) -> Dict[str, int]:
+        """
+        Quantas vezes cada variável será lida por comandos vivos: displays e
+        atribuições cujo resultado chega, direta ou indiretamente, a um
+        display. Leituras feitas por variáveis mortas não contam, pois os
+        planos delas nunca são executados.
+        """
+        uses: Dict[str, int] = {}
+        live = set()
+        for statement in reversed(ast.statements):
+            if isinstance(statement, DisplayStatementNode):
+                names = [statement.identifier]
+            elif statement.identifier in live:
+                expression = statement.expression
+                names = [getattr(expression, 'dataset', None)]
+                if isinstance(expression, FilterExpressionNode) and \
+                        expression.condition.right.type == 'IDENTIFIER':
+                    names.append(expression.condition.right.value)
+            else:
+                continue
+            for name in names:
+                if name is not None:
+                    uses[name] = uses.get(name, 0) + 1
+                    live.add(name)
+        return uses
+    
     def _serialize_environment(self) -> Dict[str, Any]:
         """Serializa o ambiente para retorno"""
         result = {}
         for name, value in self.current_env.variables.items():
-            if value.type == DataType.DATASET:
+            if isinstance(value.value, PlanNode):
+                # Planos não são executados só para o resumo
+                result[name] = {
+                    'type': 'dataset',
+                    'plan': value.value.explain(),
+                    'metadata': value.metadata
+                }
+            elif isinstance(value.value, PendingFilters):
+                # Filter fundido com o seguinte: o resultado nunca foi calculado
+                result[name] = {
+                    'type': 'dataset',
+                    'fused_filters': len(value.value.predicates),
+                    'metadata': value.metadata
+                }
+            elif value.type == DataType.DATASET:
                 result[name] = {
                     'type': 'dataset',
                     'rows': len(value.value),
@@ -478,51 +774,60 @@ class CoffeeInterpreter:
 
 def main():
     """Função principal do interpretador"""
-    if len(sys.argv) != 2:
-        print("Uso: python coffee_interpreter.py <arquivo.coffee>")
-        sys.exit(1)
+    arg_parser = argparse.ArgumentParser(
+        prog='coffee_interpreter.py',
+        description='Executa um programa Coffee')
+    arg_parser.add_argument('arquivo', help='caminho para o arquivo .coffee')
+    arg_parser.add_argument('--fast-lexer', action='store_true',
+                            help='usa o FastLexer (regex) na análise léxica')
+    arg_parser.add_argument('--sem-cache', action='store_true',
+                            help=f'ignora o cache de programas compilados ({CACHE_DIR})')
+    arg_parser.add_argument('--lazy', action='store_true',
+                            help='monta um plano lógico e só o executa nos displays')
+    arg_parser.add_argument('--sem-pushdown', action='store_true',
+                            help='lê todas as colunas dos arquivos e só filtra depois da leitura')
+    arg_parser.add_argument('--sem-fusao', action='store_true',
+                            help='executa filters encadeados um de cada vez')
+    arg_parser.add_argument('--opt-level', type=int, choices=sorted(NIVEIS), default=0,
+                            help='nível de otimização da AST antes da execução (padrão: 0)')
+    args = arg_parser.parse_args()
     
-    file_path = sys.argv[1]
+    file_path = args.arquivo
     
     try:
-        # Lê o arquivo
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
         print(f"Executando programa Coffee: {file_path}")
         print("="*60)
         
-        # Fase 1: Análise Léxica e Sintática
-        print("1. ANÁLISE SINTÁTICA")
+        # Fases 1 e 2: Análise Léxica, Sintática e Semântica. Se o programa
+        # não mudou desde a última execução, a AST validada vem do cache.
+        print("1. ANÁLISE SINTÁTICA E SEMÂNTICA")
         print("-" * 30)
         
-        coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
-        lexer = Lexer(code, coffee_dfa)
-        parser = Parser(lexer)
-        ast = parser.parse()
-        
-        print("AST construída com sucesso!")
-        
-        # Fase 2: Análise Semântica
-        print("\n2. ANÁLISE SEMÂNTICA")
-        print("-" * 30)
+        program = load_program(file_path, fast=args.fast_lexer, use_cache=not args.sem_cache)
         
-        analyzer = SemanticAnalyzer(debug=False)
-        semantic_success, errors, _ = analyzer.analyze(ast)
-        
-        if not semantic_success:
+        if not program.success:
             print("Erros semânticos encontrados:")
-            for error in errors:
+            for error in program.errors:
                 print(f"  - {error}")
             sys.exit(1)
         
-        print("Análise semântica bem-sucedida!")
+        if program.from_cache:
+            print(f"AST validada carregada do cache ({CACHE_DIR})")
+        else:
+            print("AST construída e analisada com sucesso!")
+        ast = program.ast
+        
+        if args.opt_level:
+            ast, relatorio = otimizar(ast, args.opt_level)
+            print(f"\nOtimização (nível {args.opt_level}):")
+            print(formatar_relatorio(relatorio))
         
         # Fase 3: Interpretação/Execução
-        print("\n3. EXECUÇÃO DO PROGRAMA")
+        print("\n2. EXECUÇÃO DO PROGRAMA")
         print("-" * 30)
         
-        interpreter = CoffeeInterpreter(debug=True)
+        interpreter = CoffeeInterpreter(debug=True, lazy=args.lazy, pushdown=not args.sem_pushdown,
+                                        fusion=not args.sem_fusao)
         result = interpreter.interpret(ast)
         
         if result['success']:
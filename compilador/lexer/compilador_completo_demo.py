@@ -15,15 +15,17 @@ from typing import Dict, Any
 
 # Importa todos os componentes do compilador
 sys.path.append(os.path.dirname(__file__))
-from parser import DFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, Parser
+from parser import Parser, TokenType
+from fast_lexer import create_lexer
 from semantic_analyzer import SemanticAnalyzer
 from coffee_interpreter import CoffeeInterpreter
 
 class CompiladorCompleto:
     """Demonstração do compilador completo funcionando end-to-end"""
     
-    def __init__(self, debug: bool = True):
+    def __init__(self, debug: bool = True, lexer_rapido: bool = False):
         self.debug = debug
+        self.lexer_rapido = lexer_rapido
         self.stats = {
             'tempo_lexer': 0,
             'tempo_parser': 0, 
@@ -68,15 +70,14 @@ class CompiladorCompleto:
                 print("   Tokenizando código fonte...")
             
             inicio_lexer = time.time()
-            coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
-            lexer = Lexer(codigo_fonte, coffee_dfa)
+            lexer = create_lexer(codigo_fonte, fast=self.lexer_rapido)
             
             # Conta tokens gerados
             tokens = []
             while True:
                 token = lexer.next_token()
                 tokens.append(token)
-                if token.type == 'EOF':
+                if token.type == TokenType.EOF:
                     break
             
             self.stats['tokens_gerados'] = len(tokens) - 1  # -1 para EOF
@@ -84,7 +85,7 @@ class CompiladorCompleto:
             
             if self.debug:
                 print(f"   ✅ {self.stats['tokens_gerados']} tokens gerados em {self.stats['tempo_lexer']:.4f}s")
-                print(f"   Tokens: {[f'{t.type}({t.value})' for t in tokens[:5]]}...")
+                print(f"   Tokens: {[f'{t.type.name}({t.value})' for t in tokens[:5]]}...")
             
             resultado['fase_atual'] = 'lexer_completo'
             
@@ -95,7 +96,7 @@ class CompiladorCompleto:
             
             inicio_parser = time.time()
             # Recria lexer para parsing (reset)
-            lexer = Lexer(codigo_fonte, coffee_dfa)
+            lexer = create_lexer(codigo_fonte, fast=self.lexer_rapido)
             parser = Parser(lexer)
             ast = parser.parse()
             
@@ -244,7 +245,7 @@ def demonstrar_compilador_completo():
     print("Este programa demonstra todas as fases do compilador funcionando em conjunto.")
     print()
     
-    compilador = CompiladorCompleto(debug=True)
+    compilador = CompiladorCompleto(debug=True, lexer_rapido='--fast-lexer' in sys.argv)
     
     # Programa de exemplo complexo
     programa_exemplo = """
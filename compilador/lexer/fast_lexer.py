@@ -0,0 +1,226 @@
+"""
+LEXER RÁPIDO BASEADO EM EXPRESSÃO REGULAR
+=========================================
+
+Gera, a partir das tabelas DFA_TRANSITIONS / DFA_ACCEPTING_STATES do
+parser, uma única expressão regular mestre que é executada pelo motor
+de regex em C do Python, evitando o laço caractere a caractere do AFD.
+
+Cada caminho do AFD vira uma sequência de conjuntos de caracteres; os
+laços no próprio estado viram repetições gulosas e cada estado de
+aceitação recebe um grupo nomeado vazio no fim do seu ramo. Como o AFD
+é determinístico, o primeiro casamento encontrado pela regex é o mais
+longo, e `match.lastgroup` identifica o estado de aceitação alcançado.
+
+O FastLexer emite exatamente a mesma sequência de Token(type, value,
+offset) que o Lexer, inclusive as mensagens de erro léxico.
+"""
+
+import re
+import sys
+import os
+
+sys.path.append(os.path.dirname(__file__))
+from parser import (DFA_TRANSITIONS, DFA_ACCEPTING_STATES, TRIVIA_TOKENS, CompiledDFA, Lexer,
+                    StreamLexer, Token, TokenType, get_char_class, resolve_transition)
+import tabelas_lexicas
+
+# Classes que get_char_class pode atribuir a caracteres fora do ASCII
+NON_ASCII_CLASSES = ('letra', 'digito', 'outro')
+
+_unicode_class_ranges = None
+_master_patterns = {}
+
+
+def unicode_class_ranges():
+    """
+    Faixas (inclusivas) de code points não ASCII de cada classe de
+    caracteres. O cálculo percorre todo o Unicode, então só é feito
+    uma vez por processo e apenas quando alguma entrada não é ASCII.
+    """
+    global _unicode_class_ranges
+    if _unicode_class_ranges is None:
+        ranges = {name: [] for name in NON_ASCII_CLASSES}
+        current_class = None
+        range_start = 128
+        for code in range(128, sys.maxunicode + 1):
+            char_class = get_char_class(chr(code))
+            if char_class != current_class:
+                if current_class is not None:
+                    ranges[current_class].append((range_start, code - 1))
+                current_class = char_class
+                range_start = code
+        ranges[current_class].append((range_start, sys.maxunicode))
+        _unicode_class_ranges = ranges
+    return _unicode_class_ranges
+
+def _remove_points(ranges, points):
+    """Remove code points isolados de uma lista de faixas"""
+    result = []
+    for start, end in ranges:
+        for point in sorted(p for p in points if start <= p <= end):
+            if start <= point - 1:
+                result.append((start, point - 1))
+            start = point + 1
+        if start <= end:
+            result.append((start, end))
+    return result
+
+def _charset(ascii_codes, ranges):
+    """Monta a classe de caracteres da regex para os códigos/faixas dados"""
+    merged = []
+    for start, end in sorted([(code, code) for code in ascii_codes] + ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+
+    parts = []
+    for start, end in merged:
+        if start == end:
+            parts.append(f'\\U{start:08x}')
+        else:
+            parts.append(f'\\U{start:08x}-\\U{end:08x}')
+    return '[' + ''.join(parts) + ']'
+
+def _transition_charsets(state_transitions, unicode):
+    """Agrupa, por estado de destino, os caracteres que levam a ele"""
+    targets = {}
+    for code in range(128):
+        target = resolve_transition(state_transitions, chr(code))
+        if target is not None:
+            targets.setdefault(target, (set(), []))[0].add(code)
+
+    literals = {ord(key): target for key, target in state_transitions.items()
+                if len(key) == 1 and ord(key) >= 128}
+    for code, target in literals.items():
+        targets.setdefault(target, (set(), []))[1].append((code, code))
+
+    if unicode:
+        for class_name, ranges in unicode_class_ranges().items():
+            target = state_transitions.get(class_name)
+            if target is not None:
+                # Caracteres citados literalmente têm prioridade sobre a classe
+                targets.setdefault(target, (set(), []))[1].extend(
+                    _remove_points(ranges, literals))
+
+    return {target: _charset(codes, ranges) for target, (codes, ranges) in targets.items()}
+
+def build_master_regex(transitions=DFA_TRANSITIONS, accepting_states=DFA_ACCEPTING_STATES,
+                       start_state='S0', unicode=False):
+    """
+    Converte o AFD em uma expressão regular mestre.
+
+    Retorna o texto da regex e o mapa grupo nomeado -> tipo de token.
+    Com `unicode=False` apenas caracteres ASCII são cobertos; a versão
+    Unicode replica get_char_class para todo o espaço de code points.
+    """
+    group_types = {}
+
+    def state_regex(state, path):
+        if state in path:
+            raise ValueError(f"Ciclo no AFD envolvendo '{state}': o gerador só "
+                             "aceita laços no próprio estado")
+        charsets = _transition_charsets(transitions.get(state, {}), unicode)
+        loop = charsets.pop(state, None)
+
+        branches = [charset + state_regex(target, path | {state})
+                    for target, charset in charsets.items()]
+        if state in accepting_states:
+            group_name = f'T{len(group_types)}_{state}'
+            group_types[group_name] = accepting_states[state]
+            # Fica por último: os ramos mais longos são tentados antes
+            branches.append(f'(?P<{group_name}>)')
+
+        regex = loop + '*' if loop else ''
+        if branches:
+            regex += '(?:' + '|'.join(branches) + ')'
+        else:
+            regex += '(?!)'
+        return regex
+
+    return state_regex(start_state, frozenset()), group_types
+
+def master_regex(unicode=False):
+    """Regex mestre compilada das tabelas da linguagem Coffee (com cache)"""
+    if unicode not in _master_patterns:
+        pattern, group_types = build_master_regex(unicode=unicode)
+        _master_patterns[unicode] = (re.compile(pattern), group_types)
+    return _master_patterns[unicode]
+
+
+class FastLexer(Lexer):
+    """
+    Lexer com o mesmo contrato de `Lexer`, mas que reconhece cada lexema
+    com a regex mestre. Fontes puramente ASCII usam a regex enxuta; as
+    demais usam a variante Unicode, equivalente a get_char_class.
+    """
+    def __init__(self, source_code, dfa=None, source_map=None):
+        super().__init__(source_code, dfa or precompiled_dfa(), source_map)
+        pattern, self.group_types = master_regex(unicode=not source_code.isascii())
+        self._match_at = pattern.match
+
+    def match(self, start):
+        match = self._match_at(self.source, start)
+        if match is None:
+            # O AFD produz exatamente a mesma mensagem de erro do Lexer
+            return self.dfa.run(self.source, start)
+        return match.end(), self.group_types[match.lastgroup]
+
+    def next_token(self):
+        # Mesma lógica de Lexer.next_token, com o casamento da regex em linha
+        # para reduzir o custo por token (principalmente espaços e quebras)
+        source = self.source
+        match_at = self._match_at
+        group_types = self.group_types
+        length = len(source)
+        while self.position < length:
+            start = self.position
+
+            match = match_at(source, start)
+            if match is None:
+                # O AFD produz exatamente a mesma mensagem de erro do Lexer
+                try:
+                    end, token_type = self.dfa.run(source, start)
+                except ValueError as e:
+                    raise self.lexical_error(e, start)
+            else:
+                end = match.end()
+                token_type = group_types[match.lastgroup]
+
+            self.position = end
+
+            if token_type in TRIVIA_TOKENS:
+                continue
+
+            lexeme = source[start:end]
+            if token_type == TokenType.IDENTIFIER:
+                lexeme = sys.intern(lexeme)
+
+            return Token(token_type, lexeme, start, self.source_map)
+
+        return Token(TokenType.EOF, None, self.position, self.source_map)
+
+
+def precompiled_dfa():
+    """
+    AFD do lexer carregado das tabelas geradas por tools/gerador_tabelas.py
+    (tabelas_lexicas.py), sem custo de construção na inicialização.
+    """
+    return CompiledDFA.from_tables(tabelas_lexicas)
+
+def create_lexer(source_code, fast=False, source_map=None):
+    """
+    Cria o lexer usado pelos pontos de entrada (`fast` seleciona o FastLexer).
+    `source_code` pode ser uma string ou um stream de texto; streams são
+    lidos em blocos pelo StreamLexer, exceto no FastLexer, que precisa do
+    texto completo para a regex. `source_map` reaproveita o SourceMap
+    já calculado para uma string.
+    """
+    if hasattr(source_code, 'read'):
+        if not fast:
+            return StreamLexer(source_code, precompiled_dfa())
+        source_code = source_code.read()
+    if fast:
+        return FastLexer(source_code, source_map=source_map)
+    return Lexer(source_code, precompiled_dfa(), source_map)
@@ -0,0 +1,150 @@
+"""
+AST PLANA CODIFICADA EM ARRAYS
+==============================
+
+Representação opcional da AST para ferramentas que percorrem programas
+muito grandes. Em vez de um objeto por nó, cada nó é um índice em
+colunas paralelas de `array`:
+
+    kinds[i]                        tipo do nó (PROGRAM, DISPLAY, ...)
+    first_child[i] .. end_child[i]  faixa de índices dos filhos
+    lines[i], cols[i]               posição no código-fonte (0 = desconhecida)
+    payload[i]                      identificador, caminho, operador ou valor
+
+Os nós são numerados em largura a partir da raiz (índice 0), de modo que
+os filhos de cada nó ocupam uma faixa contígua. O select guarda em
+`payload` a tupla (dataset, colunas), e os termos codificam o seu tipo
+no próprio `kinds` (TERM_IDENTIFIER, TERM_NUMBER, TERM_STRING).
+
+Uso:
+    flat = FlatAST.from_ast(Parser(lexer).parse())
+    for index in flat.find(FILTER):
+        ...
+    ast = flat.to_ast()
+"""
+
+import os
+import sys
+from array import array
+
+sys.path.append(os.path.dirname(__file__))
+from parser import (ProgramNode, DisplayStatementNode, AssignmentStatementNode,
+                    LoadExpressionNode, FilterExpressionNode, SelectExpressionNode,
+                    RelationalExpressionNode, TermNode)
+
+(PROGRAM, DISPLAY, ASSIGNMENT, LOAD, FILTER, SELECT, RELATIONAL,
+ TERM_IDENTIFIER, TERM_NUMBER, TERM_STRING) = range(10)
+
+KIND_NAMES = ('Program', 'Display', 'Assignment', 'Load', 'Filter', 'Select', 'Relational',
+              'Term', 'Term', 'Term')
+
+TERM_KINDS = {'IDENTIFIER': TERM_IDENTIFIER, 'NUMBER': TERM_NUMBER, 'STRING': TERM_STRING}
+TERM_TYPES = {kind: term_type for term_type, kind in TERM_KINDS.items()}
+
+# Tipo do nó -> (kind, payload, filhos)
+_DESCRIBE = {
+    ProgramNode: lambda node: (PROGRAM, None, node.statements),
+    DisplayStatementNode: lambda node: (DISPLAY, node.identifier, ()),
+    AssignmentStatementNode: lambda node: (ASSIGNMENT, node.identifier, (node.expression,)),
+    LoadExpressionNode: lambda node: (LOAD, node.file_path, ()),
+    FilterExpressionNode: lambda node: (FILTER, node.dataset, (node.condition,)),
+    SelectExpressionNode: lambda node: (SELECT, (node.dataset, tuple(node.columns)), ()),
+    RelationalExpressionNode: lambda node: (RELATIONAL, node.operator, (node.left, node.right)),
+    TermNode: lambda node: (TERM_KINDS[node.type], node.value, ()),
+}
+
+
+def _describe_subclass(node_class):
+    """Subclasses de nós (ex.: nós preguiçosos) usam a descrição da classe base"""
+    for klass in node_class.__mro__:
+        if klass in _DESCRIBE:
+            _DESCRIBE[node_class] = _DESCRIBE[klass]
+            return _DESCRIBE[klass]
+    raise TypeError(f"Nó sem representação plana: {node_class.__name__}")
+
+
+class FlatAST:
+    """AST em colunas de `array`; os nós são os índices 0 .. len(flat) - 1"""
+    __slots__ = ('kinds', 'first_child', 'end_child', 'lines', 'cols', 'payload')
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.first_child = array('I')
+        self.end_child = array('I')
+        self.lines = array('I')
+        self.cols = array('I')
+        self.payload = []
+
+    @classmethod
+    def from_ast(cls, program):
+        """Achata a AST de `program` (um ProgramNode) em largura"""
+        flat = cls()
+        kinds, payloads = flat.kinds, flat.payload
+        first_child, end_child = flat.first_child, flat.end_child
+        lines, cols = flat.lines, flat.cols
+        # A fila de nós é a própria numeração: o nó i é queue[i]
+        queue = [program]
+        index = 0
+        while index < len(queue):
+            node = queue[index]
+            describe = _DESCRIBE.get(type(node))
+            if describe is None:
+                describe = _describe_subclass(type(node))
+            kind, payload, children = describe(node)
+            kinds.append(kind)
+            payloads.append(payload)
+            lines.append(node.line or 0)
+            cols.append(node.col or 0)
+            first_child.append(len(queue))
+            queue.extend(children)
+            end_child.append(len(queue))
+            index += 1
+        return flat
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def kind_name(self, index):
+        return KIND_NAMES[self.kinds[index]]
+
+    def children(self, index):
+        """Índices dos filhos do nó `index`"""
+        return range(self.first_child[index], self.end_child[index])
+
+    def position(self, index):
+        """(linha, coluna) do nó, ou (None, None) se a posição não é conhecida"""
+        return self.lines[index] or None, self.cols[index] or None
+
+    def find(self, kind):
+        """Índices de todos os nós do tipo `kind`, em ordem crescente"""
+        kinds = self.kinds.tobytes()
+        marker = bytes((kind,))
+        indices = []
+        index = kinds.find(marker)
+        while index != -1:
+            indices.append(index)
+            index = kinds.find(marker, index + 1)
+        return indices
+
+    def to_ast(self, index=0):
+        """Reconstrói os objetos da AST a partir do nó `index`"""
+        kind = self.kinds[index]
+        payload = self.payload[index]
+        line, col = self.position(index)
+        children = [self.to_ast(child) for child in self.children(index)]
+        if kind == PROGRAM:
+            return ProgramNode(children, line, col)
+        if kind == DISPLAY:
+            return DisplayStatementNode(payload, line, col)
+        if kind == ASSIGNMENT:
+            return AssignmentStatementNode(payload, children[0], line, col)
+        if kind == LOAD:
+            return LoadExpressionNode(payload, line, col)
+        if kind == FILTER:
+            return FilterExpressionNode(payload, children[0], line, col)
+        if kind == SELECT:
+            dataset, columns = payload
+            return SelectExpressionNode(dataset, list(columns), line, col)
+        if kind == RELATIONAL:
+            return RelationalExpressionNode(children[0], payload, children[1], line, col)
+        return TermNode(payload, TERM_TYPES[kind], line, col)
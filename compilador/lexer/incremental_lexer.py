@@ -0,0 +1,120 @@
+"""
+RE-TOKENIZAÇÃO INCREMENTAL
+==========================
+
+Integrações com editores chamam o lexer a cada tecla. Em vez de
+tokenizar o arquivo inteiro de novo, `relex` recebe o TokenBuffer
+anterior e uma edição (offset, tamanho removido, texto inserido) e:
+
+1. volta até o último token que começa antes da edição (o lexema dele
+   pode crescer ou encolher por causa do texto editado);
+2. varre o novo código a partir dali com o mesmo AFD;
+3. para assim que um token novo começa, depois da edição, exatamente
+   onde começava um token antigo (já deslocado pela edição). Como o AFD
+   sempre parte de S0 no início de um token e só olha para frente, a
+   partir desse ponto a sequência antiga volta a valer.
+
+Os tokens posteriores ao ponto de sincronização são reaproveitados,
+apenas com o início deslocado; linha e coluna vêm do SourceMap, que
+recalcula só as linhas tocadas pela edição.
+"""
+
+import sys
+import os
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+
+sys.path.append(os.path.dirname(__file__))
+from token_buffer import TokenBuffer, scan_tokens, tokenize_all
+
+
+@dataclass
+class TokenChange:
+    """
+    Faixa de tokens alterada por uma edição: os tokens
+    antigo[first:old_stop] foram substituídos por novo[first:new_stop]
+    """
+    first: int
+    old_stop: int
+    new_stop: int
+
+
+def relex(buffer, offset, deleted_length, inserted_text, fast=True):
+    """
+    Aplica uma edição ao código de `buffer` e re-tokeniza só o trecho afetado.
+
+    Returns:
+        tuple: (novo_buffer, TokenChange)
+    """
+    old_source = buffer.source
+    if offset < 0 or deleted_length < 0 or offset + deleted_length > len(old_source):
+        raise ValueError(f"Edição fora dos limites do código-fonte: "
+                         f"offset={offset}, removidos={deleted_length}")
+
+    # Só as linhas tocadas pela edição são recalculadas no SourceMap
+    source_map = buffer.source_map.edited(offset, deleted_length, inserted_text)
+    new_source = source_map.text
+    delta = len(inserted_text) - deleted_length
+    new_edit_end = offset + len(inserted_text)
+
+    starts = buffer.starts
+    # Último token que começa antes da edição
+    first = bisect_left(starts, offset) - 1
+    if first < 0:
+        first, position = 0, 0
+    else:
+        position = starts[first]
+
+    rescanned = []
+    resync = None
+    old_index = first
+    for entry in scan_tokens(new_source, position, fast=fast, source_map=source_map):
+        start = entry[1]
+        if start >= new_edit_end:
+            old_start = start - delta
+            while old_index < len(buffer) and starts[old_index] < old_start:
+                old_index += 1
+            if old_index < len(buffer) and starts[old_index] == old_start:
+                resync = old_index
+                break
+        rescanned.append(entry)
+
+    result = TokenBuffer(new_source, source_map)
+    result.types = buffer.types[:first]
+    result.starts = buffer.starts[:first]
+    result.lengths = buffer.lengths[:first]
+    for entry in rescanned:
+        result.append(*entry)
+    new_stop = len(result)
+
+    if resync is None:
+        # A varredura chegou ao fim do arquivo (inclusive o EOF) sem sincronizar
+        return result, TokenChange(first, len(buffer), new_stop)
+
+    result.types.extend(buffer.types[resync:])
+    result.lengths.extend(buffer.lengths[resync:])
+    if delta:
+        result.starts.extend(array('I', [start + delta for start in buffer.starts[resync:]]))
+    else:
+        result.starts.extend(buffer.starts[resync:])
+
+    return result, TokenChange(first, resync, new_stop)
+
+
+class IncrementalLexer:
+    """Mantém o TokenBuffer de um documento em edição"""
+
+    def __init__(self, source, fast=True):
+        self.fast = fast
+        self.buffer = tokenize_all(source, fast=fast)
+
+    @property
+    def source(self):
+        return self.buffer.source
+
+    def edit(self, offset, deleted_length, inserted_text):
+        """Aplica a edição e retorna a faixa de tokens alterada"""
+        self.buffer, change = relex(self.buffer, offset, deleted_length,
+                                    inserted_text, fast=self.fast)
+        return change
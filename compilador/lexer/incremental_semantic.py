@@ -0,0 +1,242 @@
+"""
+ANÁLISE SEMÂNTICA INCREMENTAL
+=============================
+
+`SemanticAnalyzer.analyze` percorre o programa inteiro e recria a
+SymbolTable a cada chamada. O `IncrementalSemanticAnalyzer` mantém o
+resultado de cada comando e um grafo def-use entre eles:
+
+- um comando depende dos nomes que consultou na tabela de símbolos
+  (lookup) e do nome que tentou declarar;
+- o estado visível de um nome antes de um comando é a primeira
+  declaração bem-sucedida dele entre os comandos anteriores.
+
+Ao editar comandos, só os novos são verificados. Se um comando passa a
+declarar um nome (ou deixa de declará-lo), os comandos seguintes que
+dependem desse nome são verificados de novo, e assim por diante. A
+verificação de cada comando é feita pelo próprio SemanticAnalyzer,
+com uma tabela de símbolos que enxerga só os comandos anteriores, de
+modo que erros e avisos são exatamente os da análise completa.
+
+Os comandos ficam em ordem por uma chave inteira com folgas entre
+vizinhos: inserir comandos não renumera os seguintes (só quando a
+folga acaba).
+
+Uso:
+    analyzer = IncrementalSemanticAnalyzer(Parser(lexer).parse())
+    analyzer.edit(3, 4, [novo_comando])   # troca o comando 3
+    success, errors, info = analyzer.result()
+"""
+
+import heapq
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from parser import AssignmentStatementNode
+from semantic_analyzer import DataType, SemanticAnalyzer, Symbol
+
+# Distância entre as chaves de comandos vizinhos após uma renumeração
+KEY_GAP = 1 << 20
+
+
+class StatementAnalysis:
+    """Resultado da verificação de um comando: erros, avisos e tipo declarado"""
+    __slots__ = ('statement', 'key', 'target', 'declared', 'lookups',
+                 'errors', 'warnings', 'stats', 'removed')
+
+    def __init__(self, statement, key):
+        self.statement = statement
+        self.key = key
+        # Nome que o comando tenta declarar (None em um display)
+        self.target = statement.identifier if isinstance(statement, AssignmentStatementNode) else None
+        # Tipo declarado com sucesso, ou None
+        self.declared = None
+        self.lookups = []
+        self.errors = []
+        self.warnings = []
+        self.stats = {}
+        self.removed = False
+
+
+class _StatementScope:
+    """Tabela de símbolos vista por um comando: só as declarações anteriores a ele"""
+
+    def __init__(self, analyzer, state):
+        self.analyzer = analyzer
+        self.state = state
+
+    def lookup(self, name):
+        self.state.lookups.append(name)
+        definition = self.analyzer._definition_before(name, self.state)
+        return Symbol(name, definition.declared, True) if definition else None
+
+    def declare(self, name, data_type, metadata=None):
+        if self.analyzer._definition_before(name, self.state):
+            return False
+        self.state.declared = data_type
+        return True
+
+    def exists(self, name):
+        return self.analyzer._definition_before(name, self.state) is not None
+
+    def get_type(self, name):
+        symbol = self.lookup(name)
+        return symbol.type if symbol else DataType.UNKNOWN
+
+
+class IncrementalSemanticAnalyzer:
+    """Mantém a análise semântica de um programa em edição"""
+
+    def __init__(self, program=None):
+        self.states = []
+        # Nome -> comandos que o consultaram / que tentam declará-lo / que o declararam
+        self.readers = {}
+        self.declarers = {}
+        self.definitions = {}
+        self.error_count = 0
+        self._checker = SemanticAnalyzer()
+        if program is not None:
+            self.edit(0, 0, program.statements)
+
+    @property
+    def statements(self):
+        return [state.statement for state in self.states]
+
+    @property
+    def success(self):
+        return self.error_count == 0
+
+    def edit(self, start, stop, statements):
+        """
+        Troca os comandos [start:stop] por `statements` (inserção se
+        start == stop, remoção se `statements` é vazio).
+
+        Returns:
+            list: StatementAnalysis dos comandos verificados de novo, em ordem
+        """
+        if not 0 <= start <= stop <= len(self.states):
+            raise ValueError(f"Faixa de comandos inválida: [{start}:{stop}] "
+                             f"em um programa com {len(self.states)} comandos")
+
+        keys = self._keys_between(start, stop, len(statements))
+        new_states = [StatementAnalysis(statement, key) for statement, key in zip(statements, keys)]
+        removed = self.states[start:stop]
+        self.states[start:stop] = new_states
+
+        pending = {}
+        for state in removed:
+            self._forget(state)
+            state.removed = True
+            self.error_count -= len(state.errors)
+            if state.target is not None:
+                self.declarers[state.target].discard(state)
+            if state.declared is not None:
+                self._invalidate(state.target, state.key, pending)
+        for state in new_states:
+            if state.target is not None:
+                self.declarers.setdefault(state.target, set()).add(state)
+            pending[state] = state.key
+
+        # Em ordem de chave: ao verificar um comando, os anteriores já estão corretos
+        heap = [(key, id(state), state) for state, key in pending.items()]
+        heapq.heapify(heap)
+        rechecked = []
+        while heap:
+            _, _, state = heapq.heappop(heap)
+            del pending[state]
+            if state.removed:
+                continue
+            previous = state.declared
+            self._check(state)
+            rechecked.append(state)
+            if state.declared != previous:
+                self._invalidate(state.target, state.key, pending, heap)
+        return rechecked
+
+    def result(self):
+        """Mesmo retorno de SemanticAnalyzer.analyze (percorre todos os comandos)"""
+        errors = [error for state in self.states for error in state.errors]
+        warnings = [warning for state in self.states for warning in state.warnings]
+        statistics = {'variables_declared': 0, 'operations_validated': 0, 'type_inferences': 0}
+        symbols = {}
+        for state in self.states:
+            for name, count in state.stats.items():
+                statistics[name] += count
+            if state.declared is None:
+                continue
+            symbol = Symbol(state.target, state.declared, True)
+            symbol.usage_count = sum(reader.lookups.count(state.target)
+                                     for reader in self.readers.get(state.target, ())
+                                     if reader.key > state.key)
+            symbols[state.target] = symbol
+        for name, symbol in symbols.items():
+            if symbol.usage_count == 0:
+                warnings.append(f"Variável '{name}' foi declarada mas nunca utilizada")
+        info = {'symbol_table': symbols, 'warnings': warnings, 'statistics': statistics}
+        return not errors, errors, info
+
+    # ===== MÉTODOS AUXILIARES =====
+
+    def _check(self, state):
+        """Verifica um comando com o SemanticAnalyzer, vendo só os comandos anteriores"""
+        self._forget(state)
+        self.error_count -= len(state.errors)
+        state.declared = None
+        state.lookups = []
+
+        checker = self._checker
+        checker.symbol_table = _StatementScope(self, state)
+        checker.errors = state.errors = []
+        checker.warnings = state.warnings = []
+        checker.stats = state.stats = {'variables_declared': 0, 'operations_validated': 0,
+                                       'type_inferences': 0}
+        checker.visit(state.statement)
+
+        self.error_count += len(state.errors)
+        for name in state.lookups:
+            self.readers.setdefault(name, set()).add(state)
+        if state.declared is not None:
+            self.definitions.setdefault(state.target, set()).add(state)
+
+    def _forget(self, state):
+        """Retira o comando do grafo def-use"""
+        for name in state.lookups:
+            readers = self.readers.get(name)
+            if readers is not None:
+                readers.discard(state)
+        if state.declared is not None:
+            self.definitions[state.target].discard(state)
+
+    def _definition_before(self, name, state):
+        """Declaração bem-sucedida de `name` anterior a `state`, ou None"""
+        for definition in self.definitions.get(name, ()):
+            if definition.key < state.key:
+                return definition
+        return None
+
+    def _invalidate(self, name, key, pending, heap=None):
+        """Agenda os comandos posteriores a `key` que dependem de `name`"""
+        if name is None:
+            return
+        for dependents in (self.readers.get(name, ()), self.declarers.get(name, ())):
+            for dependent in dependents:
+                if dependent.key > key and dependent not in pending and not dependent.removed:
+                    pending[dependent] = dependent.key
+                    if heap is not None:
+                        heapq.heappush(heap, (dependent.key, id(dependent), dependent))
+
+    def _keys_between(self, start, stop, count):
+        """Chaves para `count` comandos entre states[start - 1] e states[stop]"""
+        low = self.states[start - 1].key if start > 0 else 0
+        high = self.states[stop].key if stop < len(self.states) else low + KEY_GAP * (count + 1)
+        if high - low <= count:
+            # Sem folga: renumera todos os comandos, com distância suficiente
+            # para os `count` novos entre quaisquer dois vizinhos
+            gap = max(KEY_GAP, count + 1)
+            for index, state in enumerate(self.states):
+                state.key = (index + 1) * gap
+            low = start * gap
+            high = (stop + 1) * gap
+        step = (high - low) // (count + 1)
+        return [low + step * (index + 1) for index in range(count)]
@@ -56,41 +56,45 @@ class DFA:
         self.transitions = transitions
         self.accepting_states = accepting_states
 
-    def run(self, input_string):
+    def run(self, source, start=0):
         """
-        Executa o AFD na string de entrada e retorna o lexema mais longo
-        e seu tipo de token correspondente.
+        Executa o AFD sobre `source` a partir do índice `start` e retorna
+        a posição final do lexema mais longo e seu tipo de token.
         """
         current_state = 'S0'
-        last_accepted_info = None
+        last_accepted_state = None
+        last_accepted_end = start
         
-        # Percorre a string para encontrar o "match" mais longo
-        for i, char in enumerate(input_string):
-            char_class = get_char_class(char)
+        # Percorre a string por índice para encontrar o "match" mais longo
+        # sem criar cópias do restante do código-fonte
+        i = start
+        length = len(source)
+        while i < length:
+            char = source[i]
+            state_transitions = self.transitions.get(current_state, {})
             
             # Casos especiais que não estão na tabela principal para simplificar
-            if char in self.transitions.get(current_state, {}):
-                current_state = self.transitions[current_state][char]
-            elif char_class in self.transitions.get(current_state, {}):
-                current_state = self.transitions[current_state][char_class]
+            if char in state_transitions:
+                current_state = state_transitions[char]
             else:
-                break # Nenhuma transição, fim do token
+                char_class = get_char_class(char)
+                if char_class in state_transitions:
+                    current_state = state_transitions[char_class]
+                else:
+                    break # Nenhuma transição, fim do token
             
+            i += 1
             # Se o estado atual for de aceitação, salve-o
             if current_state in self.accepting_states:
-                last_accepted_info = {
-                    "state": current_state,
-                    "position": i + 1
-                }
+                last_accepted_state = current_state
+                last_accepted_end = i
         
-        if last_accepted_info is None:
+        if last_accepted_state is None:
             # Não foi possível reconhecer nenhum token
-            raise ValueError(f"Token inválido começando com '{input_string[0]}'")
+            raise ValueError(f"Token inválido começando com '{source[start]}'")
 
-        # Retorna o lexema e o tipo do último estado de aceitação válido
-        lexeme = input_string[:last_accepted_info["position"]]
-        token_type = self.accepting_states[last_accepted_info["state"]]
-        return lexeme, token_type
+        # Retorna o fim do lexema e o tipo do último estado de aceitação válido
+        return last_accepted_end, self.accepting_states[last_accepted_state]
 
 class Lexer:
     """Gerencia o processo de tokenização do código-fonte."""
@@ -103,29 +107,31 @@ class Lexer:
 
     def next_token(self):
         """Retorna o próximo token válido do código-fonte."""
-        while self.position < len(self.source):
-            remaining_code = self.source[self.position:]
+        source = self.source
+        while self.position < len(source):
+            start = self.position
             
             try:
-                lexeme, token_type = self.dfa.run(remaining_code)
+                end, token_type = self.dfa.run(source, start)
             except ValueError as e:
                 # Adiciona contexto de linha/coluna ao erro do DFA
                 raise ValueError(f"{e} na linha {self.line}, coluna {self.col}")
 
             # Atualiza posição, linha e coluna
-            self.position += len(lexeme)
-            lines_in_lexeme = lexeme.count('\n')
+            self.position = end
+            lines_in_lexeme = source.count('\n', start, end)
             if lines_in_lexeme > 0:
                 self.line += lines_in_lexeme
                 # Encontra a posição da última nova linha para resetar a coluna
-                self.col = len(lexeme) - lexeme.rfind('\n')
+                self.col = end - source.rfind('\n', start, end)
             else:
-                self.col += len(lexeme)
+                self.col += end - start
 
             # Ignora tokens que não são relevantes para o parser
             if token_type in ['WHITESPACE', 'COMMENT', 'NEWLINE']:
                 continue
             
+            lexeme = source[start:end]
             # Converte IDENTIFIER para KEYWORD, se aplicável
             if token_type == 'IDENTIFIER' and lexeme in KEYWORDS:
                 token_type = 'KEYWORD'
@@ -135,6 +141,20 @@ class Lexer:
         return None # Fim do arquivo (End of File)
 
 
+def tokenize_stream(stream, dfa):
+    """
+    Gera os tokens de um stream de texto linha a linha, sem carregar o
+    arquivo inteiro. Nenhum token desta linguagem atravessa uma quebra
+    de linha (strings e comentários terminam nela), então tokenizar cada
+    linha separadamente produz os mesmos tokens e erros que o Lexer.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        lexer = Lexer(line, dfa)
+        lexer.line = line_number
+        while (token := lexer.next_token()):
+            yield token
+
+
 if __name__ == '__main__':
     if len(sys.argv) != 2:
         print("Uso: python lexer.py <caminho_para_o_arquivo.coffee>")
@@ -142,8 +162,7 @@ if __name__ == '__main__':
 
     file_path = sys.argv[1]
     try:
-        with open(file_path, 'r') as f:
-            code = f.read()
+        source_file = open(file_path, 'r', encoding='utf-8')
     except FileNotFoundError:
         print(f"Erro: O arquivo '{file_path}' não foi encontrado.")
         sys.exit(1)
@@ -151,16 +170,14 @@ if __name__ == '__main__':
     # 1. Cria a instância do DFA
     coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
     
-    # 2. Cria a instância do Lexer, injetando o DFA
-    lexer = Lexer(code, coffee_dfa)
-    
-    # 3. Processa e imprime os tokens
+    # 2. Processa e imprime os tokens, lendo o arquivo linha a linha
     print(f"Analisando o arquivo: {file_path}\n")
     print(f"| {'Token'.ljust(20)} | {'Tipo'.ljust(15)} |")
     print(f"+{'-'*22}+{'-'*17}+")
     
     try:
-        while (token := lexer.next_token()):
-            print(f"| {token[0].ljust(20)} | {token[1].ljust(15)} |")
+        with source_file:
+            for token in tokenize_stream(source_file, coffee_dfa):
+                print(f"| {token[0].ljust(20)} | {token[1].ljust(15)} |")
     except ValueError as e:
         print(e)
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+PLANO LÓGICO DE CONSULTA
+========================
+
+No modo preguiçoso do CoffeeInterpreter, `load`, `filter` e `select` não
+produzem DataFrames: cada atribuição guarda no Environment um nó de
+plano lógico que aponta para o plano do dataset de origem.
+
+    Scan(file_path, columns)            load "arquivo" (só `columns`, se dado)
+    Filter(child, column, op, value)    filter <child> where column op value
+    Project(child, columns)             select <child> (columns)
+
+Um plano só é executado (pelo PlanExecutor do interpretador) quando um
+consumidor precisa dos dados, como um `display`. Variáveis usadas por
+mais de um comando são nós compartilhados entre planos; o executor
+calcula cada nó uma única vez.
+
+Os nós são comparados por identidade: dois `load` do mesmo arquivo são
+nós distintos, como são variáveis distintas no programa.
+"""
+
+
+class PlanNode:
+    """Nó do plano lógico"""
+    __slots__ = ()
+
+    @property
+    def children(self):
+        return ()
+
+    def explain(self, indent=0):
+        """Árvore do plano em texto, um nó por linha"""
+        lines = ['  ' * indent + self.describe()]
+        for child in self.children:
+            lines.append(child.explain(indent + 1))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return self.describe()
+
+
+class Scan(PlanNode):
+    """Leitura de um arquivo de dados"""
+    __slots__ = ('file_path', 'columns')
+
+    def __init__(self, file_path, columns=None):
+        # Caminho como no código-fonte, entre aspas
+        self.file_path = file_path
+        # Colunas a ler (None = todas)
+        self.columns = columns
+
+    def describe(self):
+        if self.columns is None:
+            return f"Scan({self.file_path})"
+        return f"Scan({self.file_path}, colunas: {', '.join(sorted(self.columns))})"
+
+
+class Filter(PlanNode):
+    """Linhas de `child` em que `column operator value`"""
+    __slots__ = ('child', 'column', 'operator', 'value')
+
+    def __init__(self, child, column, operator, value):
+        self.child = child
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    @property
+    def children(self):
+        return (self.child,)
+
+    def describe(self):
+        return f"Filter({self.column} {self.operator} {self.value!r})"
+
+
+class Project(PlanNode):
+    """Colunas `columns` de `child`"""
+    __slots__ = ('child', 'columns')
+
+    def __init__(self, child, columns):
+        self.child = child
+        self.columns = list(columns)
+
+    @property
+    def children(self):
+        return (self.child,)
+
+    def describe(self):
+        return f"Project({', '.join(self.columns)})"
@@ -1,5 +1,11 @@
+import os
 import sys
-from abc import ABC, abstractmethod
+import argparse
+from enum import IntEnum
+from operator import attrgetter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from lib.utils.source_location import SourceMap
 
 """
 PARSER COM CONSTRUÇÃO DE AST PARA LINGUAGEM COFFEE
@@ -22,88 +28,178 @@ e facilita a análise semântica posterior.
 
 # ===== AST NODE CLASSES =====
 
-class ASTNode(ABC):
-    """Classe base abstrata para todos os nós da AST"""
-    pass
+class ASTNode:
+    """
+    Classe base para todos os nós da AST.
+
+    Os nós usam __slots__ (sem __dict__ por instância) e guardam a linha e
+    a coluna do token que os originou. Depois de construídos são imutáveis
+    (sequências são guardadas como tuplas): informações das fases
+    seguintes ficam em estruturas próprias, indexadas pelo nó. Os
+    construtores gravam os campos com _set, que contorna o __setattr__
+    bloqueado.
+    """
+    __slots__ = ('line', 'col')
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} é imutável: não é possível alterar '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} é imutável: não é possível remover '{name}'")
+
+    def _set(self, name, value):
+        """Grava um campo durante a construção do nó"""
+        object.__setattr__(self, name, value)
 
 class ProgramNode(ASTNode):
     """Nó raiz do programa - contém lista de statements"""
-    def __init__(self, statements):
-        self.statements = statements
+    __slots__ = ('statements',)
+
+    def __init__(self, statements, line=None, col=None):
+        self._set('statements', tuple(statements))
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
-        return f"Program({self.statements})"
+        return f"Program({list(self.statements)})"
 
 class StatementNode(ASTNode):
     """Classe base para todos os statements"""
-    pass
+    __slots__ = ()
 
 class DisplayStatementNode(StatementNode):
     """Nó para comando display"""
-    def __init__(self, identifier):
-        self.identifier = identifier
+    __slots__ = ('identifier',)
+
+    def __init__(self, identifier, line=None, col=None):
+        self._set('identifier', identifier)
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
         return f"Display({self.identifier})"
 
 class AssignmentStatementNode(StatementNode):
     """Nó para comando de atribuição"""
-    def __init__(self, identifier, expression):
-        self.identifier = identifier
-        self.expression = expression
+    __slots__ = ('identifier', 'expression')
+
+    def __init__(self, identifier, expression, line=None, col=None):
+        self._set('identifier', identifier)
+        self._set('expression', expression)
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
         return f"Assignment({self.identifier} = {self.expression})"
 
 class ExpressionNode(ASTNode):
     """Classe base para expressões"""
-    pass
+    __slots__ = ()
 
 class LoadExpressionNode(ExpressionNode):
     """Nó para expressão load"""
-    def __init__(self, file_path):
-        self.file_path = file_path
+    __slots__ = ('file_path',)
+
+    def __init__(self, file_path, line=None, col=None):
+        self._set('file_path', file_path)
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
         return f"Load({self.file_path})"
 
 class FilterExpressionNode(ExpressionNode):
     """Nó para expressão filter"""
-    def __init__(self, dataset, condition):
-        self.dataset = dataset
-        self.condition = condition
+    __slots__ = ('dataset', 'condition')
+
+    def __init__(self, dataset, condition, line=None, col=None):
+        self._set('dataset', dataset)
+        self._set('condition', condition)
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
         return f"Filter({self.dataset}, {self.condition})"
 
 class SelectExpressionNode(ExpressionNode):
     """Nó para expressão select"""
-    def __init__(self, dataset, columns):
-        self.dataset = dataset
-        self.columns = columns
+    __slots__ = ('dataset', 'columns')
+
+    def __init__(self, dataset, columns, line=None, col=None):
+        self._set('dataset', dataset)
+        self._set('columns', tuple(columns))
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
-        return f"Select({self.dataset}, {self.columns})"
+        return f"Select({self.dataset}, {list(self.columns)})"
 
 class RelationalExpressionNode(ExpressionNode):
     """Nó para expressão relacional (comparação)"""
-    def __init__(self, left, operator, right):
-        self.left = left
-        self.operator = operator
-        self.right = right
+    __slots__ = ('left', 'operator', 'right')
+
+    def __init__(self, left, operator, right, line=None, col=None):
+        self._set('left', left)
+        self._set('operator', operator)
+        self._set('right', right)
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
         return f"({self.left} {self.operator} {self.right})"
 
 class TermNode(ASTNode):
     """Nó para termos (identificadores, números, strings)"""
-    def __init__(self, value, term_type):
-        self.value = value
-        self.type = term_type  # 'IDENTIFIER', 'NUMBER', 'STRING'
+    __slots__ = ('value', 'type')
+
+    def __init__(self, value, term_type, line=None, col=None):
+        self._set('value', value)
+        self._set('type', term_type)  # 'IDENTIFIER', 'NUMBER', 'STRING'
+        self._set('line', line)
+        self._set('col', col)
     
     def __repr__(self):
         return f"{self.type}({self.value})"
 
+
+class NodeVisitor:
+    """
+    Base dos visitors da AST (SemanticAnalyzer, CoffeeInterpreter).
+
+    Cada subclasse tem a sua tabela de despacho `_dispatch` (classe do nó
+    -> função visit_<Classe>, da própria classe ou da base mais próxima, ou
+    generic_visit). O getattr é feito só na
+    primeira visita a cada classe de nó; as seguintes custam uma consulta
+    ao dicionário.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    def visit(self, node):
+        try:
+            handler = self._dispatch[type(node)]
+        except KeyError:
+            handler = self._resolve(type(node))
+        return handler(self, node)
+
+    @classmethod
+    def _resolve(cls, node_class):
+        # Subclasses de nós (ex.: os nós preguiçosos do skeleton_parser) usam
+        # o visit_ da classe base mais próxima
+        handler = cls.generic_visit
+        for klass in node_class.__mro__:
+            method = getattr(cls, f'visit_{klass.__name__}', None)
+            if method is not None:
+                handler = method
+                break
+        cls._dispatch[node_class] = handler
+        return handler
+
+    def generic_visit(self, node):
+        raise NotImplementedError(f"{type(self).__name__} não trata {type(node).__name__}")
+
 # ===== LEXER CLASSES =====
 
 def get_char_class(char):
@@ -117,6 +213,34 @@ def get_char_class(char):
     if char in '><=!': return char
     return 'outro'
 
+class TokenType(IntEnum):
+    """Tipos de token como inteiros pequenos: o parser compara inteiros, não strings"""
+    EOF = 0
+    IDENTIFIER = 1
+    NUMBER = 2
+    STRING = 3
+    GT = 4
+    GE = 5
+    LT = 6
+    LE = 7
+    ASSIGN = 8
+    EQEQ = 9
+    NE = 10
+    LPAREN = 11
+    RPAREN = 12
+    COMMA = 13
+    LOAD = 14
+    FILTER = 15
+    SELECT = 16
+    DISPLAY = 17
+    WHERE = 18
+    COMMENT = 19
+    WHITESPACE = 20
+    NEWLINE = 21
+
+# Tokens descartados antes de chegar ao parser
+TRIVIA_TOKENS = frozenset({TokenType.WHITESPACE, TokenType.COMMENT, TokenType.NEWLINE})
+
 DFA_TRANSITIONS = {
     'S0': {
         'letra': 'S1_ID', 'digito': 'S2_NUM', '>': 'S4_GT', '<': 'S5_LT',
@@ -139,188 +263,632 @@ DFA_TRANSITIONS = {
 
 
 DFA_ACCEPTING_STATES = {
-    'S1_ID': 'IDENTIFIER',
-    'S2_NUM': 'NUMBER',
-    'S3_FLOAT_NUM': 'NUMBER',
-    'S4_GT': 'GT',
-    'S4_GE': 'GE',
-    'S5_LT': 'LT',
-    'S5_LE': 'LE',
-    'S6_EQ': 'ASSIGN',
-    'S6_EQEQ': 'EQEQ',
-    'S7_NE_EQ': 'NE',
-    'S8_END_STR': 'STRING',
-    'S9_LPAREN': 'LPAREN',
-    'S10_RPAREN': 'RPAREN',
-    'S11_COMMA': 'COMMA',
-    'S12_COMMENT': 'COMMENT',
-    'S13_SPACE': 'WHITESPACE',
-    'S14_NEWLINE': 'NEWLINE',
+    'S1_ID': TokenType.IDENTIFIER,
+    'S2_NUM': TokenType.NUMBER,
+    'S3_FLOAT_NUM': TokenType.NUMBER,
+    'S4_GT': TokenType.GT,
+    'S4_GE': TokenType.GE,
+    'S5_LT': TokenType.LT,
+    'S5_LE': TokenType.LE,
+    'S6_EQ': TokenType.ASSIGN,
+    'S6_EQEQ': TokenType.EQEQ,
+    'S7_NE_EQ': TokenType.NE,
+    'S8_END_STR': TokenType.STRING,
+    'S9_LPAREN': TokenType.LPAREN,
+    'S10_RPAREN': TokenType.RPAREN,
+    'S11_COMMA': TokenType.COMMA,
+    'S12_COMMENT': TokenType.COMMENT,
+    'S13_SPACE': TokenType.WHITESPACE,
+    'S14_NEWLINE': TokenType.NEWLINE,
+}
+
+KEYWORDS = {
+    'load': TokenType.LOAD,
+    'filter': TokenType.FILTER,
+    'select': TokenType.SELECT,
+    'display': TokenType.DISPLAY,
+    'where': TokenType.WHERE,
 }
 
-KEYWORDS = {'load', 'filter', 'select', 'display', 'where'}
+def add_keyword_states(transitions, accepting_states, keywords):
+    """
+    Incorpora as palavras-chave ao AFD como uma trie que sai de S0.
+
+    Cada prefixo de palavra-chave vira um estado de identificador próprio
+    ('S1_ID_lo', ...): a letra seguinte da palavra (transição literal, que
+    tem prioridade sobre a classe) leva ao próximo prefixo e qualquer outro
+    caractere de identificador volta para S1_ID. Assim o AFD já termina no
+    tipo da palavra-chave, sem consulta a KEYWORDS depois de cada lexema.
+    """
+    for keyword, token_type in keywords.items():
+        state = 'S0'
+        for i, char in enumerate(keyword):
+            prefix_state = f'S1_ID_{keyword[:i + 1]}'
+            if prefix_state not in transitions:
+                transitions[prefix_state] = dict(transitions['S1_ID'])
+                accepting_states[prefix_state] = TokenType.IDENTIFIER
+            transitions[state][char] = prefix_state
+            state = prefix_state
+        accepting_states[state] = token_type
+
+add_keyword_states(DFA_TRANSITIONS, DFA_ACCEPTING_STATES, KEYWORDS)
 
 class Token:
-    def __init__(self, type, value, line, col):
+    """
+    Token do lexer. Guarda apenas o offset do lexema; a linha e a coluna
+    vêm do SourceMap do código-fonte, compartilhado por todos os tokens.
+    """
+    __slots__ = ('type', 'value', 'offset', 'source_map')
+
+    def __init__(self, type, value, offset, source_map):
         self.type = type
         self.value = value
-        self.line = line
-        self.col = col
+        self.offset = offset
+        self.source_map = source_map
+
+    @property
+    def position(self):
+        """(linha, coluna) do início do lexema"""
+        return self.source_map.line_col(self.offset)
+
+    @property
+    def line(self):
+        return self.source_map.line_col(self.offset)[0]
+
+    @property
+    def col(self):
+        return self.source_map.line_col(self.offset)[1]
 
     def __repr__(self):
-        return f"Token({self.type}, {self.value!r}, L{self.line}:C{self.col})"
+        return f"Token({self.type.name}, {self.value!r}, L{self.line}:C{self.col})"
+
+class PositionedToken(Token):
+    """
+    Token com a linha e a coluna calculadas na criação. Usado pelo
+    StreamLexer, cujo SourceMap esquece as linhas já lidas: a posição
+    continua disponível depois que o lexer avança.
+    """
+    __slots__ = ('_position',)
+
+    def __init__(self, type, value, offset, source_map):
+        super().__init__(type, value, offset, source_map)
+        self._position = source_map.line_col(offset)
+
+    @property
+    def position(self):
+        return self._position
+
+    @property
+    def line(self):
+        return self._position[0]
+
+    @property
+    def col(self):
+        return self._position[1]
 
 class DFA:
     def __init__(self, transitions, accepting_states):
         self.transitions = transitions
         self.accepting_states = accepting_states
 
-    def run(self, input_string):
+    def run(self, source, start=0):
+        """
+        Executa o AFD sobre `source` a partir do índice `start` e retorna
+        a posição final do lexema mais longo e seu tipo de token.
+
+        A varredura trabalha apenas com índices: o código-fonte nunca é
+        fatiado, o que mantém a tokenização linear no tamanho do arquivo.
+        """
+        end, token_type, state, _ = self.scan(source, start)
+        if token_type is None:
+            if state == 'S8_STR':
+                raise ValueError("String não fechada")
+            raise ValueError(f"Token inválido começando com '{source[start]}'")
+        return end, token_type
+
+    def scan(self, source, start=0):
         """
-        Executa o AFD na string de entrada e retorna o lexema mais longo
-        e seu tipo de token correspondente.
+        Varredura bruta do AFD a partir de `start`. Retorna
+        (fim_do_maior_lexema, tipo_ou_None, estado_final, fim_da_varredura);
+        `fim_da_varredura == len(source)` indica que a entrada acabou com
+        o AFD ainda ativo, ou seja, o lexema poderia continuar.
         """
+        transitions = self.transitions
         current_state = 'S0'
-        last_accepted_info = None
-
-        for i, char in enumerate(input_string):
-            char_class = get_char_class(char)
-            
-            if char in self.transitions.get(current_state, {}):
-                current_state = self.transitions[current_state][char]
-            elif char_class in self.transitions.get(current_state, {}):
-                current_state = self.transitions[current_state][char_class]
+        last_accepted_state = None
+        last_accepted_end = start
+
+        i = start
+        length = len(source)
+        while i < length:
+            char = source[i]
+            state_transitions = transitions.get(current_state, {})
+
+            if char in state_transitions:
+                current_state = state_transitions[char]
             else:
-                break
+                char_class = get_char_class(char)
+                if char_class in state_transitions:
+                    current_state = state_transitions[char_class]
+                else:
+                    break
 
+            i += 1
             if current_state in self.accepting_states:
-                last_accepted_info = {
-                    "state": current_state,
-                    "position": i + 1
-                }
+                last_accepted_state = current_state
+                last_accepted_end = i
+
+        token_type = self.accepting_states.get(last_accepted_state)
+        return last_accepted_end, token_type, current_state, i
+
+def resolve_transition(state_transitions, char):
+    """Aplica a regra de transição do AFD: caractere literal antes da classe"""
+    if char in state_transitions:
+        return state_transitions[char]
+    return state_transitions.get(get_char_class(char))
+
+class CompiledDFA:
+    """
+    Versão compilada do AFD da linguagem Coffee.
+
+    As tabelas em dicionário (DFA_TRANSITIONS / DFA_ACCEPTING_STATES)
+    continuam sendo a fonte da verdade; na construção elas são convertidas
+    em estados inteiros densos, um vetor de 128 posições que mapeia cada
+    caractere ASCII para sua classe e uma tabela de transições achatada.
+    Assim o laço interno de `run` faz apenas indexação de listas.
+    """
+    DEAD_STATE = -1
+    # Versão do formato lido por `from_tables`
+    TABLE_FORMAT = 1
+
+    def __init__(self, transitions, accepting_states, start_state='S0'):
+        self.transitions = transitions
+        self.accepting_states = accepting_states
+
+        # Estados em ordem de aparição, com o inicial recebendo o id 0
+        state_names = [start_state]
+        for state, state_transitions in transitions.items():
+            for name in (state, *state_transitions.values()):
+                if name not in state_names:
+                    state_names.append(name)
+        for name in accepting_states:
+            if name not in state_names:
+                state_names.append(name)
+        self.state_names = state_names
+        self.state_ids = {name: i for i, name in enumerate(state_names)}
+
+        # Caracteres que se comportam igual em todos os estados formam uma classe
+        columns = {}
+        self.ascii_classes = [
+            self._column_id(columns, chr(code)) for code in range(128)
+        ]
+        # Fora do ASCII: caracteres citados literalmente na tabela e as
+        # classes nomeadas que get_char_class pode devolver para eles
+        self.literal_classes = {
+            char: self._column_id(columns, char)
+            for state_transitions in transitions.values()
+            for char in state_transitions
+            if len(char) == 1 and ord(char) >= 128
+        }
+        self.named_classes = {
+            name: self._named_column_id(columns, name)
+            for name in ('letra', 'digito', 'outro')
+        }
+
+        # Uma linha por estado, indexada pelo id da classe do caractere
+        self.num_classes = len(columns)
+        self.table = [[self.DEAD_STATE] * self.num_classes for _ in state_names]
+        for column, class_id in columns.items():
+            for state_id, next_state in enumerate(column):
+                if next_state is not None:
+                    self.table[state_id][class_id] = self.state_ids[next_state]
+
+        self.accepting = [accepting_states.get(name) for name in state_names]
+        self.unclosed_string_state = self.state_ids.get('S8_STR', self.DEAD_STATE)
+
+    @classmethod
+    def from_tables(cls, tables):
+        """
+        Cria o AFD a partir de um módulo de tabelas pré-compiladas
+        (tools/gerador_tabelas.py), sem nenhuma etapa de construção: as
+        tuplas e bytes do módulo são usados diretamente pelo laço de `scan`.
+        """
+        if tables.TABLE_FORMAT != cls.TABLE_FORMAT:
+            raise ValueError(f"Tabelas léxicas no formato {tables.TABLE_FORMAT}, esperado "
+                             f"{cls.TABLE_FORMAT}; regenere com tools/gerador_tabelas.py")
+        dfa = cls.__new__(cls)
+        dfa.transitions = None
+        dfa.state_names = tuple(f'S{i}' for i in range(len(tables.TABLE)))
+        dfa.state_ids = {name: i for i, name in enumerate(dfa.state_names)}
+        # O módulo guarda os nomes dos tipos de token; a ordem do enum pode mudar
+        dfa.accepting = tuple(None if name is None else TokenType[name] for name in tables.ACCEPTING)
+        dfa.accepting_states = {name: token_type
+                                for name, token_type in zip(dfa.state_names, dfa.accepting)
+                                if token_type is not None}
+        dfa.ascii_classes = tables.ASCII_CLASSES
+        dfa.literal_classes = {}
+        dfa.named_classes = tables.NAMED_CLASSES
+        dfa.num_classes = len(tables.SYMBOLS)
+        dfa.table = tables.TABLE
+        dfa.unclosed_string_state = tables.UNCLOSED_STRING_STATE
+        dfa.tables_hash = tables.TABLES_HASH
+        return dfa
+
+    def _column_id(self, columns, char):
+        column = tuple(
+            resolve_transition(self.transitions.get(state, {}), char)
+            for state in self.state_names
+        )
+        return columns.setdefault(column, len(columns))
+
+    def _named_column_id(self, columns, class_name):
+        column = tuple(
+            self.transitions.get(state, {}).get(class_name)
+            for state in self.state_names
+        )
+        return columns.setdefault(column, len(columns))
+
+    def char_class(self, char):
+        """Retorna o id da classe de um caractere fora da faixa ASCII"""
+        class_id = self.literal_classes.get(char)
+        if class_id is None:
+            class_id = self.named_classes[get_char_class(char)]
+        return class_id
 
-        if last_accepted_info is None:
-            if current_state == 'S8_STR':
+    def run(self, source, start=0):
+        """
+        Mesmo contrato de `DFA.run`: retorna a posição final do lexema mais
+        longo iniciado em `start` e seu tipo de token.
+        """
+        end, token_type, state, _ = self.scan(source, start)
+        if token_type is None:
+            if state == self.unclosed_string_state:
                 raise ValueError("String não fechada")
-            raise ValueError(f"Token inválido começando com '{input_string[0]}'")
+            raise ValueError(f"Token inválido começando com '{source[start]}'")
+        return end, token_type
+
+    def scan(self, source, start=0):
+        """Mesmo contrato de `DFA.scan`, com o estado final como id inteiro"""
+        table = self.table
+        ascii_classes = self.ascii_classes
+        accepting = self.accepting
+
+        state = 0
+        row = table[0]
+        last_accepted_type = None
+        last_accepted_end = start
+
+        i = start
+        length = len(source)
+        while i < length:
+            code = ord(source[i])
+            if code < 128:
+                next_state = row[ascii_classes[code]]
+            else:
+                next_state = row[self.char_class(source[i])]
+            if next_state < 0:
+                break
+            state = next_state
+            row = table[state]
 
-        lexeme = input_string[:last_accepted_info["position"]]
-        token_type = self.accepting_states[last_accepted_info["state"]]
-        return lexeme, token_type
+            i += 1
+            token_type = accepting[state]
+            if token_type is not None:
+                last_accepted_type = token_type
+                last_accepted_end = i
+
+        return last_accepted_end, last_accepted_type, state, i
 
 class Lexer:
-    def __init__(self, source_code, dfa):
+    def __init__(self, source_code, dfa, source_map=None):
         self.source = source_code
         self.dfa = dfa
         self.position = 0
-        self.line = 1
-        self.col = 1
+        # Início de cada linha, calculado uma vez: os tokens guardam só o offset
+        self.source_map = source_map or SourceMap(source_code)
+
+    def lexical_error(self, error, offset):
+        """Acrescenta a posição de `offset` à mensagem de erro do AFD"""
+        line, col = self.source_map.line_col(offset)
+        return ValueError(f"{error} na linha {line}, coluna {col}")
+
+    def match(self, start):
+        """Reconhece o lexema iniciado em `start`; retorna (fim, tipo_do_token)"""
+        return self.dfa.run(self.source, start)
 
     def next_token(self):
-        while self.position < len(self.source):
-            remaining_code = self.source[self.position:]
-            
-            start_line = self.line
-            start_col = self.col
+        source = self.source
+        while self.position < len(source):
+            start = self.position
 
             try:
-                lexeme, token_type = self.dfa.run(remaining_code)
+                end, token_type = self.match(start)
             except ValueError as e:
-                raise ValueError(f"{e} na linha {start_line}, coluna {start_col}")
+                raise self.lexical_error(e, start)
 
-            self.position += len(lexeme)
-            lines_in_lexeme = lexeme.count('\n')
-            if lines_in_lexeme > 0:
-                self.line += lines_in_lexeme
-                self.col = len(lexeme) - lexeme.rfind('\n')
-            else:
-                self.col += len(lexeme)
+            self.position = end
 
-            if token_type in ['WHITESPACE', 'COMMENT', 'NEWLINE']:
+            if token_type in TRIVIA_TOKENS:
                 continue
 
-            if token_type == 'IDENTIFIER' and lexeme in KEYWORDS:
-                token_type = lexeme.upper()
+            lexeme = source[start:end]
+            if token_type == TokenType.IDENTIFIER:
+                lexeme = sys.intern(lexeme)
            
-            return Token(token_type, lexeme, start_line, start_col)
+            return Token(token_type, lexeme, start, self.source_map)
+
+        return Token(TokenType.EOF, None, self.position, self.source_map)
+
+
+class StreamLexer(Lexer):
+    """
+    Lexer que lê o código de qualquer stream de texto em blocos de
+    `chunk_size` caracteres, em vez de carregar o arquivo inteiro.
+
+    O buffer guarda apenas o texto ainda não consumido mais o bloco
+    atual. Quando o AFD chega ao fim do buffer ainda ativo (uma STRING
+    ou um COMMENT que atravessa a fronteira entre blocos), o próximo
+    bloco é lido e o token é reconhecido de novo; a leitura dobra de
+    tamanho enquanto o mesmo token não termina, mantendo o custo linear.
+    Os offsets dos tokens são relativos ao stream inteiro (`base` é o
+    offset do início do buffer). O SourceMap recebe cada bloco lido, sem
+    guardar o texto, e descarta as linhas anteriores ao buffer, de modo
+    que também ele fica limitado ao tamanho do buffer; por isso os tokens
+    são PositionedToken, com a posição calculada na criação.
+    """
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, stream, dfa, chunk_size=DEFAULT_CHUNK_SIZE):
+        super().__init__('', dfa)
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.exhausted = False
+        self.base = 0
+        self.source_map = SourceMap(keep_text=False)
+
+    def _read_chunk(self, size):
+        """Descarta o texto já consumido e anexa o próximo bloco ao buffer"""
+        if self.exhausted:
+            return False
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.exhausted = True
+            return False
+        self.source_map.extend(chunk)
+        self.base += self.position
+        self.source_map.discard_before(self.base)
+        self.source = self.source[self.position:] + chunk
+        self.position = 0
+        return True
 
-        return Token('EOF', None, self.line, self.col)
+    def next_token(self):
+        while True:
+            if self.position >= len(self.source) and not self._read_chunk(self.chunk_size):
+                return PositionedToken(TokenType.EOF, None, self.base + self.position, self.source_map)
+
+            read_size = self.chunk_size
+            while True:
+                end, token_type, _, scan_end = self.dfa.scan(self.source, self.position)
+                if scan_end < len(self.source) or not self._read_chunk(read_size):
+                    break
+                read_size *= 2
+
+            source = self.source
+            start = self.position
+            if token_type is None:
+                try:
+                    self.dfa.run(source, start)
+                except ValueError as e:
+                    raise self.lexical_error(e, self.base + start)
+
+            self.position = end
+
+            if token_type in TRIVIA_TOKENS:
+                continue
+
+            lexeme = source[start:end]
+            if token_type == TokenType.IDENTIFIER:
+                lexeme = sys.intern(lexeme)
+
+            return PositionedToken(token_type, lexeme, self.base + start, self.source_map)
+
+
+# Leitura de um Token pelo Parser quando ele consome um Lexer
+_token_type = attrgetter('type')
+_token_value = attrgetter('value')
+_token_position = attrgetter('position')
+
+def _same_token(token):
+    return token
 
 
 class Parser:
-    def __init__(self, lexer):
+    # Mapeia os tipos de token relacionais para símbolos legíveis
+    RELATIONAL_OPERATORS = {
+        TokenType.GT: '>', TokenType.GE: '>=', TokenType.LT: '<',
+        TokenType.LE: '<=', TokenType.EQEQ: '==', TokenType.NE: '!='
+    }
+
+    def __init__(self, lexer, recover=False):
+        # Um TokenBuffer (token_buffer.tokenize_all) é lido por índice: o
+        # parser consulta as colunas de tipo e valor e só cria um Token para
+        # as mensagens de erro. self.lexer continua sendo um cursor com a
+        # interface next_token(), usada pelos parsers de tabela (LL(1)/LR)
+        if hasattr(lexer, 'cursor'):
+            self.buffer = lexer
+            lexer = lexer.cursor()
+            self._next = lexer.next_index
+            self._type_of = self.buffer.types.__getitem__
+            self._token = self.buffer.__getitem__
+            self.token_value = self.buffer.value
+            self.token_position = self.buffer.position
+        else:
+            self.buffer = None
+            self._next = lexer.next_token
+            self._type_of = _token_type
+            self._token = _same_token
+            self.token_value = _token_value
+            self.token_position = _token_position
         self.lexer = lexer
-        self.current_token = self.lexer.next_token()
+        # Com recover=True os erros são acumulados em self.errors e parse()
+        # devolve a AST parcial em vez de parar no primeiro erro
+        self.recover = recover
+        self.errors = []
+        try:
+            self._current = self._next()
+        except ValueError as e:
+            if not recover:
+                raise
+            self.errors.append(e)
+            self._current = Token(TokenType.EOF, None, 0, SourceMap())
+        self.current_type = self._type_of(self._current)
+
+    @property
+    def current_token(self):
+        """Token atual; sobre um TokenBuffer ele é criado só quando pedido"""
+        return self._token(self._current)
+
+    @current_token.setter
+    def current_token(self, token):
+        # Os parsers de tabela avançam com Tokens obtidos de self.lexer
+        self._current = token if self.buffer is None else self.buffer.index_at(token.offset)
+        self.current_type = token.type
 
     def error(self, expected_type):
         tok = self.current_token
+        if isinstance(expected_type, TokenType):
+            expected_type = expected_type.name
         raise SyntaxError(
-            f"Erro de Sintaxe: Esperava '{expected_type}', mas encontrou '{tok.value}' ({tok.type}) "
+            f"Erro de Sintaxe: Esperava '{expected_type}', mas encontrou '{tok.value}' ({tok.type.name}) "
             f"na linha {tok.line}, coluna {tok.col}"
         )
 
+    def advance(self):
+        """Avança para o próximo token e retorna o consumido"""
+        token = self._current
+        self._current = self._next()
+        self.current_type = self._type_of(self._current)
+        return token
+
     def eat(self, expected_type):
         """
         Consome o token atual se ele for do tipo esperado.
-        Se for, avança para o próximo token e retorna o token consumido.
+        Se for, avança para o próximo token e retorna o token consumido
+        (um Token, ou seu índice quando o parser lê um TokenBuffer), cujo
+        valor e posição são lidos por token_value() e token_position().
         Se não for, lança um erro.
         """
-        if self.current_token.type == expected_type:
-            token = self.current_token
-            self.current_token = self.lexer.next_token()
-            return token
+        if self.current_type == expected_type:
+            return self.advance()
         else:
             self.error(expected_type)
 
     def parse(self):
         """Ponto de entrada principal do parser. Retorna a AST."""
         ast = self.program()
-        if self.current_token.type != 'EOF':
-            tok = self.current_token
-            raise SyntaxError(
-                f"Erro de Sintaxe: Código inesperado no final do programa. "
-                f"Token '{tok.value}' ({tok.type}) na linha {tok.line}, coluna {tok.col}"
-            )
+        if self.current_type != TokenType.EOF and not self.errors:
+            self.trailing_error()
         return ast
 
+    def trailing_error(self):
+        tok = self.current_token
+        raise SyntaxError(
+            f"Erro de Sintaxe: Código inesperado no final do programa. "
+            f"Token '{tok.value}' ({tok.type.name}) na linha {tok.line}, coluna {tok.col}"
+        )
+
     def program(self):
         """<Program> ::= <StatementList>"""
         statements = self.statement_list()
-        return ProgramNode(statements)
+        return ProgramNode(statements, 1, 1)
 
     def statement_list(self):
         """<StatementList> ::= { <Statement> }"""
+        if self.recover:
+            return self.recovering_statement_list()
         statements = []
-        while self.current_token.type != 'EOF':
+        while self.current_type != TokenType.EOF:
             stmt = self.statement()
             statements.append(stmt)
         return statements
 
+    def recovering_statement_list(self):
+        """
+        <StatementList> em modo pânico: cada erro de sintaxe vai para
+        self.errors e os tokens são descartados até o início do próximo
+        comando ('display' ou identificador seguido de '='). Um erro
+        léxico encerra a análise, pois o lexer não avança além dele.
+        """
+        statements = []
+        resume = None
+        synchronizing = False
+        while self.current_type != TokenType.EOF:
+            try:
+                if synchronizing:
+                    synchronizing = False
+                    resume = self.synchronize()
+                elif resume is not None:
+                    identifier_token, resume = resume, None
+                    statements.append(self.assignment_tail(identifier_token))
+                else:
+                    statements.append(self.statement())
+            except SyntaxError as e:
+                self.errors.append(e)
+                synchronizing = True
+            except ValueError as e:
+                self.errors.append(e)
+                break
+        return statements
+
+    def synchronize(self):
+        """
+        Descarta tokens até 'display', EOF ou um identificador seguido de
+        '='. No último caso o identificador já foi consumido (para olhar o
+        token seguinte) e é devolvido para a atribuição continuar dele.
+        """
+        while True:
+            token_type = self.current_type
+            if token_type == TokenType.EOF or token_type == TokenType.DISPLAY:
+                return None
+            if token_type == TokenType.IDENTIFIER:
+                identifier_token = self.advance()
+                if self.current_type == TokenType.ASSIGN:
+                    return identifier_token
+                continue
+            self.advance()
+
     def statement(self):
         """<Statement> ::= <DisplayStatement> | <AssignmentStatement>"""
-        if self.current_token.type == 'DISPLAY':
+        if self.current_type == TokenType.DISPLAY:
             return self.display_statement()
-        elif self.current_token.type == 'IDENTIFIER':
+        elif self.current_type == TokenType.IDENTIFIER:
             return self.assignment_statement()
         else:
-            tok = self.current_token
-            raise SyntaxError(
-                f"Erro de Sintaxe: Comando inválido. Esperava 'display' ou um nome de variável, "
-                f"mas encontrou '{tok.value}' ({tok.type}) na linha {tok.line}, coluna {tok.col}"
-            )
+            self.statement_error()
+
+    def statement_error(self):
+        tok = self.current_token
+        raise SyntaxError(
+            f"Erro de Sintaxe: Comando inválido. Esperava 'display' ou um nome de variável, "
+            f"mas encontrou '{tok.value}' ({tok.type.name}) na linha {tok.line}, coluna {tok.col}"
+        )
 
     def display_statement(self):
         """<DisplayStatement> ::= "display" identifier"""
-        self.eat('DISPLAY')
-        identifier_token = self.eat('IDENTIFIER')
-        return DisplayStatementNode(identifier_token.value)
+        display_token = self.eat(TokenType.DISPLAY)
+        identifier_token = self.eat(TokenType.IDENTIFIER)
+        return DisplayStatementNode(self.token_value(identifier_token), *self.token_position(display_token))
 
     def assignment_statement(self):
         """<AssignmentStatement> ::= identifier "=" <AssignmentRHS>"""
-        identifier_token = self.eat('IDENTIFIER')
-        self.eat('ASSIGN')
+        identifier_token = self.eat(TokenType.IDENTIFIER)
+        return self.assignment_tail(identifier_token)
+
+    def assignment_tail(self, identifier_token):
+        """Restante da atribuição, depois do identificador: "=" <AssignmentRHS>"""
+        self.eat(TokenType.ASSIGN)
         expression = self.assignment_rhs()
-        return AssignmentStatementNode(identifier_token.value, expression)
+        return AssignmentStatementNode(self.token_value(identifier_token), expression, *self.token_position(identifier_token))
 
     def assignment_rhs(self):
         """
@@ -328,48 +896,48 @@ class Parser:
                           | <FilterRHS> 
                           | <SelectRHS>
         """
-        if self.current_token.type == 'LOAD':
+        if self.current_type == TokenType.LOAD:
             return self.load_invocation()
-        elif self.current_token.type == 'FILTER':
+        elif self.current_type == TokenType.FILTER:
             return self.filter_rhs()
-        elif self.current_token.type == 'SELECT':
+        elif self.current_type == TokenType.SELECT:
             return self.select_rhs()
         else:
             self.error("'load', 'filter' ou 'select' após o '='")
 
     def load_invocation(self):
         """<LoadInvocation> ::= "load" string_literal"""
-        self.eat('LOAD')
-        string_token = self.eat('STRING')
-        return LoadExpressionNode(string_token.value)
+        load_token = self.eat(TokenType.LOAD)
+        string_token = self.eat(TokenType.STRING)
+        return LoadExpressionNode(self.token_value(string_token), *self.token_position(load_token))
 
     def filter_rhs(self):
         """<FilterRHS> ::= "filter" identifier "where" <LogicalExpression>"""
-        self.eat('FILTER')
-        dataset_token = self.eat('IDENTIFIER')
-        self.eat('WHERE')
+        filter_token = self.eat(TokenType.FILTER)
+        dataset_token = self.eat(TokenType.IDENTIFIER)
+        self.eat(TokenType.WHERE)
         condition = self.logical_expression()
-        return FilterExpressionNode(dataset_token.value, condition)
+        return FilterExpressionNode(self.token_value(dataset_token), condition, *self.token_position(filter_token))
 
     def select_rhs(self):
         """<SelectRHS> ::= "select" identifier "(" <ColumnList> ")" """
-        self.eat('SELECT')
-        dataset_token = self.eat('IDENTIFIER')
-        self.eat('LPAREN')
+        select_token = self.eat(TokenType.SELECT)
+        dataset_token = self.eat(TokenType.IDENTIFIER)
+        self.eat(TokenType.LPAREN)
         columns = self.column_list()
-        self.eat('RPAREN')
-        return SelectExpressionNode(dataset_token.value, columns)
+        self.eat(TokenType.RPAREN)
+        return SelectExpressionNode(self.token_value(dataset_token), columns, *self.token_position(select_token))
 
     def column_list(self):
         """<ColumnList> ::= identifier { "," identifier }"""
         columns = []
-        first_column = self.eat('IDENTIFIER')
-        columns.append(first_column.value)
+        first_column = self.eat(TokenType.IDENTIFIER)
+        columns.append(self.token_value(first_column))
         
-        while self.current_token.type == 'COMMA':
-            self.eat('COMMA')
-            column_token = self.eat('IDENTIFIER')
-            columns.append(column_token.value)
+        while self.current_type == TokenType.COMMA:
+            self.eat(TokenType.COMMA)
+            column_token = self.eat(TokenType.IDENTIFIER)
+            columns.append(self.token_value(column_token))
         
         return columns
 
@@ -382,32 +950,27 @@ class Parser:
         left = self.term()
         operator = self.relational_op()
         right = self.term()
-        return RelationalExpressionNode(left, operator, right)
+        return RelationalExpressionNode(left, operator, right, left.line, left.col)
 
     def relational_op(self):
         """<RelationalOp> ::= ">" | "<" | "==" | "!=" | ">=" | "<=" """
-        if self.current_token.type in ('GT', 'GE', 'LT', 'LE', 'EQEQ', 'NE'):
-            op_token = self.eat(self.current_token.type)
-            # Mapeia os tipos de token para símbolos legíveis
-            op_map = {
-                'GT': '>', 'GE': '>=', 'LT': '<', 
-                'LE': '<=', 'EQEQ': '==', 'NE': '!='
-            }
-            return op_map[op_token.type]
-        else:
+        operator = self.RELATIONAL_OPERATORS.get(self.current_type)
+        if operator is None:
             self.error("Operador Relacional (como '>', '==', etc.)")
+        self.advance()
+        return operator
 
     def term(self):
         """<Term> ::= identifier | number_literal | string_literal"""
-        if self.current_token.type == 'IDENTIFIER':
-            token = self.eat('IDENTIFIER')
-            return TermNode(token.value, 'IDENTIFIER')
-        elif self.current_token.type == 'NUMBER':
-            token = self.eat('NUMBER')
-            return TermNode(token.value, 'NUMBER')
-        elif self.current_token.type == 'STRING':
-            token = self.eat('STRING')
-            return TermNode(token.value, 'STRING')
+        if self.current_type == TokenType.IDENTIFIER:
+            token = self.eat(TokenType.IDENTIFIER)
+            return TermNode(self.token_value(token), 'IDENTIFIER', *self.token_position(token))
+        elif self.current_type == TokenType.NUMBER:
+            token = self.eat(TokenType.NUMBER)
+            return TermNode(self.token_value(token), 'NUMBER', *self.token_position(token))
+        elif self.current_type == TokenType.STRING:
+            token = self.eat(TokenType.STRING)
+            return TermNode(self.token_value(token), 'STRING', *self.token_position(token))
         else:
             self.error("identificador, número ou string")
 
@@ -459,14 +1022,19 @@ def print_ast(node, indent=0):
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Uso: python parser.py <caminho_para_o_arquivo.coffee>")
-        sys.exit(1)
-
-    file_path = sys.argv[1]
+    arg_parser = argparse.ArgumentParser(
+        prog='parser.py',
+        description='Constrói e imprime a AST de um programa Coffee')
+    arg_parser.add_argument('arquivo', help='caminho para o arquivo .coffee')
+    arg_parser.add_argument('--fast-lexer', action='store_true',
+                            help='usa o FastLexer (regex) na análise léxica')
+    arg_parser.add_argument('--todos-erros', action='store_true',
+                            help='continua após erros de sintaxe e lista todos eles')
+    args = arg_parser.parse_args()
+
+    file_path = args.arquivo
     try:
-        with open(file_path, 'r') as f:
-            code = f.read()
+        source_file = open(file_path, 'r', encoding='utf-8')
     except FileNotFoundError:
         print(f"Erro: O arquivo '{file_path}' não foi encontrado.")
         sys.exit(1)
@@ -474,10 +1042,22 @@ if __name__ == '__main__':
     print(f"Analisando o arquivo: {file_path}\n")
 
     try:
-        coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
-        lexer = Lexer(code, coffee_dfa)
-        parser = Parser(lexer)
-        ast = parser.parse()
+        from fast_lexer import create_lexer
+        # O lexer lê o arquivo em blocos, sem carregá-lo inteiro na memória
+        with source_file:
+            lexer = create_lexer(source_file, fast=args.fast_lexer)
+            parser = Parser(lexer, recover=args.todos_erros)
+            ast = parser.parse()
+
+        if parser.errors:
+            print("="*30)
+            print(f"FALHA NA COMPILAÇÃO: {len(parser.errors)} erro(s)")
+            for error in parser.errors:
+                print(f"- {error}")
+            print("="*30)
+            print("\nAST parcial:")
+            print_ast(ast)
+            sys.exit(1)
         
         print("="*50)
         print("SUCESSO: Análise sintática concluída!")
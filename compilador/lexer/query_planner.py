@@ -0,0 +1,147 @@
+"""
+PLANEJADOR DE CONSULTAS
+=======================
+
+Análises de fluxo de dados sobre a AST que permitem ao interpretador ler
+menos do que o arquivo inteiro.
+
+Projeção (`required_columns`): percorrendo o programa de trás para a
+frente, cada variável acumula as colunas que os seus consumidores usam:
+
+    display v                       todas as colunas de v
+    t = filter v where c op x       as colunas usadas de t, mais c
+    t = select v (c1, c2)           c1 e c2
+
+O conjunto de um `load` é o que o leitor de CSV precisa carregar
+(`usecols`). Comandos que nunca chegam a um display também contam, pois
+no modo imediato eles são executados e precisam das suas colunas.
+
+Fusão de filtros: uma sequência de filters em que cada intermediário só
+alimenta o seguinte pode ser avaliada como uma única conjunção sobre o
+dataset base. No plano lógico (`filter_chain`) a cadeia é descoberta na
+execução; no modo imediato (`fusible_filters`), na AST: o filter é
+adiado e aplicado junto com o comando seguinte.
+"""
+
+import os
+import sys
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(__file__))
+from parser import (ProgramNode, DisplayStatementNode, AssignmentStatementNode,
+                    LoadExpressionNode, FilterExpressionNode, SelectExpressionNode)
+from logical_plan import PlanNode, Filter
+
+# Marcador de "todas as colunas"
+ALL_COLUMNS = None
+
+
+def _merge(current, required):
+    """União de dois requisitos de colunas (ALL_COLUMNS absorve qualquer conjunto)"""
+    if current is ALL_COLUMNS or required is ALL_COLUMNS:
+        return ALL_COLUMNS
+    return current | required
+
+
+def required_columns(ast: ProgramNode) -> Dict[LoadExpressionNode, FrozenSet[str]]:
+    """
+    Colunas que cada `load` precisa ler, para os loads em que não são
+    todas. Loads sem nenhum consumidor ficam de fora (são lidos inteiros).
+    """
+    needs: Dict[str, Optional[frozenset]] = {}
+    result = {}
+    for statement in reversed(ast.statements):
+        if isinstance(statement, DisplayStatementNode):
+            needs[statement.identifier] = ALL_COLUMNS
+            continue
+
+        expression = statement.expression
+        used = needs.get(statement.identifier, frozenset())
+        if isinstance(expression, LoadExpressionNode):
+            if used:
+                result[expression] = used
+            continue
+
+        if isinstance(expression, FilterExpressionNode):
+            condition = expression.condition
+            required = used
+            if required is not ALL_COLUMNS and condition.left.type == 'IDENTIFIER':
+                required = required | {condition.left.value}
+            if condition.right.type == 'IDENTIFIER':
+                # O valor da comparação é lido do ambiente: a variável inteira
+                needs[condition.right.value] = ALL_COLUMNS
+        elif isinstance(expression, SelectExpressionNode):
+            required = frozenset(expression.columns)
+        else:
+            continue
+        needs[expression.dataset] = _merge(needs.get(expression.dataset, frozenset()), required)
+    return result
+
+
+def filter_chain(plan: Filter, is_private: Callable[[PlanNode], bool]) -> Tuple[PlanNode, List[Filter]]:
+    """
+    Filters que podem ser fundidos com `plan`: desce enquanto o filho é um
+    Filter para o qual `is_private` é verdadeiro (não calculado e sem outro
+    consumidor). Retorna (nó base, filters do mais interno até `plan`).
+    """
+    chain = [plan]
+    node = plan.child
+    while isinstance(node, Filter) and is_private(node):
+        chain.append(node)
+        node = node.child
+    chain.reverse()
+    return node, chain
+
+
+def _reads(statement) -> FrozenSet[str]:
+    """Variáveis lidas por um comando"""
+    if isinstance(statement, DisplayStatementNode):
+        return frozenset((statement.identifier,))
+    expression = statement.expression
+    if isinstance(expression, FilterExpressionNode):
+        if expression.condition.right.type == 'IDENTIFIER':
+            return frozenset((expression.dataset, expression.condition.right.value))
+        return frozenset((expression.dataset,))
+    if isinstance(expression, SelectExpressionNode):
+        return frozenset((expression.dataset,))
+    return frozenset()
+
+
+def _continues_chain(statement, name: str) -> bool:
+    """
+    Se `statement` é um filter sobre `name` que compara uma coluna com um
+    literal: antes de aplicar os filters adiados ele não pode falhar, então
+    os erros acontecem na mesma ordem que sem a fusão
+    """
+    if not isinstance(statement, AssignmentStatementNode) or \
+            not isinstance(statement.expression, FilterExpressionNode):
+        return False
+    condition = statement.expression.condition
+    return (statement.expression.dataset == name and condition.left.type == 'IDENTIFIER'
+            and condition.right.type != 'IDENTIFIER')
+
+
+def fusible_filters(ast: ProgramNode) -> FrozenSet[FilterExpressionNode]:
+    """
+    Filters que o modo imediato pode adiar para o comando seguinte: o
+    resultado só é lido por esse comando, um filter que o continua
+    (`_continues_chain`). Percorre o programa de trás para a frente com as
+    variáveis lidas adiante antes de serem reatribuídas.
+    """
+    statements = ast.statements
+    fusible = set()
+    # Variáveis vivas depois do comando atual e depois do seguinte
+    live, live_after_next = frozenset(), frozenset()
+    for index in range(len(statements) - 1, -1, -1):
+        statement = statements[index]
+        if isinstance(statement, DisplayStatementNode):
+            live_after_next, live = live, live | _reads(statement)
+            continue
+        following = statements[index + 1] if index + 1 < len(statements) else None
+        if isinstance(statement.expression, FilterExpressionNode) and \
+                _continues_chain(following, statement.identifier) and \
+                (statement.identifier not in live_after_next or following.identifier == statement.identifier):
+            # Reatribuída pelo seguinte, a variável não é mais lida depois dele
+            fusible.add(statement.expression)
+        live_after_next, live = live, (live - {statement.identifier}) | _reads(statement)
+    return frozenset(fusible)
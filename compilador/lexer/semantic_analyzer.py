@@ -1,11 +1,13 @@
 import sys
 import os
+import argparse
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
 
 # Importa as classes AST do parser
 sys.path.append(os.path.dirname(__file__))
 from parser import *
+from fast_lexer import create_lexer
 
 class DataType(Enum):
     """Enumeração dos tipos de dados na linguagem Coffee"""
@@ -19,15 +21,22 @@ class DataType(Enum):
 
 class SemanticError:
     """Classe para representar erros semânticos"""
-    def __init__(self, message: str, node_type: str = "", context: str = ""):
+    def __init__(self, message: str, node_type: str = "", context: str = "",
+                 line: Optional[int] = None, col: Optional[int] = None):
         self.message = message
         self.node_type = node_type
         self.context = context
+        # Posição do nó que causou o erro (mesmo formato dos erros de sintaxe)
+        self.line = line
+        self.col = col
     
     def __str__(self):
+        text = f"[{self.node_type}] {self.message}"
         if self.context:
-            return f"[{self.node_type}] {self.message} (Contexto: {self.context})"
-        return f"[{self.node_type}] {self.message}"
+            text += f" (Contexto: {self.context})"
+        if self.line is not None:
+            text += f" na linha {self.line}, coluna {self.col}"
+        return text
 
 class Symbol:
     """Representa um símbolo na tabela de símbolos"""
@@ -75,7 +84,7 @@ class SymbolTable:
         """Retorna todos os símbolos"""
         return self.symbols.copy()
 
-class SemanticAnalyzer:
+class SemanticAnalyzer(NodeVisitor):
     """
     Analisador Semântico Principal
     
@@ -128,16 +137,10 @@ class SemanticAnalyzer:
         
         return success, self.errors, info
     
-    def visit(self, node: ASTNode) -> DataType:
-        """Padrão Visitor para percorrer a AST"""
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-    
     def generic_visit(self, node: ASTNode) -> DataType:
         """Método genérico para nós não implementados"""
         self._add_error(f"Nó não implementado: {type(node).__name__}", 
-                       type(node).__name__)
+                       type(node).__name__, node=node)
         return DataType.ERROR
     
     # ===== VISITORS PARA CADA TIPO DE NÓ =====
@@ -163,13 +166,13 @@ class SemanticAnalyzer:
         # Verifica se houve erro na expressão
         if expr_type == DataType.ERROR:
             self._add_error(f"Erro na expressão atribuída à variável '{node.identifier}'",
-                           "AssignmentStatement", node.identifier)
+                           "AssignmentStatement", node.identifier, node=node)
             return DataType.ERROR
         
         # Declara a variável na tabela de símbolos
         if not self.symbol_table.declare(node.identifier, expr_type):
             self._add_error(f"Variável '{node.identifier}' já foi declarada",
-                           "AssignmentStatement", node.identifier)
+                           "AssignmentStatement", node.identifier, node=node)
             return DataType.ERROR
         
         self.stats['variables_declared'] += 1
@@ -188,14 +191,14 @@ class SemanticAnalyzer:
         symbol = self.symbol_table.lookup(node.identifier)
         if not symbol:
             self._add_error(f"Variável '{node.identifier}' não foi declarada",
-                           "DisplayStatement", node.identifier)
+                           "DisplayStatement", node.identifier, node=node)
             return DataType.ERROR
         
         # Display só funciona com datasets
         if symbol.type != DataType.DATASET:
             self._add_error(f"Display só pode ser usado com datasets. "
                            f"'{node.identifier}' é do tipo {symbol.type.value}",
-                           "DisplayStatement", node.identifier)
+                           "DisplayStatement", node.identifier, node=node)
             return DataType.ERROR
         
         if self.debug:
@@ -211,7 +214,7 @@ class SemanticAnalyzer:
         # Valida se é uma string (arquivo)
         if not node.file_path.startswith('"') or not node.file_path.endswith('"'):
             self._add_error("Load requer um caminho de arquivo como string",
-                           "LoadExpression", node.file_path)
+                           "LoadExpression", node.file_path, node=node)
             return DataType.ERROR
         
         # Verifica extensão do arquivo (opcional, mas educativo)
@@ -237,20 +240,20 @@ class SemanticAnalyzer:
         dataset_symbol = self.symbol_table.lookup(node.dataset)
         if not dataset_symbol:
             self._add_error(f"Dataset '{node.dataset}' não foi declarado",
-                           "FilterExpression", node.dataset)
+                           "FilterExpression", node.dataset, node=node)
             return DataType.ERROR
         
         if dataset_symbol.type != DataType.DATASET:
             self._add_error(f"Filter só pode ser aplicado a datasets. "
                            f"'{node.dataset}' é do tipo {dataset_symbol.type.value}",
-                           "FilterExpression", node.dataset)
+                           "FilterExpression", node.dataset, node=node)
             return DataType.ERROR
         
         # Analisa a condição
         condition_type = self.visit(node.condition)
         if condition_type != DataType.BOOLEAN and condition_type != DataType.ERROR:
             self._add_error("Condição do filter deve resultar em um valor booleano",
-                           "FilterExpression", "condition")
+                           "FilterExpression", "condition", node=node)
             return DataType.ERROR
         
         self.stats['operations_validated'] += 1
@@ -269,19 +272,19 @@ class SemanticAnalyzer:
         dataset_symbol = self.symbol_table.lookup(node.dataset)
         if not dataset_symbol:
             self._add_error(f"Dataset '{node.dataset}' não foi declarado",
-                           "SelectExpression", node.dataset)
+                           "SelectExpression", node.dataset, node=node)
             return DataType.ERROR
         
         if dataset_symbol.type != DataType.DATASET:
             self._add_error(f"Select só pode ser aplicado a datasets. "
                            f"'{node.dataset}' é do tipo {dataset_symbol.type.value}",
-                           "SelectExpression", node.dataset)
+                           "SelectExpression", node.dataset, node=node)
             return DataType.ERROR
         
         # Valida se há pelo menos uma coluna
         if not node.columns:
             self._add_error("Select deve especificar pelo menos uma coluna",
-                           "SelectExpression", "columns")
+                           "SelectExpression", "columns", node=node)
             return DataType.ERROR
         
         # Armazena metadados sobre as colunas selecionadas
@@ -311,7 +314,7 @@ class SemanticAnalyzer:
         valid_comparisons = self._validate_comparison(left_type, right_type, node.operator)
         if not valid_comparisons:
             self._add_error(f"Comparação inválida: {left_type.value} {node.operator} {right_type.value}",
-                           "RelationalExpression", node.operator)
+                           "RelationalExpression", node.operator, node=node)
             return DataType.ERROR
         
         self.stats['operations_validated'] += 1
@@ -361,9 +364,11 @@ class SemanticAnalyzer:
         
         return False
     
-    def _add_error(self, message: str, node_type: str = "", context: str = ""):
-        """Adiciona um erro à lista"""
-        error = SemanticError(message, node_type, context)
+    def _add_error(self, message: str, node_type: str = "", context: str = "",
+                   node: Optional[ASTNode] = None):
+        """Adiciona um erro à lista, com a posição de `node` quando conhecida"""
+        error = SemanticError(message, node_type, context,
+                              getattr(node, 'line', None), getattr(node, 'col', None))
         self.errors.append(error)
         
         if self.debug:
@@ -402,17 +407,17 @@ class SemanticAnalyzer:
 
 def main():
     """Função principal para testar o analisador semântico"""
-    if len(sys.argv) != 2:
-        print("Uso: python semantic_analyzer.py <arquivo.coffee>")
-        sys.exit(1)
+    arg_parser = argparse.ArgumentParser(
+        prog='semantic_analyzer.py',
+        description='Executa as análises léxica, sintática e semântica de um programa Coffee')
+    arg_parser.add_argument('arquivo', help='caminho para o arquivo .coffee')
+    arg_parser.add_argument('--fast-lexer', action='store_true',
+                            help='usa o FastLexer (regex) na análise léxica')
+    args = arg_parser.parse_args()
     
-    file_path = sys.argv[1]
+    file_path = args.arquivo
     
     try:
-        # Lê o arquivo
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
         print(f"Analisando arquivo: {file_path}")
         print("="*50)
         
@@ -420,10 +425,11 @@ def main():
         print("ANÁLISE SINTÁTICA")
         print("-" * 30)
         
-        coffee_dfa = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
-        lexer = Lexer(code, coffee_dfa)
-        parser = Parser(lexer)
-        ast = parser.parse()
+        # O lexer lê o arquivo em blocos, sem carregá-lo inteiro na memória
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lexer = create_lexer(f, fast=args.fast_lexer)
+            parser = Parser(lexer)
+            ast = parser.parse()
         
         print("AST construída com sucesso!")
         
@@ -0,0 +1,216 @@
+"""
+ANÁLISE EM ESQUELETO (CORPOS PREGUIÇOSOS)
+=========================================
+
+Linters e extração de dependências só precisam da lista de comandos de
+nível superior: quem cada comando define, quem ele lê e o caminho dos
+`load`. `parse_skeleton` reconhece cada comando com uma única regex
+(uma alternativa por forma de comando, com os espaços e comentários
+em volta) em vez de passar token a token pelo Lexer e pelo Parser.
+
+As atribuições viram LazyAssignmentStatementNode: a expressão do lado
+direito (condições, listas de colunas) só é construída pelo Parser no
+primeiro acesso a `expression`, a partir do offset guardado. Os displays
+são construídos na hora, pois não têm subexpressões.
+
+Onde a regex não casa (erros de sintaxe, identificadores fora do ASCII,
+formas incomuns como `1abc`), aquele comando é analisado pelo Parser a
+partir do seu início. Assim os erros e a AST resultante são sempre os
+mesmos de Parser.parse().
+
+Uso:
+    program = parse_skeleton(source)
+    for statement in program.statements:
+        defines, uses, load_path = statement_dependencies(statement)
+"""
+
+import os
+import re
+import sys
+from array import array
+
+sys.path.append(os.path.dirname(__file__))
+from parser import (Parser, KEYWORDS, TokenType, SourceMap, ProgramNode, DisplayStatementNode,
+                    AssignmentStatementNode, LoadExpressionNode, FilterExpressionNode,
+                    SelectExpressionNode)
+from fast_lexer import create_lexer
+
+# Palavras, números e palavras-chave não podem continuar em outro caractere
+# de palavra (nem em um caractere não ASCII, que o Lexer pode aceitar como
+# letra): nesses casos a regex falha e o Parser decide
+_END = r'(?![\w\x80-\U0010FFFF])'
+# Um comentário vai sempre até o fim da linha: o lookahead impede que a regex
+# devolva parte dele para ser lida como código se o resto do comando não
+# casa. Um espaço por repetição, para não aninhar quantificadores
+_TRIVIA = r'(?:[ \t\r\n]|\#[^\n]*(?![^\n]))*'
+_KEYWORD = r'(?:' + '|'.join(KEYWORDS) + r')' + _END
+_ID = r'(?!' + _KEYWORD + r')[A-Za-z_][A-Za-z0-9_]*' + _END
+_TERM = r'(?:' + _ID + r'|[0-9]+(?:\.[0-9]+)?' + _END + r'|"[^"]*")'
+_T = _TRIVIA
+
+TRIVIA = re.compile(_TRIVIA)
+
+# Cada comando consome também os espaços e comentários que o seguem
+STATEMENT = re.compile(rf'''
+    (?:
+        display{_END} {_T} (?P<display>{_ID})
+      | (?P<target>{_ID}) {_T} =(?!=) {_T} (?P<rhs>
+            load{_END} {_T} (?P<path>"[^"]*")
+          | filter{_END} {_T} (?P<filtered>{_ID}) {_T} where{_END} {_T}
+                (?P<left>{_TERM}) {_T} (?:>=|<=|==|!=|>|<) {_T} (?P<right>{_TERM})
+          | select{_END} {_T} (?P<selected>{_ID}) {_T} \( {_T} {_ID} (?:{_T} , {_T} {_ID})* {_T} \)
+        )
+    )
+    {_T}
+''', re.VERBOSE)
+
+_IDENTIFIER_START = re.compile(r'[A-Za-z_]')
+
+
+class SkeletonSource:
+    """Código-fonte e SourceMap compartilhados pelos nós preguiçosos"""
+    __slots__ = ('source', 'source_map', 'fast')
+
+    def __init__(self, source, source_map, fast):
+        self.source = source
+        self.source_map = source_map
+        self.fast = fast
+
+    def parser_at(self, offset):
+        """Parser cujo próximo token começa em `offset`"""
+        lexer = create_lexer(self.source, fast=self.fast, source_map=self.source_map)
+        lexer.position = offset
+        return Parser(lexer)
+
+
+class LazyAssignmentStatementNode(AssignmentStatementNode):
+    """
+    Atribuição do modo esqueleto. `kind` ('load', 'filter' ou 'select'),
+    `uses` e `load_path` vêm da regex; a expressão é construída no
+    primeiro acesso a `expression`.
+    """
+    __slots__ = ('kind', 'uses', 'load_path', '_source', '_offset')
+
+    def __init__(self, identifier, kind, uses, load_path, source, offset, line=None, col=None):
+        self._set('identifier', identifier)
+        self._set('kind', kind)
+        self._set('uses', uses)
+        self._set('load_path', load_path)
+        self._set('_source', source)
+        self._set('_offset', offset)
+        self._set('line', line)
+        self._set('col', col)
+
+    @property
+    def expression(self):
+        try:
+            return _get_assignment_expression(self)
+        except AttributeError:
+            expression = self._source.parser_at(self._offset).assignment_rhs()
+            _set_assignment_expression(self, expression)
+            return expression
+
+    @property
+    def is_expanded(self):
+        """Se a expressão já foi construída"""
+        try:
+            _get_assignment_expression(self)
+        except AttributeError:
+            return False
+        return True
+
+# A property `expression` esconde o slot herdado: a expressão é lida e
+# gravada pelo descritor do slot
+_get_assignment_expression = AssignmentStatementNode.expression.__get__
+_set_assignment_expression = AssignmentStatementNode.expression.__set__
+
+
+class SkeletonParser:
+    """
+    Analisador em esqueleto. Depois de parse(), `starts[i]` é o offset do
+    início do comando i; o comando vai até o início do seguinte.
+    """
+
+    def __init__(self, source, fast=True):
+        self.source = source
+        self.source_map = SourceMap(source)
+        self.fast = fast
+        self.starts = array('I')
+
+    def parse(self):
+        source = self.source
+        length = len(source)
+        shared = SkeletonSource(source, self.source_map, self.fast)
+        line_col = self.source_map.line_col
+        intern = sys.intern
+        match_statement = STATEMENT.match
+        statements = []
+        append = statements.append
+        add_start = self.starts.append
+
+        position = TRIVIA.match(source).end()
+        while position < length:
+            add_start(position)
+            match = match_statement(source, position)
+            if match is None:
+                statement, position = self._parse_statement(shared, position)
+                append(statement)
+                continue
+
+            line, col = line_col(position)
+            display, target, _, path, filtered, left, right, selected = match.groups()
+            if display is not None:
+                append(DisplayStatementNode(intern(display), line, col))
+            elif path is not None:
+                append(LazyAssignmentStatementNode(intern(target), 'load', (), path, shared,
+                                                   match.start('rhs'), line, col))
+            elif filtered is not None:
+                uses = [intern(filtered)]
+                for term in (left, right):
+                    if _IDENTIFIER_START.match(term):
+                        uses.append(intern(term))
+                append(LazyAssignmentStatementNode(intern(target), 'filter', tuple(uses), None,
+                                                   shared, match.start('rhs'), line, col))
+            else:
+                append(LazyAssignmentStatementNode(intern(target), 'select', (intern(selected),),
+                                                   None, shared, match.start('rhs'), line, col))
+            position = match.end()
+
+        return ProgramNode(statements, 1, 1)
+
+    def _parse_statement(self, shared, position):
+        """Comando que a regex não reconhece: o Parser o analisa (ou lança o erro)"""
+        parser = shared.parser_at(position)
+        statement = parser.statement()
+        token = parser.current_token
+        if token.type == TokenType.EOF:
+            return statement, len(self.source)
+        return statement, token.offset
+
+
+def parse_skeleton(source, fast=True):
+    """AST com as atribuições preguiçosas; mesmos erros e mesma AST de Parser.parse()"""
+    return SkeletonParser(source, fast=fast).parse()
+
+
+def statement_dependencies(statement):
+    """
+    (nome definido ou None, nomes lidos, caminho do load ou None) de um
+    comando. Os nomes lidos incluem os identificadores da condição de um
+    filter, que podem ser colunas. Não expande nós preguiçosos.
+    """
+    if isinstance(statement, DisplayStatementNode):
+        return None, (statement.identifier,), None
+    if isinstance(statement, LazyAssignmentStatementNode):
+        return statement.identifier, statement.uses, statement.load_path
+    expression = statement.expression
+    if isinstance(expression, LoadExpressionNode):
+        return statement.identifier, (), expression.file_path
+    if isinstance(expression, FilterExpressionNode):
+        condition = expression.condition
+        uses = [expression.dataset] + [term.value for term in (condition.left, condition.right)
+                                       if term.type == 'IDENTIFIER']
+        return statement.identifier, tuple(uses), None
+    if isinstance(expression, SelectExpressionNode):
+        return statement.identifier, (expression.dataset,), None
+    raise TypeError(f"Comando desconhecido: {type(statement).__name__}")
@@ -0,0 +1,161 @@
+"""
+BUFFER COLUNAR DE TOKENS
+========================
+
+`tokenize_all` tokeniza o código-fonte inteiro de uma só vez e guarda o
+resultado em colunas paralelas baseadas em `array` (tipo, início e
+tamanho), em vez de uma lista de objetos Token. Linha e coluna não são
+guardadas por token: vêm do SourceMap do código-fonte, a partir do
+início. Os Tokens só são materializados sob demanda, pela visão
+`buffer[i]`: o Parser lê o buffer por índice (`types[i]`, `value(i)` e
+`position(i)`) e só cria um Token para as mensagens de erro.
+"""
+
+import sys
+import os
+from array import array
+from bisect import bisect_left
+
+sys.path.append(os.path.dirname(__file__))
+from parser import TRIVIA_TOKENS, Token, TokenType, SourceMap
+from fast_lexer import create_lexer
+
+# Nomes dos tipos de token: o id guardado no buffer é o próprio TokenType
+TOKEN_TYPES = tuple(token_type.name for token_type in TokenType)
+TOKEN_TYPE_IDS = {token_type.name: int(token_type) for token_type in TokenType}
+
+EOF_ID = int(TokenType.EOF)
+IDENTIFIER_ID = int(TokenType.IDENTIFIER)
+
+# Membros do enum indexados pelo id, para materializar Tokens sem TokenType(id)
+_TOKEN_TYPE_MEMBERS = tuple(TokenType)
+
+
+class TokenBuffer:
+    """Sequência de tokens armazenada em colunas compactas"""
+
+    def __init__(self, source, source_map=None):
+        self.source = source
+        self.source_map = source_map or SourceMap(source)
+        self.types = array('B')
+        self.starts = array('I')
+        self.lengths = array('I')
+
+    def append(self, type_id, start, length):
+        self.types.append(type_id)
+        self.starts.append(start)
+        self.lengths.append(length)
+
+    @property
+    def lines(self):
+        """Linha de cada token, calculada pelo SourceMap"""
+        line_col = self.source_map.line_col
+        return array('I', [line_col(start)[0] for start in self.starts])
+
+    @property
+    def cols(self):
+        """Coluna de cada token, calculada pelo SourceMap"""
+        line_col = self.source_map.line_col
+        return array('I', [line_col(start)[1] for start in self.starts])
+
+    def __len__(self):
+        return len(self.types)
+
+    def type_name(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def value(self, index):
+        """Lexema do token; identificadores saem internados, como no Lexer"""
+        token_type = self.types[index]
+        if token_type == EOF_ID:
+            return None
+        start = self.starts[index]
+        value = self.source[start:start + self.lengths[index]]
+        if token_type == IDENTIFIER_ID:
+            value = sys.intern(value)
+        return value
+
+    def position(self, index):
+        """(linha, coluna) do início do token"""
+        return self.source_map.line_col(self.starts[index])
+
+    def index_at(self, offset):
+        """Índice do token que começa em `offset`"""
+        return bisect_left(self.starts, offset)
+
+    def __getitem__(self, index):
+        """Visão preguiçosa: cria o Token apenas quando ele é acessado"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de token fora do buffer")
+        token_type = _TOKEN_TYPE_MEMBERS[self.types[index]]
+        return Token(token_type, self.value(index), self.starts[index], self.source_map)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def cursor(self, index=0):
+        return TokenCursor(self, index)
+
+    def nbytes(self):
+        """Memória ocupada pelas colunas e pelo SourceMap (sem contar o código-fonte)"""
+        line_starts = self.source_map.line_starts
+        return line_starts.itemsize * len(line_starts) + sum(
+            column.itemsize * len(column) for column in (self.types, self.starts, self.lengths))
+
+
+class TokenCursor:
+    """Cursor por índice sobre um TokenBuffer, compatível com o Parser"""
+
+    def __init__(self, buffer, index=0):
+        self.buffer = buffer
+        self.index = index
+
+    def next_index(self):
+        index = self.index
+        # O EOF é devolvido indefinidamente, como faz o Lexer
+        if index < len(self.buffer) - 1:
+            self.index = index + 1
+        return index
+
+    def next_token(self):
+        return self.buffer[self.next_index()]
+
+
+def scan_tokens(source, position=0, fast=True, source_map=None):
+    """
+    Varre `source` a partir de `position` e gera tuplas (type_id, início,
+    tamanho) dos tokens relevantes ao parser, terminando com o EOF.
+
+    Produz exatamente os mesmos tokens (e erros léxicos) que o Lexer.
+    `fast` escolhe entre o FastLexer (regex) e o AFD compilado;
+    `source_map`, se dado, evita recalcular as linhas na mensagem de erro.
+    """
+    lexer = create_lexer(source, fast=fast, source_map=source_map)
+    match = lexer.match
+
+    length = len(source)
+    while position < length:
+        start = position
+        try:
+            end, token_type = match(start)
+        except ValueError as e:
+            raise lexer.lexical_error(e, start)
+
+        # As palavras-chave já saem do AFD com o próprio tipo
+        if token_type not in TRIVIA_TOKENS:
+            yield token_type, start, end - start
+
+        position = end
+
+    yield EOF_ID, length, 0
+
+def tokenize_all(source, fast=True):
+    """Tokeniza todo o código-fonte e retorna um TokenBuffer terminado em EOF"""
+    buffer = TokenBuffer(source)
+    append = buffer.append
+    for type_id, start, length in scan_tokens(source, fast=fast, source_map=buffer.source_map):
+        append(type_id, start, length)
+    return buffer
@@ -0,0 +1,383 @@
+"""
+Otimizador da AST.
+
+Roda entre a análise semântica e a execução. Cada passo recebe um
+ProgramNode e devolve um novo ProgramNode (os nós da AST são imutáveis;
+comandos que não mudam são reaproveitados) e o número de reescritas que
+fez. O GerenciadorPassos executa uma sequência de passos e mede o tempo
+de cada um.
+
+    dobra-constantes      filter cuja comparação já é garantida pelos filters
+                          anteriores
+    select-redundante     select das mesmas colunas, na mesma ordem, do dataset
+    subexpressoes-comuns  load do mesmo arquivo ou filter igual sobre o mesmo dataset
+    variaveis-mortas      atribuições cujo valor nunca chega a um display
+
+Os três primeiros não removem comandos. Quando o valor de uma variável é
+igual ao de outra, os comandos seguintes passam a ler a outra, e a
+atribuição que ficou sem leitores é removida por variaveis-mortas.
+Displays não são reescritos, pois exibem o nome da variável.
+
+Comandos removidos não são executados: um erro de execução em um comando
+morto (arquivo ou coluna inexistente) deixa de acontecer.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import (ProgramNode, DisplayStatementNode, AssignmentStatementNode,
+                    LoadExpressionNode, FilterExpressionNode, SelectExpressionNode,
+                    RelationalExpressionNode, TermNode)
+
+
+COMPARACOES = {
+    '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b,
+    '>=': lambda a, b: a >= b,
+    '<=': lambda a, b: a <= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+
+def valor_literal(termo):
+    """Valor de um termo NUMBER ou STRING, como o interpretador o avalia"""
+    if termo.type == 'NUMBER':
+        return float(termo.value) if '.' in termo.value else int(termo.value)
+    return termo.value.strip('"')
+
+
+def leituras(comando):
+    """Variáveis lidas por um comando"""
+    if isinstance(comando, DisplayStatementNode):
+        return (comando.identifier,)
+    expressao = comando.expression
+    if isinstance(expressao, FilterExpressionNode):
+        direita = expressao.condition.right
+        if direita.type == 'IDENTIFIER':
+            return (expressao.dataset, direita.value)
+        return (expressao.dataset,)
+    if isinstance(expressao, SelectExpressionNode):
+        return (expressao.dataset,)
+    return ()
+
+
+def reescreve_leituras(comando, resolve):
+    """
+    `comando` lendo resolve(nome) no lugar de cada variável. Retorna o
+    próprio comando se nada muda.
+    """
+    if isinstance(comando, DisplayStatementNode):
+        return comando
+    expressao = comando.expression
+    if isinstance(expressao, FilterExpressionNode):
+        dataset = resolve(expressao.dataset)
+        condicao = expressao.condition
+        direita = condicao.right
+        if direita.type == 'IDENTIFIER' and resolve(direita.value) != direita.value:
+            direita = TermNode(resolve(direita.value), 'IDENTIFIER', direita.line, direita.col)
+            condicao = RelationalExpressionNode(condicao.left, condicao.operator, direita,
+                                                condicao.line, condicao.col)
+        if dataset == expressao.dataset and condicao is expressao.condition:
+            return comando
+        expressao = FilterExpressionNode(dataset, condicao, expressao.line, expressao.col)
+    elif isinstance(expressao, SelectExpressionNode):
+        dataset = resolve(expressao.dataset)
+        if dataset == expressao.dataset:
+            return comando
+        expressao = SelectExpressionNode(dataset, expressao.columns, expressao.line, expressao.col)
+    else:
+        return comando
+    return AssignmentStatementNode(comando.identifier, expressao, comando.line, comando.col)
+
+
+class Apelidos:
+    """
+    Variáveis que, no ponto atual do programa, têm o mesmo valor que
+    outra. Uma atribuição a qualquer uma das duas desfaz a ligação.
+    """
+
+    def __init__(self):
+        self.destino = {}
+        self.apelidos_de = {}
+
+    def resolve(self, nome):
+        return self.destino.get(nome, nome)
+
+    def atribui(self, nome):
+        """`nome` recebe um valor novo"""
+        destino = self.destino.pop(nome, None)
+        if destino is not None:
+            self.apelidos_de[destino].discard(nome)
+        for apelido in self.apelidos_de.pop(nome, ()):
+            del self.destino[apelido]
+
+    def liga(self, nome, igual_a):
+        """A partir daqui `nome` tem o mesmo valor que `igual_a`"""
+        destino = self.resolve(igual_a)
+        if destino != nome:
+            self.destino[nome] = destino
+            self.apelidos_de.setdefault(destino, set()).add(nome)
+
+
+class Passo:
+    """
+    Passo de otimização. Subclasses definem `nome` e executar(programa),
+    que retorna (novo programa, número de reescritas).
+    """
+    nome = ''
+
+    def executar(self, programa):
+        raise NotImplementedError
+
+
+class PassoEquivalencias(Passo):
+    """
+    Base dos passos que percorrem o programa descobrindo atribuições cujo
+    valor é igual ao de outra variável: equivalente(comando) retorna essa
+    variável, ou None. Os comandos seguintes passam a lê-la; as reescritas
+    são os comandos que de fato mudaram (uma equivalência lida só por
+    displays não muda nada).
+    """
+
+    def executar(self, programa):
+        self.inicia()
+        apelidos = Apelidos()
+        comandos = []
+        reescritas = 0
+        for original in programa.statements:
+            comando = reescreve_leituras(original, apelidos.resolve)
+            comandos.append(comando)
+            if comando is not original:
+                reescritas += 1
+            if isinstance(comando, DisplayStatementNode):
+                continue
+            igual_a = self.equivalente(comando)
+            apelidos.atribui(comando.identifier)
+            if igual_a is not None and igual_a != comando.identifier:
+                apelidos.liga(comando.identifier, igual_a)
+        return ProgramNode(comandos, programa.line, programa.col), reescritas
+
+    def inicia(self):
+        """Limpa o estado da execução anterior"""
+
+    def equivalente(self, comando):
+        raise NotImplementedError
+
+
+def _implica(fato, comparacao):
+    """Se toda linha em que `fato` (operador, valor) vale também satisfaz `comparacao`"""
+    operador, valor = fato
+    outro_operador, outro = comparacao
+    if isinstance(valor, str) != isinstance(outro, str):
+        return False
+    testa = COMPARACOES[outro_operador]
+    if operador == '==':
+        return testa(valor, outro)
+    if operador == '!=':
+        return outro_operador == '!=' and outro == valor
+    # Intervalo limitado por `valor`, acima ou abaixo dele
+    acima = operador in ('>', '>=')
+    inclusivo = operador in ('>=', '<=')
+    if outro_operador == '!=':
+        fora = outro < valor if acima else outro > valor
+        return fora or (outro == valor and not inclusivo)
+    if outro_operador not in (('>', '>=') if acima else ('<', '<=')):
+        return False
+    if valor != outro:
+        return testa(valor, outro)
+    return outro_operador in ('>=', '<=') or not inclusivo
+
+
+class DobraConstantes(PassoEquivalencias):
+    """
+    Filters cuja comparação é sempre verdadeira: uma coluna comparada com
+    um literal de modo já garantido pelos filters que produziram o dataset
+    (`valor > 5` depois de `valor > 10`). O filter não muda o dataset,
+    então a variável vale o mesmo que ele. Comparações entre dois literais
+    não são dobradas: o interpretador as rejeita, e o programa otimizado
+    passaria a executar sem erro.
+    """
+    nome = 'dobra-constantes'
+
+    def inicia(self):
+        # Variável -> {coluna: [(operador, valor)]} dos filters que a produziram
+        self.fatos = {}
+
+    def equivalente(self, comando):
+        expressao = comando.expression
+        fatos = self.fatos.get(getattr(expressao, 'dataset', None), {})
+        igual_a = None
+        if isinstance(expressao, SelectExpressionNode):
+            fatos = {coluna: fatos[coluna] for coluna in expressao.columns if coluna in fatos}
+        elif isinstance(expressao, FilterExpressionNode):
+            condicao = expressao.condition
+            if self._sempre_verdadeira(condicao, fatos):
+                igual_a = expressao.dataset
+            elif condicao.left.type == 'IDENTIFIER' and condicao.right.type != 'IDENTIFIER':
+                coluna = condicao.left.value
+                fatos = dict(fatos)
+                fatos[coluna] = fatos.get(coluna, []) + [(condicao.operator, valor_literal(condicao.right))]
+        else:
+            fatos = {}
+        self.fatos[comando.identifier] = fatos
+        return igual_a
+
+    @staticmethod
+    def _sempre_verdadeira(condicao, fatos):
+        esquerda, direita = condicao.left, condicao.right
+        if esquerda.type != 'IDENTIFIER' or direita.type == 'IDENTIFIER':
+            return False
+        comparacao = (condicao.operator, valor_literal(direita))
+        return any(_implica(fato, comparacao) for fato in fatos.get(esquerda.value, ()))
+
+
+class RemoveSelectRedundante(PassoEquivalencias):
+    """
+    Select das mesmas colunas, na mesma ordem, que o dataset já tem. As
+    colunas só são conhecidas para datasets produzidos por um select
+    (e filters sobre ele); um load pode ter qualquer coluna.
+    """
+    nome = 'select-redundante'
+
+    def inicia(self):
+        self.colunas = {}
+
+    def equivalente(self, comando):
+        expressao = comando.expression
+        colunas = self.colunas.get(getattr(expressao, 'dataset', None))
+        self.colunas.pop(comando.identifier, None)
+        if isinstance(expressao, FilterExpressionNode):
+            if colunas is not None:
+                self.colunas[comando.identifier] = colunas
+        elif isinstance(expressao, SelectExpressionNode):
+            if colunas is not None and list(expressao.columns) == colunas:
+                self.colunas[comando.identifier] = colunas
+                return expressao.dataset
+            # Com colunas repetidas o resultado tem mais colunas que a lista
+            if len(set(expressao.columns)) == len(expressao.columns):
+                self.colunas[comando.identifier] = list(expressao.columns)
+        return None
+
+
+class EliminaSubexpressoesComuns(PassoEquivalencias):
+    """
+    Load do mesmo arquivo ou filter com a mesma condição sobre o mesmo
+    dataset de uma atribuição anterior, enquanto a variável que guarda o
+    resultado e as que a expressão lê não forem reatribuídas.
+    """
+    nome = 'subexpressoes-comuns'
+
+    def inicia(self):
+        # Expressão -> variável que tem o valor dela; variável -> expressões que a envolvem
+        self.expressoes = {}
+        self.envolvidas = {}
+
+    def equivalente(self, comando):
+        chave, variaveis = self._chave(comando.expression)
+        guardada = self.expressoes.get(chave)
+        self._invalida(comando.identifier)
+        if guardada is not None and guardada != comando.identifier:
+            return guardada
+        if chave is not None and comando.identifier not in variaveis:
+            self.expressoes[chave] = comando.identifier
+            for nome in (comando.identifier,) + variaveis:
+                self.envolvidas.setdefault(nome, set()).add(chave)
+        return None
+
+    @staticmethod
+    def _chave(expressao):
+        """(chave da expressão, variáveis que ela lê); chave None se não é candidata"""
+        if isinstance(expressao, LoadExpressionNode):
+            return ('load', expressao.file_path), ()
+        if not isinstance(expressao, FilterExpressionNode) or expressao.condition.left.type != 'IDENTIFIER':
+            return None, ()
+        condicao = expressao.condition
+        direita = condicao.right
+        if direita.type == 'IDENTIFIER':
+            variaveis = (expressao.dataset, direita.value)
+            valor = direita.value
+        else:
+            variaveis = (expressao.dataset,)
+            valor = (direita.type, valor_literal(direita))
+        return ('filter', expressao.dataset, condicao.left.value, condicao.operator, valor), variaveis
+
+    def _invalida(self, nome):
+        for chave in self.envolvidas.pop(nome, ()):
+            self.expressoes.pop(chave, None)
+
+
+class EliminaVariaveisMortas(Passo):
+    """
+    Remove atribuições cujo valor nunca é lido, direta ou indiretamente,
+    por um display: percorre o programa de trás para a frente mantendo as
+    variáveis vivas (lidas adiante antes de serem reatribuídas).
+    """
+    nome = 'variaveis-mortas'
+
+    def executar(self, programa):
+        vivas = set()
+        comandos = []
+        for comando in reversed(programa.statements):
+            if isinstance(comando, AssignmentStatementNode):
+                if comando.identifier not in vivas:
+                    continue
+                vivas.discard(comando.identifier)
+            vivas.update(leituras(comando))
+            comandos.append(comando)
+        comandos.reverse()
+        removidos = len(programa.statements) - len(comandos)
+        if not removidos:
+            return programa, 0
+        return ProgramNode(comandos, programa.line, programa.col), removidos
+
+
+# Passos de cada nível de otimização (--opt-level)
+NIVEIS = {
+    0: (),
+    1: (DobraConstantes, RemoveSelectRedundante, EliminaVariaveisMortas),
+    2: (DobraConstantes, RemoveSelectRedundante, EliminaSubexpressoesComuns, EliminaVariaveisMortas),
+}
+
+
+class GerenciadorPassos:
+    """
+    Executa passos de otimização em sequência, cada um sobre o programa
+    produzido pelo anterior. O relatório tem, por passo, o nome, o tempo
+    em segundos e o número de reescritas.
+    """
+
+    def __init__(self, passos=()):
+        self.passos = list(passos)
+
+    @classmethod
+    def do_nivel(cls, nivel):
+        if nivel not in NIVEIS:
+            raise ValueError(f"Nível de otimização inválido: {nivel} (use {', '.join(map(str, NIVEIS))})")
+        return cls(passo() for passo in NIVEIS[nivel])
+
+    def adicionar(self, passo):
+        self.passos.append(passo)
+        return self
+
+    def executar(self, programa):
+        relatorio = []
+        for passo in self.passos:
+            inicio = time.perf_counter()
+            programa, reescritas = passo.executar(programa)
+            relatorio.append({'passo': passo.nome, 'tempo': time.perf_counter() - inicio,
+                              'reescritas': reescritas})
+        return programa, relatorio
+
+
+def otimizar(programa, nivel=1):
+    """Aplica os passos de `nivel` a `programa`. Retorna (programa, relatório)"""
+    return GerenciadorPassos.do_nivel(nivel).executar(programa)
+
+
+def formatar_relatorio(relatorio):
+    """Uma linha por passo: nome, reescritas e tempo"""
+    return '\n'.join(f"{item['passo']:<22} {item['reescritas']:>6} reescritas "
+                     f"{item['tempo'] * 1000:>9.3f} ms" for item in relatorio)
@@ -1,11 +1,54 @@
 from abc import ABC, abstractmethod
-from .token import Token
+from .token import Token, TokenType
 
 class AfdBase(ABC):
+    """
+    AFD que reconhece um tipo de token.
+
+    O autômato é descrito pelos atributos de classe TRANSITIONS,
+    FINAL_STATES e TOKEN_TYPE, junto com `_get_char_type`; essa descrição
+    declarativa é montada uma única vez e é o que permite ao
+    AnalisadorLexico combinar todos os AFDs em um só autômato.
+    """
+    START_STATE = 0
+    TRANSITIONS: dict = {}
+    FINAL_STATES: frozenset = frozenset()
+    TOKEN_TYPE: TokenType = None
+
     @abstractmethod
+    def _get_char_type(self, char: str) -> str:
+        """Classifica o caractere; tipos fora de TRANSITIONS equivalem a 'other'"""
+
+    @classmethod
+    def char_types(cls) -> tuple:
+        """Tipos de caractere usados nas transições, mais 'other'"""
+        types = {char_type for row in cls.TRANSITIONS.values() for char_type in row}
+        return tuple(sorted(types)) + ('other',)
+
     def process(self, source: str, start_index: int) -> Token | None:
         """
         Processa a string de entrada a partir de um índice inicial
         e retorna um Token se encontrar um padrão válido, ou None caso contrário.
         """
-        pass
\ No newline at end of file
+        transitions = self.TRANSITIONS
+        final_states = self.FINAL_STATES
+
+        current_state = self.START_STATE
+        current_index = start_index
+        last_final_state_index = -1
+
+        while current_index < len(source):
+            char_type = self._get_char_type(source[current_index])
+            next_state = transitions.get(current_state, {}).get(char_type)
+            if next_state is None:
+                break
+            current_state = next_state
+            current_index += 1
+            if current_state in final_states:
+                last_final_state_index = current_index
+
+        if last_final_state_index != -1:
+            lexeme = source[start_index:last_final_state_index]
+            return Token(self.TOKEN_TYPE, lexeme, start_index)
+
+        return None
\ No newline at end of file
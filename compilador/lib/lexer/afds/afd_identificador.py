@@ -0,0 +1,23 @@
+
+from ..token import Token, TokenType
+from ..afd_base import AfdBase
+
+class AfdIdentificador(AfdBase):
+    # [a-zA-Z_][a-zA-Z0-9_]*
+    TRANSITIONS = {
+        0: {'letter': 1, 'underscore': 1},
+        1: {'letter': 1, 'digit': 1, 'underscore': 1}
+    }
+
+    FINAL_STATES = frozenset({1})
+
+    TOKEN_TYPE = TokenType.IDENTIFIER
+
+    def _get_char_type(self, char: str) -> str:
+        if char.isalpha():
+            return 'letter'
+        if char.isdigit():
+            return 'digit'
+        if char == '_':
+            return 'underscore'
+        return 'other'
\ No newline at end of file
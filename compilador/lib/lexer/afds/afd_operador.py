@@ -0,0 +1,22 @@
+
+from ..token import Token, TokenType
+from ..afd_base import AfdBase
+
+class AfdOperador(AfdBase):
+    # =  ==  !=  >  >=  <  <=
+    TRANSITIONS = {
+        0: {'=': 1, '!': 3, '>': 4, '<': 6},
+        1: {'=': 2},
+        3: {'=': 2},
+        4: {'=': 5},
+        6: {'=': 7}
+    }
+
+    FINAL_STATES = frozenset({1, 2, 4, 5, 6, 7})
+
+    TOKEN_TYPE = TokenType.OPERATOR
+
+    def _get_char_type(self, char: str) -> str:
+        if char in '=!><':
+            return char
+        return 'other'
\ No newline at end of file
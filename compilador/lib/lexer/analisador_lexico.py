@@ -0,0 +1,157 @@
+from collections import deque
+from itertools import product
+
+from .token import Token
+from .afds.afd_numero import AfdNumero
+from .afds.afd_identificador import AfdIdentificador
+from .afds.afd_operador import AfdOperador
+
+
+class AutomatoProduto:
+    """
+    Autômato produto de vários AFDs: cada estado é a tupla dos estados de
+    todos os AFDs (None para um AFD que já morreu) e cada caractere é
+    classificado uma única vez na tupla dos seus tipos em cada AFD.
+
+    Um estado do produto aceita se algum componente estiver em estado
+    final; o tipo do token é o do primeiro AFD da lista (prioridade).
+    """
+    DEAD_STATE = -1
+
+    def __init__(self, afds):
+        self.afds = tuple(afd() for afd in afds)
+
+        # Classes combinadas: uma por combinação de tipos de caractere
+        type_lists = [afd.char_types() for afd in self.afds]
+        self.class_ids = {combo: i for i, combo in enumerate(product(*type_lists))}
+        self.known_types = [set(types) for types in type_lists]
+        self.ascii_classes = [self._classify(chr(code)) for code in range(128)]
+        self.other_classes = {}
+
+        # Estados do produto alcançáveis a partir da tupla de estados iniciais
+        start = tuple(afd.START_STATE for afd in self.afds)
+        self.state_ids = {start: 0}
+        self.table = []
+        self.accepting = []
+        pending = deque([start])
+        while pending:
+            components = pending.popleft()
+            row = []
+            for combo in self.class_ids:
+                next_components = tuple(
+                    None if state is None else afd.TRANSITIONS.get(state, {}).get(char_type)
+                    for afd, state, char_type in zip(self.afds, components, combo)
+                )
+                if all(state is None for state in next_components):
+                    row.append(self.DEAD_STATE)
+                    continue
+                if next_components not in self.state_ids:
+                    self.state_ids[next_components] = len(self.state_ids)
+                    pending.append(next_components)
+                row.append(self.state_ids[next_components])
+            self.table.append(row)
+            self.accepting.append(next(
+                (afd.TOKEN_TYPE for afd, state in zip(self.afds, components)
+                 if state in afd.FINAL_STATES),
+                None))
+
+    def _classify(self, char):
+        combo = []
+        for afd, known in zip(self.afds, self.known_types):
+            char_type = afd._get_char_type(char)
+            combo.append(char_type if char_type in known else 'other')
+        return self.class_ids[tuple(combo)]
+
+    def char_class(self, char):
+        """Classe combinada de um caractere fora do ASCII (com cache)"""
+        class_id = self.other_classes.get(char)
+        if class_id is None:
+            class_id = self.other_classes[char] = self._classify(char)
+        return class_id
+
+    def match(self, source, start):
+        """
+        Maior lexema reconhecido a partir de `start`, lendo cada caractere
+        uma única vez. Retorna (fim, tipo_do_token) ou None.
+        """
+        table = self.table
+        ascii_classes = self.ascii_classes
+        accepting = self.accepting
+
+        row = table[0]
+        last_match = None
+        i = start
+        length = len(source)
+        while i < length:
+            char = source[i]
+            code = ord(char)
+            state = row[ascii_classes[code] if code < 128 else self.char_class(char)]
+            if state < 0:
+                break
+            row = table[state]
+            i += 1
+            token_type = accepting[state]
+            if token_type is not None:
+                last_match = (i, token_type)
+        return last_match
+
+
+class AnalisadorLexico:
+    """
+    Analisador léxico que combina todos os AFDs (número, identificador e
+    operador) em um único autômato produto, montado uma vez quando a
+    classe é carregada. Usa o princípio da correspondência máxima; em
+    caso de empate, vence o AFD que aparece primeiro em AFDS.
+    """
+    AFDS = (AfdNumero, AfdIdentificador, AfdOperador)
+    AUTOMATO = AutomatoProduto(AFDS)
+
+    def __init__(self, afds=None):
+        if afds is None or tuple(afds) == self.AFDS:
+            self.automato = self.AUTOMATO
+        else:
+            self.automato = AutomatoProduto(afds)
+
+    def proximo_token(self, source: str, start_index: int) -> Token | None:
+        """Reconhece o token que começa em `start_index` (None se nenhum AFD aceitar)"""
+        result = self.automato.match(source, start_index)
+        if result is None:
+            return None
+        end, token_type = result
+        return Token(token_type, source[start_index:end], start_index)
+
+    def tokenize(self, source: str) -> list:
+        """Tokeniza todo o código, ignorando espaços em branco"""
+        tokens = []
+        position = 0
+        length = len(source)
+        while position < length:
+            if source[position].isspace():
+                position += 1
+                continue
+            token = self.proximo_token(source, position)
+            if token is None:
+                raise ValueError(f"Token inválido começando com '{source[position]}' "
+                                 f"na posição {position}")
+            tokens.append(token)
+            position += len(token.lexeme)
+        return tokens
+
+
+class AnalisadorLexicoPorAfd(AnalisadorLexico):
+    """
+    Abordagem original: executa cada AFD separadamente em cada posição e
+    fica com o maior lexema. Mantida como referência de corretude e de
+    desempenho para o AnalisadorLexico.
+    """
+
+    def __init__(self, afds=None):
+        self.afds = tuple(afd() for afd in (afds or self.AFDS))
+
+    def proximo_token(self, source: str, start_index: int) -> Token | None:
+        best = None
+        for afd in self.afds:
+            token = afd.process(source, start_index)
+            if token is not None and (best is None or len(token.lexeme) > len(best.lexeme)):
+                best = token
+        return best
@@ -3,6 +3,7 @@ from enum import Enum, auto
 class TokenType(Enum):
     NUMBER = auto()
     IDENTIFIER = auto()
+    OPERATOR = auto()
 
 class Token:
     def __init__(self, type: TokenType, lexeme: str, position: int):
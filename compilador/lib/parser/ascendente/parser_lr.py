@@ -0,0 +1,304 @@
+import os
+import sys
+from collections import deque
+
+from ..descendente.tabela_parsing import EPSILON, Gramatica, carregar_tabela, eh_acao, salvar_tabela
+from ..descendente.parser_ll1 import ACOES, ESPERADOS
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'lexer'))
+from parser import Parser, TokenType
+
+
+# Gramática da Coffee para o analisador ascendente: as listas usam
+# recursão à esquerda, que o LR aceita e que mantém a pilha rasa. Cada
+# produção termina, opcionalmente, com a ação que monta o seu valor a
+# partir dos valores do corpo (as mesmas ações do ParserLL1); sem ação,
+# a produção deve ter um único símbolo, cujo valor é repassado.
+PRODUCOES = (
+    ('Program', ('StatementList', '@programa')),
+    ('StatementList', ('StatementList', 'Statement', '@comando')),
+    ('StatementList', ('@lista',)),
+    ('Statement', ('DISPLAY', 'IDENTIFIER', '@display')),
+    ('Statement', ('IDENTIFIER', 'ASSIGN', 'AssignmentRHS', '@atribuicao')),
+    ('AssignmentRHS', ('LOAD', 'STRING', '@load')),
+    ('AssignmentRHS', ('FILTER', 'IDENTIFIER', 'WHERE', 'RelationalExpression', '@filter')),
+    ('AssignmentRHS', ('SELECT', 'IDENTIFIER', 'LPAREN', 'ColumnList', 'RPAREN', '@select')),
+    ('ColumnList', ('IDENTIFIER', '@primeira_coluna')),
+    ('ColumnList', ('ColumnList', 'COMMA', 'IDENTIFIER', '@coluna')),
+    ('RelationalExpression', ('Term', 'RelationalOp', 'Term', '@relacional')),
+    ('RelationalOp', ('GT',)),
+    ('RelationalOp', ('GE',)),
+    ('RelationalOp', ('LT',)),
+    ('RelationalOp', ('LE',)),
+    ('RelationalOp', ('EQEQ',)),
+    ('RelationalOp', ('NE',)),
+    ('Term', ('IDENTIFIER', '@termo')),
+    ('Term', ('NUMBER', '@termo')),
+    ('Term', ('STRING', '@termo')),
+)
+
+GRAMATICA = Gramatica(PRODUCOES)
+
+CAMINHO_TABELA = os.path.join(os.path.dirname(__file__), 'tabela_lalr.pickle')
+
+# Símbolo inicial da gramática aumentada e lookahead fictício usado para
+# descobrir quais lookaheads se propagam entre estados
+INICIO_AUMENTADO = "Inicio'"
+PROPAGA = '#'
+
+
+def _corpo_sem_acoes(corpo):
+    simbolos = tuple(simbolo for simbolo in corpo if not eh_acao(simbolo))
+    quantidade_acoes = len(corpo) - len(simbolos)
+    if quantidade_acoes > 1 or (quantidade_acoes and not eh_acao(corpo[-1])):
+        raise ValueError(f"O LR só aceita uma ação, no fim da produção: {corpo}")
+    return simbolos
+
+
+def construir_tabela_lalr(gramatica: Gramatica) -> dict:
+    """
+    Tabelas LALR(1) da gramática: o autômato LR(0) com os lookaheads
+    calculados por propagação (algoritmo do livro do Dragão), sem montar
+    o autômato LR(1) canônico.
+
+    Retorna {'acoes': [{terminal: ('empilha', estado) | ('reduz', produção)
+    | ('aceita',)}], 'desvios': [{não-terminal: estado}]}, uma posição por
+    estado. Lança ValueError em caso de conflito.
+    """
+    aumentada = Gramatica(((INICIO_AUMENTADO, (gramatica.inicial,)),) + gramatica.producoes)
+    corpos = [_corpo_sem_acoes(corpo) for _, corpo in aumentada.producoes]
+    producoes_de = {}
+    for indice, (cabeca, _) in enumerate(aumentada.producoes):
+        producoes_de.setdefault(cabeca, []).append(indice)
+
+    def proximo_simbolo(item):
+        producao, ponto = item
+        corpo = corpos[producao]
+        return corpo[ponto] if ponto < len(corpo) else None
+
+    def fecho_lr0(nucleo):
+        itens = set(nucleo)
+        pendentes = list(nucleo)
+        while pendentes:
+            simbolo = proximo_simbolo(pendentes.pop())
+            for producao in producoes_de.get(simbolo, ()):
+                item = (producao, 0)
+                if item not in itens:
+                    itens.add(item)
+                    pendentes.append(item)
+        return itens
+
+    def fecho_lr1(itens_com_lookahead):
+        itens = set(itens_com_lookahead)
+        pendentes = list(itens)
+        while pendentes:
+            producao, ponto, lookahead = pendentes.pop()
+            simbolo = proximo_simbolo((producao, ponto))
+            if simbolo not in producoes_de:
+                continue
+            primeiros = aumentada.primeiros_da_sequencia(corpos[producao][ponto + 1:])
+            lookaheads = primeiros - {EPSILON}
+            if EPSILON in primeiros:
+                lookaheads.add(lookahead)
+            for nova_producao in producoes_de[simbolo]:
+                for novo_lookahead in lookaheads:
+                    item = (nova_producao, 0, novo_lookahead)
+                    if item not in itens:
+                        itens.add(item)
+                        pendentes.append(item)
+        return itens
+
+    # Coleção canônica de conjuntos de itens LR(0), identificados pelo núcleo
+    nucleos = [frozenset({(0, 0)})]
+    indices = {nucleos[0]: 0}
+    transicoes = []
+    pendentes = deque([0])
+    while pendentes:
+        estado = pendentes.popleft()
+        por_simbolo = {}
+        for item in sorted(fecho_lr0(nucleos[estado])):
+            simbolo = proximo_simbolo(item)
+            if simbolo is not None:
+                por_simbolo.setdefault(simbolo, set()).add((item[0], item[1] + 1))
+        destinos = {}
+        for simbolo, nucleo in por_simbolo.items():
+            nucleo = frozenset(nucleo)
+            if nucleo not in indices:
+                indices[nucleo] = len(nucleos)
+                nucleos.append(nucleo)
+                pendentes.append(indices[nucleo])
+            destinos[simbolo] = indices[nucleo]
+        transicoes.append(destinos)
+
+    # Lookaheads espontâneos e arestas de propagação entre itens de núcleo
+    lookaheads = [{item: set() for item in nucleo} for nucleo in nucleos]
+    lookaheads[0][(0, 0)].add(Gramatica.FIM)
+    propagacoes = {}
+    for estado, nucleo in enumerate(nucleos):
+        for item in nucleo:
+            for producao, ponto, lookahead in fecho_lr1({(item[0], item[1], PROPAGA)}):
+                simbolo = proximo_simbolo((producao, ponto))
+                if simbolo is None:
+                    continue
+                destino = (transicoes[estado][simbolo], (producao, ponto + 1))
+                if lookahead == PROPAGA:
+                    propagacoes.setdefault((estado, item), set()).add(destino)
+                else:
+                    lookaheads[destino[0]][destino[1]].add(lookahead)
+
+    mudou = True
+    while mudou:
+        mudou = False
+        for (estado, item), destinos in propagacoes.items():
+            origem = lookaheads[estado][item]
+            for destino, item_destino in destinos:
+                alvo = lookaheads[destino][item_destino]
+                if not origem <= alvo:
+                    alvo |= origem
+                    mudou = True
+
+    acoes = []
+    for estado, nucleo in enumerate(nucleos):
+        linha = {}
+
+        def define(terminal, acao):
+            existente = linha.setdefault(terminal, acao)
+            if existente != acao:
+                raise ValueError(
+                    f"Gramática não é LALR(1): conflito no estado {estado} com '{terminal}' "
+                    f"entre {existente} e {acao}"
+                )
+
+        for simbolo, destino in transicoes[estado].items():
+            if not aumentada.eh_nao_terminal(simbolo):
+                define(simbolo, ('empilha', destino))
+        itens = fecho_lr1({(item[0], item[1], lookahead)
+                           for item in nucleo for lookahead in lookaheads[estado][item]})
+        for producao, ponto, lookahead in sorted(itens):
+            if ponto < len(corpos[producao]):
+                continue
+            if producao == 0:
+                define(lookahead, ('aceita',))
+            else:
+                define(lookahead, ('reduz', producao - 1))
+        acoes.append(linha)
+
+    desvios = [{simbolo: destino for simbolo, destino in transicoes[estado].items()
+                if aumentada.eh_nao_terminal(simbolo)}
+               for estado in range(len(nucleos))]
+    return {'acoes': acoes, 'desvios': desvios}
+
+
+class ParserLR(Parser):
+    """
+    Parser LALR(1) de empilha-reduz. As tabelas são geradas a partir de
+    PRODUCOES e lidas do arquivo pickle em CAMINHO_TABELA; cada redução
+    executa a ação da produção sobre os valores do topo da pilha e monta
+    os mesmos nós de AST do Parser descendente recursivo.
+    """
+
+    def __init__(self, lexer, tabela=None):
+        super().__init__(lexer)
+        if tabela is None:
+            self.programa = PROGRAMA
+        else:
+            self.programa = compila(GRAMATICA, tabela)
+
+    def parse(self):
+        acoes, desvios, producoes, esperados = self.programa
+        next_token = self.lexer.next_token
+
+        estados = [0]
+        valores = []
+        empilha_estado, empilha_valor = estados.append, valores.append
+        token = self.current_token
+        tipo = token.type
+        while True:
+            acao = acoes[estados[-1]][tipo]
+            if acao is None:
+                self.current_token = token
+                self.erro_no_estado(esperados[estados[-1]])
+            if acao >= 0:
+                empilha_estado(acao)
+                empilha_valor(token)
+                token = next_token()
+                tipo = token.type
+            elif acao == ACEITA:
+                break
+            else:
+                tamanho, cabeca, funcao = producoes[-acao - 2]
+                if tamanho:
+                    argumentos = valores[-tamanho:]
+                    del valores[-tamanho:]
+                    del estados[-tamanho:]
+                else:
+                    argumentos = ()
+                empilha_valor(funcao(*argumentos) if funcao else argumentos[0])
+                empilha_estado(desvios[estados[-1]][cabeca])
+
+        self.current_token = token
+        return valores[0]
+
+    def erro_no_estado(self, esperado):
+        if esperado is None:
+            self.statement_error()
+        self.error(esperado)
+
+
+# Códigos das ações na tabela compilada: estado >= 0 empilha, ACEITA
+# encerra e -(produção + 2) reduz; None marca erro
+ACEITA = -1
+
+
+def _descreve_esperados(gramatica, terminais):
+    """Texto 'Esperava ...' das mensagens de erro de um estado (None = início de comando)"""
+    if {'DISPLAY', 'IDENTIFIER'} <= terminais <= {'DISPLAY', 'IDENTIFIER', 'EOF'}:
+        return None
+    for nao_terminal, descricao in ESPERADOS.items():
+        if gramatica.primeiros.get(nao_terminal) == terminais:
+            return descricao
+    return ' ou '.join(sorted(terminais))
+
+
+def compila(gramatica, tabela):
+    """
+    Converte as tabelas geradas para a forma usada pelo laço do ParserLR:
+    linhas de ações indexadas pelo valor do TokenType e produções como
+    (tamanho do corpo, não-terminal, função da ação).
+    """
+    acoes = []
+    for linha in tabela['acoes']:
+        compilada = [None] * len(TokenType)
+        for terminal, acao in linha.items():
+            if acao[0] == 'empilha':
+                compilada[TokenType[terminal]] = acao[1]
+            elif acao[0] == 'reduz':
+                compilada[TokenType[terminal]] = -acao[1] - 2
+            else:
+                compilada[TokenType[terminal]] = ACEITA
+        acoes.append(compilada)
+
+    producoes = []
+    for cabeca, corpo in gramatica.producoes:
+        simbolos = _corpo_sem_acoes(corpo)
+        funcao = None
+        if corpo and eh_acao(corpo[-1]):
+            aridade, funcao = ACOES[corpo[-1]]
+            if aridade != len(simbolos):
+                raise ValueError(f"A ação {corpo[-1]} espera {aridade} valores, "
+                                 f"mas a produção de {cabeca} tem {len(simbolos)}")
+        elif len(simbolos) != 1:
+            raise ValueError(f"Produção de {cabeca} sem ação precisa ter um único símbolo")
+        producoes.append((len(simbolos), cabeca, funcao))
+
+    esperados = [_descreve_esperados(gramatica, set(linha)) for linha in tabela['acoes']]
+    return acoes, tabela['desvios'], producoes, esperados
+
+
+PROGRAMA = compila(GRAMATICA, carregar_tabela(GRAMATICA, CAMINHO_TABELA, construir_tabela_lalr))
+
+
+if __name__ == '__main__':
+    # Regrava as tabelas pré-computadas: python -m lib.parser.ascendente.parser_lr
+    tabela = salvar_tabela(GRAMATICA, CAMINHO_TABELA, construir_tabela_lalr)
+    print(f"Tabelas LALR(1) com {len(tabela['acoes'])} estados gravadas em {CAMINHO_TABELA}")
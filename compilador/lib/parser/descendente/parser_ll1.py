@@ -0,0 +1,181 @@
+import os
+import sys
+
+from .tabela_parsing import Gramatica, carregar_tabela, eh_acao, salvar_tabela
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'lexer'))
+from parser import (Parser, TokenType, ProgramNode, DisplayStatementNode, AssignmentStatementNode,
+                    LoadExpressionNode, FilterExpressionNode, SelectExpressionNode,
+                    RelationalExpressionNode, TermNode)
+
+
+# Gramática da Coffee na forma LL(1). As ações '@nome' montam os mesmos
+# nós de AST do Parser descendente recursivo (ver ACOES abaixo).
+PRODUCOES = (
+    ('Program', ('@lista', 'StatementList', '@programa')),
+    ('StatementList', ('Statement', '@comando', 'StatementList')),
+    ('StatementList', ()),
+    ('Statement', ('DISPLAY', 'IDENTIFIER', '@display')),
+    ('Statement', ('IDENTIFIER', 'ASSIGN', 'AssignmentRHS', '@atribuicao')),
+    ('AssignmentRHS', ('LOAD', 'STRING', '@load')),
+    ('AssignmentRHS', ('FILTER', 'IDENTIFIER', 'WHERE', 'RelationalExpression', '@filter')),
+    ('AssignmentRHS', ('SELECT', 'IDENTIFIER', 'LPAREN', 'ColumnList', 'RPAREN', '@select')),
+    ('ColumnList', ('IDENTIFIER', '@primeira_coluna', 'ColumnTail')),
+    ('ColumnTail', ('COMMA', 'IDENTIFIER', '@coluna', 'ColumnTail')),
+    ('ColumnTail', ()),
+    ('RelationalExpression', ('Term', 'RelationalOp', 'Term', '@relacional')),
+    ('RelationalOp', ('GT',)),
+    ('RelationalOp', ('GE',)),
+    ('RelationalOp', ('LT',)),
+    ('RelationalOp', ('LE',)),
+    ('RelationalOp', ('EQEQ',)),
+    ('RelationalOp', ('NE',)),
+    ('Term', ('IDENTIFIER', '@termo')),
+    ('Term', ('NUMBER', '@termo')),
+    ('Term', ('STRING', '@termo')),
+)
+
+
+def _anexa(lista, item):
+    lista.append(item)
+    return lista
+
+
+# Ação -> (quantidade de valores consumidos da pilha, função que monta o resultado).
+# Cada terminal casado empilha o seu token; cada ação troca os seus
+# argumentos por um único valor.
+ACOES = {
+    '@lista': (0, list),
+    '@programa': (1, lambda comandos: ProgramNode(comandos, 1, 1)),
+    '@comando': (2, _anexa),
+    '@display': (2, lambda display, identificador:
+                 DisplayStatementNode(identificador.value, *display.position)),
+    '@atribuicao': (3, lambda identificador, _igual, expressao:
+                    AssignmentStatementNode(identificador.value, expressao, *identificador.position)),
+    '@load': (2, lambda load, caminho: LoadExpressionNode(caminho.value, *load.position)),
+    '@filter': (4, lambda filtro, dataset, _where, condicao:
+                FilterExpressionNode(dataset.value, condicao, *filtro.position)),
+    '@select': (5, lambda select, dataset, _abre, colunas, _fecha:
+                SelectExpressionNode(dataset.value, colunas, *select.position)),
+    '@primeira_coluna': (1, lambda coluna: [coluna.value]),
+    '@coluna': (3, lambda colunas, _virgula, coluna: _anexa(colunas, coluna.value)),
+    '@relacional': (3, lambda esquerda, operador, direita:
+                    RelationalExpressionNode(esquerda, Parser.RELATIONAL_OPERATORS[operador.type],
+                                             direita, esquerda.line, esquerda.col)),
+    '@termo': (1, lambda token: TermNode(token.value, token.type.name, *token.position)),
+}
+
+# Descrição usada na mensagem de erro quando não há produção para o token atual
+ESPERADOS = {
+    'AssignmentRHS': "'load', 'filter' ou 'select' após o '='",
+    'ColumnList': 'IDENTIFIER',
+    'ColumnTail': 'RPAREN',
+    'RelationalExpression': "identificador, número ou string",
+    'RelationalOp': "Operador Relacional (como '>', '==', etc.)",
+    'Term': "identificador, número ou string",
+}
+
+GRAMATICA = Gramatica(PRODUCOES)
+
+CAMINHO_TABELA = os.path.join(os.path.dirname(__file__), 'tabela_ll1.pickle')
+
+
+class ParserLL1(Parser):
+    """
+    Parser LL(1) dirigido por tabela. Em vez de uma função por regra, um
+    laço único consulta a tabela [não-terminal, token] e expande a
+    produção escolhida em uma pilha explícita, de modo que o tamanho do
+    programa não afeta a pilha de chamadas do Python.
+
+    Os símbolos da pilha são inteiros: terminais são os próprios valores
+    de TokenType, seguidos dos não-terminais e das ações semânticas.
+    Produz a mesma AST e as mesmas mensagens de erro que o Parser.
+    """
+
+    def __init__(self, lexer, tabela=None):
+        super().__init__(lexer)
+        if tabela is None:
+            self.programa = PROGRAMA
+        else:
+            self.programa = compila(GRAMATICA, tabela)
+
+    def parse(self):
+        base_nao_terminais, base_acoes, linhas, corpos, acoes, inicio = self.programa
+        next_token = self.lexer.next_token
+
+        pilha = [inicio]
+        desempilha, expande = pilha.pop, pilha.extend
+        valores = []
+        empilha_valor = valores.append
+        token = self.current_token
+        tipo = token.type
+        while pilha:
+            simbolo = desempilha()
+            if simbolo < base_nao_terminais:
+                if tipo != simbolo:
+                    self.current_token = token
+                    self.error(TokenType(simbolo))
+                empilha_valor(token)
+                token = next_token()
+                tipo = token.type
+            elif simbolo < base_acoes:
+                producao = linhas[simbolo][tipo]
+                if producao < 0:
+                    self.current_token = token
+                    self.erro_sem_producao(GRAMATICA.nao_terminais[simbolo - base_nao_terminais])
+                expande(corpos[producao])
+            else:
+                aridade, funcao = acoes[simbolo]
+                if aridade:
+                    argumentos = valores[-aridade:]
+                    del valores[-aridade:]
+                    empilha_valor(funcao(*argumentos))
+                else:
+                    empilha_valor(funcao())
+
+        self.current_token = token
+        if tipo != TokenType.EOF:
+            self.trailing_error()
+        return valores[0]
+
+    def erro_sem_producao(self, nao_terminal):
+        if nao_terminal in ('Program', 'StatementList', 'Statement'):
+            self.statement_error()
+        self.error(ESPERADOS[nao_terminal])
+
+
+def compila(gramatica, tabela):
+    """
+    Converte a tabela {não-terminal: {terminal: produção}} na forma usada
+    pelo laço do ParserLL1: uma linha por não-terminal indexada pelo valor
+    do TokenType e corpos das produções já invertidos e codificados como
+    inteiros.
+    """
+    base_nao_terminais = len(TokenType)
+    base_acoes = base_nao_terminais + len(gramatica.nao_terminais)
+    nomes_acoes = tuple(dict.fromkeys(
+        simbolo for _, corpo in gramatica.producoes for simbolo in corpo if eh_acao(simbolo)
+    ))
+    codigos = {nome: base_nao_terminais + i for i, nome in enumerate(gramatica.nao_terminais)}
+    codigos.update({nome: base_acoes + i for i, nome in enumerate(nomes_acoes)})
+    codigos.update({token_type.name: int(token_type) for token_type in TokenType})
+
+    # linhas e acoes são indexadas diretamente pelo código do símbolo
+    linhas = [None] * base_nao_terminais
+    for nao_terminal in gramatica.nao_terminais:
+        linha = [-1] * len(TokenType)
+        for terminal, producao in tabela[nao_terminal].items():
+            linha[TokenType[terminal]] = producao
+        linhas.append(linha)
+    corpos = [[codigos[simbolo] for simbolo in reversed(corpo)] for _, corpo in gramatica.producoes]
+    acoes = [None] * base_acoes + [ACOES[nome] for nome in nomes_acoes]
+    return base_nao_terminais, base_acoes, linhas, corpos, acoes, codigos[gramatica.inicial]
+
+
+PROGRAMA = compila(GRAMATICA, carregar_tabela(GRAMATICA, CAMINHO_TABELA))
+
+
+if __name__ == '__main__':
+    # Regrava a tabela pré-computada: python -m lib.parser.descendente.parser_ll1
+    tabela = salvar_tabela(GRAMATICA, CAMINHO_TABELA)
+    print(f"Tabela LL(1) com {sum(map(len, tabela.values()))} entradas gravada em {CAMINHO_TABELA}")
@@ -0,0 +1,134 @@
+import hashlib
+import pickle
+
+# Versão do formato gravado em disco; mude-a ao alterar a estrutura salva
+FORMATO_TABELA = 1
+
+EPSILON = ''
+
+
+def eh_acao(simbolo: str) -> bool:
+    """Ações semânticas aparecem no corpo das produções como '@nome'"""
+    return simbolo.startswith('@')
+
+
+class Gramatica:
+    """
+    Gramática livre de contexto descrita por uma sequência de produções
+    (cabeça, corpo). No corpo, nomes em MAIÚSCULAS são terminais (tipos
+    de token), '@nome' são ações semânticas (ignoradas no cálculo de
+    FIRST/FOLLOW) e os demais nomes são não-terminais. A cabeça da
+    primeira produção é o símbolo inicial.
+    """
+    FIM = 'EOF'
+
+    def __init__(self, producoes):
+        self.producoes = tuple((cabeca, tuple(corpo)) for cabeca, corpo in producoes)
+        self.inicial = self.producoes[0][0]
+        self.nao_terminais = tuple(dict.fromkeys(cabeca for cabeca, _ in self.producoes))
+        self.terminais = tuple(dict.fromkeys(
+            simbolo for _, corpo in self.producoes for simbolo in corpo
+            if not eh_acao(simbolo) and simbolo not in self.nao_terminais
+        ))
+        self.primeiros = self._calcula_primeiros()
+        self.seguidores = self._calcula_seguidores()
+
+    def eh_nao_terminal(self, simbolo: str) -> bool:
+        return simbolo in self.primeiros
+
+    def primeiros_da_sequencia(self, simbolos) -> set:
+        """FIRST de uma sequência de símbolos (contém EPSILON se ela for anulável)"""
+        resultado = set()
+        for simbolo in simbolos:
+            if eh_acao(simbolo):
+                continue
+            if not self.eh_nao_terminal(simbolo):
+                resultado.add(simbolo)
+                return resultado
+            resultado |= self.primeiros[simbolo] - {EPSILON}
+            if EPSILON not in self.primeiros[simbolo]:
+                return resultado
+        resultado.add(EPSILON)
+        return resultado
+
+    def _calcula_primeiros(self):
+        self.primeiros = {nao_terminal: set() for nao_terminal in self.nao_terminais}
+        mudou = True
+        while mudou:
+            mudou = False
+            for cabeca, corpo in self.producoes:
+                novos = self.primeiros_da_sequencia(corpo) - self.primeiros[cabeca]
+                if novos:
+                    self.primeiros[cabeca] |= novos
+                    mudou = True
+        return self.primeiros
+
+    def _calcula_seguidores(self):
+        seguidores = {nao_terminal: set() for nao_terminal in self.nao_terminais}
+        seguidores[self.inicial].add(self.FIM)
+        mudou = True
+        while mudou:
+            mudou = False
+            for cabeca, corpo in self.producoes:
+                for i, simbolo in enumerate(corpo):
+                    if not self.eh_nao_terminal(simbolo):
+                        continue
+                    resto = self.primeiros_da_sequencia(corpo[i + 1:])
+                    novos = resto - {EPSILON}
+                    if EPSILON in resto:
+                        novos |= seguidores[cabeca]
+                    novos -= seguidores[simbolo]
+                    if novos:
+                        seguidores[simbolo] |= novos
+                        mudou = True
+        return seguidores
+
+    def hash(self) -> str:
+        """Identifica a gramática da qual uma tabela foi gerada"""
+        conteudo = repr((FORMATO_TABELA, self.producoes))
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def construir_tabela(gramatica: Gramatica) -> dict:
+    """
+    Tabela LL(1): {não-terminal: {terminal: índice da produção}}.
+    Lança ValueError se duas produções disputarem a mesma célula.
+    """
+    tabela = {nao_terminal: {} for nao_terminal in gramatica.nao_terminais}
+    for indice, (cabeca, corpo) in enumerate(gramatica.producoes):
+        primeiros = gramatica.primeiros_da_sequencia(corpo)
+        terminais = primeiros - {EPSILON}
+        if EPSILON in primeiros:
+            terminais |= gramatica.seguidores[cabeca]
+        for terminal in terminais:
+            existente = tabela[cabeca].setdefault(terminal, indice)
+            if existente != indice:
+                raise ValueError(
+                    f"Gramática não é LL(1): conflito em [{cabeca}, {terminal}] "
+                    f"entre as produções {existente} e {indice}"
+                )
+    return tabela
+
+
+def salvar_tabela(gramatica: Gramatica, caminho: str, construir=construir_tabela) -> dict:
+    """Gera a tabela da gramática e a grava em `caminho` junto com o hash"""
+    tabela = construir(gramatica)
+    with open(caminho, 'wb') as f:
+        pickle.dump({'hash': gramatica.hash(), 'tabela': tabela}, f)
+    return tabela
+
+
+def carregar_tabela(gramatica: Gramatica, caminho: str, construir=construir_tabela) -> dict:
+    """
+    Lê a tabela pré-computada de `caminho`. Se o arquivo não existir ou
+    tiver sido gerado a partir de outra gramática, a tabela é recalculada
+    em memória com `construir` (o arquivo não é reescrito).
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            dados = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        dados = None
+    if isinstance(dados, dict) and dados.get('hash') == gramatica.hash():
+        return dados['tabela']
+    return construir(gramatica)
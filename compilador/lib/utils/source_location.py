@@ -0,0 +1,113 @@
+"""
+Localização no código-fonte.
+
+`SourceMap` calcula uma única vez o offset de início de cada linha e
+converte offsets em (linha, coluna) por busca binária, sem percorrer o
+texto. Um mesmo mapa é compartilhado pelo lexer (os tokens guardam só o
+offset), pelos erros de sintaxe e pelos erros semânticos, então montar
+uma mensagem de erro custa O(log linhas), qualquer que seja o tamanho
+do arquivo.
+
+Linhas e colunas começam em 1 e as colunas contam caracteres, como no
+Lexer: apenas '\\n' quebra linha.
+
+Na leitura em blocos, `discard_before` descarta os inícios das linhas já
+lidas: o mapa guarda só as linhas a partir de `first_line`.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, repeat
+from operator import add
+
+
+def _line_starts(text, base):
+    """Offsets (somados a `base`) das linhas iniciadas por cada '\\n' de `text`"""
+    parts = text.split('\n')
+    # Cada linha termina um caractere ('\n') depois do seu tamanho
+    starts = accumulate(map(add, map(len, parts), repeat(1, len(parts) - 1)), initial=base)
+    next(starts)
+    return starts
+
+
+class SourceMap:
+    """Mapa offset -> (linha, coluna) de um código-fonte"""
+    __slots__ = ('text', 'line_starts', 'length', 'first_line')
+
+    def __init__(self, text='', keep_text=True):
+        # Sem o texto (keep_text=False) o mapa ainda converte offsets,
+        # mas não devolve o conteúdo das linhas
+        self.text = text if keep_text else None
+        self.line_starts = array('Q', [0])
+        self.line_starts.extend(_line_starts(text, 0))
+        self.length = len(text)
+        # Número da linha que começa em line_starts[0]
+        self.first_line = 1
+
+    def extend(self, text):
+        """Acrescenta `text` ao fim do código-fonte (leitura em blocos)"""
+        self.line_starts.extend(_line_starts(text, self.length))
+        self.length += len(text)
+        if self.text is not None:
+            self.text += text
+
+    def edited(self, offset, deleted_length, inserted_text):
+        """
+        Mapa do código-fonte depois de trocar `deleted_length` caracteres a
+        partir de `offset` por `inserted_text`. Só as linhas da edição são
+        recalculadas; as seguintes são deslocadas.
+        """
+        starts = self.line_starts
+        edit_end = offset + deleted_length
+        delta = len(inserted_text) - deleted_length
+        result = SourceMap(keep_text=False)
+        result.line_starts = starts[:bisect_right(starts, offset)]
+        result.line_starts.extend(_line_starts(inserted_text, offset))
+        suffix = bisect_right(starts, edit_end)
+        if delta:
+            result.line_starts.extend(array('Q', [start + delta for start in starts[suffix:]]))
+        else:
+            result.line_starts.extend(starts[suffix:])
+        result.length = self.length + delta
+        if self.text is not None:
+            result.text = self.text[:offset] + inserted_text + self.text[edit_end:]
+        return result
+
+    def discard_before(self, offset):
+        """Esquece as linhas que terminam antes de `offset`"""
+        kept = bisect_right(self.line_starts, offset) - 1
+        if kept > 0:
+            del self.line_starts[:kept]
+            self.first_line += kept
+
+    @property
+    def line_count(self):
+        return self.first_line - 1 + len(self.line_starts)
+
+    def line_col(self, offset):
+        """(linha, coluna) do caractere em `offset`"""
+        index = bisect_right(self.line_starts, offset)
+        if not index:
+            raise ValueError(f"Offset {offset} anterior à linha {self.first_line}, "
+                             f"a primeira guardada no mapa")
+        return index + self.first_line - 1, offset - self.line_starts[index - 1] + 1
+
+    def offset(self, line, col):
+        """Offset da posição (linha, coluna)"""
+        if not self.first_line <= line <= self.line_count:
+            raise ValueError(f"Linha {line} fora do código-fonte ({self.line_count} linhas)")
+        return self.line_starts[line - self.first_line] + col - 1
+
+    def line_text(self, line):
+        """Conteúdo da linha `line`, sem a quebra de linha"""
+        if self.text is None:
+            raise ValueError("SourceMap criado sem o texto do código-fonte")
+        start = self.offset(line, 1)
+        end = self.line_starts[line - self.first_line + 1] - 1 if line < self.line_count else self.length
+        return self.text[start:end]
+
+    def excerpt(self, line, col):
+        """Linha `line` seguida de um marcador '^' sob a coluna `col`"""
+        text = self.line_text(line)
+        gutter = f"{line:>5} | "
+        return f"{gutter}{text}\n{' ' * (len(gutter) - 2)}| {' ' * (col - 1)}^"
@@ -0,0 +1,192 @@
+import contextlib
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from lib.codegen.otimizador import (DobraConstantes, EliminaSubexpressoesComuns,
+                                    EliminaVariaveisMortas, GerenciadorPassos, Passo,
+                                    RemoveSelectRedundante, otimizar)
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser
+from fast_lexer import create_lexer
+from coffee_interpreter import CoffeeInterpreter
+
+
+def parse(source):
+    return Parser(create_lexer(source)).parse()
+
+def aplica(passo, source):
+    programa, reescritas = passo.executar(parse(source))
+    return [repr(comando) for comando in programa.statements], reescritas
+
+def test_filtro_garantido_pelos_anteriores_e_dobrado():
+
+    comandos, reescritas = aplica(DobraConstantes(), '''a = load "x.csv"
+b = filter a where valor > 10
+c = filter b where valor >= 5
+d = filter c where valor != 3
+e = filter d where valor < 100
+display e
+''')
+    # c e d valem o mesmo que b: d e e passam a ler b
+    assert reescritas == 2
+    assert comandos[4] == 'Assignment(e = Filter(b, (IDENTIFIER(valor) < NUMBER(100))))'
+
+@pytest.mark.parametrize('condicao, dobra', [
+    ('valor > 10', True), ('valor >= 10', True), ('valor >= 11', False), ('valor > 20', False),
+    ('valor != 10', True), ('valor < 50', False), ('outra > 10', False), ('1 < 2', False), ('2 < 1', False),
+    ('"a" == "a"', False), ('10 == "10"', False),
+])
+def test_dobra_de_comparacoes(condicao, dobra):
+
+    _, reescritas = aplica(DobraConstantes(), f'''a = load "x.csv"
+b = filter a where valor > 10
+c = filter b where {condicao}
+d = select c (id)
+display d
+''')
+    assert reescritas == int(dobra)
+
+def test_equivalencia_lida_so_por_display_nao_conta():
+
+    source = 'a = load "x.csv"\nb = filter a where valor > 10\nc = filter b where valor > 5\ndisplay c'
+    programa, reescritas = DobraConstantes().executar(parse(source))
+    assert reescritas == 0
+    assert [repr(comando) for comando in programa.statements] == \
+        [repr(comando) for comando in parse(source).statements]
+
+def test_fatos_de_coluna_descartada_pelo_select_nao_valem():
+
+    _, reescritas = aplica(DobraConstantes(), '''a = load "x.csv"
+b = filter a where nome == "Ana"
+c = select b (id)
+d = filter c where nome == "Ana"
+e = select d (id)
+display e
+''')
+    assert reescritas == 0
+
+def test_select_das_mesmas_colunas_e_removido():
+
+    comandos, reescritas = aplica(RemoveSelectRedundante(), '''a = load "x.csv"
+b = select a (id, nome)
+c = filter b where id > 1
+d = select c (id, nome)
+e = select d (nome, id)
+f = select a (id, nome)
+display e
+display f
+''')
+    # select (nome, id) muda a ordem; colunas de um load são desconhecidas
+    assert reescritas == 1
+    assert comandos[4] == "Assignment(e = Select(c, ['nome', 'id']))"
+
+def test_subexpressao_comum_invalidada_por_reatribuicao():
+
+    comandos, reescritas = aplica(EliminaSubexpressoesComuns(), '''a = load "x.csv"
+b = load "x.csv"
+c = filter a where id > 1
+d = filter b where id > 1
+a = load "y.csv"
+e = filter a where id > 1
+f = select d (id)
+display e
+display f
+''')
+    assert reescritas == 2
+    assert comandos[5] == 'Assignment(e = Filter(a, (IDENTIFIER(id) > NUMBER(1))))'
+    assert comandos[6] == "Assignment(f = Select(c, ['id']))"
+
+def test_variaveis_mortas_consideram_reatribuicoes():
+
+    comandos, reescritas = aplica(EliminaVariaveisMortas(), '''a = load "x.csv"
+morta = select a (id)
+b = filter a where id > 1
+a = load "y.csv"
+display b
+a = select b (id)
+''')
+    assert reescritas == 3
+    assert comandos == ['Assignment(a = Load("x.csv"))',
+                        'Assignment(b = Filter(a, (IDENTIFIER(id) > NUMBER(1))))', 'Display(b)']
+
+def test_niveis_e_relatorio():
+
+    source = 'a = load "x.csv"\nb = load "x.csv"\nc = select b (id)\nd = load "z.csv"\ndisplay c'
+    programa, relatorio = otimizar(parse(source), 0)
+    assert relatorio == [] and len(programa.statements) == 5
+
+    programa, relatorio = otimizar(parse(source), 2)
+    assert [item['passo'] for item in relatorio] == [
+        'dobra-constantes', 'select-redundante', 'subexpressoes-comuns', 'variaveis-mortas']
+    assert [item['reescritas'] for item in relatorio] == [0, 0, 1, 2]
+    assert all(item['tempo'] >= 0 for item in relatorio)
+    assert [repr(comando) for comando in programa.statements] == [
+        'Assignment(a = Load("x.csv"))', "Assignment(c = Select(a, ['id']))", 'Display(c)']
+
+    with pytest.raises(ValueError):
+        otimizar(parse(source), 3)
+
+def test_passo_adicional_no_gerenciador():
+
+    class ContaComandos(Passo):
+        nome = 'conta-comandos'
+
+        def executar(self, programa):
+            return programa, len(programa.statements)
+
+    gerenciador = GerenciadorPassos.do_nivel(1).adicionar(ContaComandos())
+    _, relatorio = gerenciador.executar(parse('a = load "x.csv"\nb = select a (id)\ndisplay a'))
+    assert relatorio[-1]['passo'] == 'conta-comandos' and relatorio[-1]['reescritas'] == 2
+
+def executa_nos_niveis(source):
+    """(success, erro, saída) do programa otimizado em cada nível"""
+    resultados = []
+    for nivel in (0, 1, 2):
+        programa, _ = otimizar(parse(source), nivel)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = CoffeeInterpreter().interpret(programa)
+        resultados.append((result['success'], result.get('error'), output.getvalue()))
+    return resultados
+
+@pytest.fixture
+def vendas(tmp_path):
+    path = tmp_path / 'vendas.csv'
+    pd.DataFrame({
+        'produto': ['Notebook', 'Mouse', 'Teclado', 'Monitor'],
+        'preco': [2500.0, 50.0, 150.0, 800.0],
+        'vendedor': ['Ana', 'Carlos', 'Ana', 'Bruno'],
+    }).to_csv(path, index=False)
+    return path
+
+def test_programa_otimizado_tem_a_mesma_saida(vendas):
+
+    resultados = executa_nos_niveis(f'''dados = load "{vendas}"
+copia = load "{vendas}"
+caros = filter dados where preco > 100
+ainda_caros = filter caros where preco >= 100
+nomes = select ainda_caros (produto, preco)
+mesmos = select nomes (produto, preco)
+ana = filter copia where vendedor == "Ana"
+sem_uso = filter dados where preco < 10
+display mesmos
+display ana
+''')
+    assert resultados[0][0]
+    assert resultados[0] == resultados[1] == resultados[2]
+
+def test_filtro_entre_literais_falha_em_todos_os_niveis(vendas):
+
+    resultados = executa_nos_niveis(f'''v = load "{vendas}"
+b = filter v where 1 < 2
+c = select b (produto)
+display c
+''')
+    assert not resultados[0][0]
+    assert resultados[0] == resultados[1] == resultados[2]
@@ -0,0 +1,100 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+import ast_cache
+from ast_cache import cache_path, load_program
+from coffee_interpreter import CoffeeInterpreter
+
+PROGRAMA = '''dados = load "vendas.csv"
+grandes = filter dados where total >= 600
+nomes = select grandes (produto, total)
+display nomes
+'''
+
+
+@pytest.fixture
+def programa(tmp_path):
+    path = tmp_path / 'programa.coffee'
+    path.write_text(PROGRAMA, encoding='utf-8')
+    return str(path)
+
+def test_segunda_execucao_vem_do_cache(programa):
+
+    first = load_program(programa)
+    second = load_program(programa)
+    assert not first.from_cache and second.from_cache
+    assert os.path.dirname(cache_path(programa)).endswith('.coffeec')
+    assert repr(second.ast) == repr(first.ast)
+    assert [(s.line, s.col) for s in second.ast.statements] == [(1, 1), (2, 1), (3, 1), (4, 1)]
+    condition = second.ast.statements[1].expression.condition
+    assert (condition.right.line, condition.right.col) == (2, 39)
+    assert second.warnings == first.warnings
+    assert {name: (s.type, s.usage_count, s.metadata) for name, s in second.symbol_table.items()} == \
+           {name: (s.type, s.usage_count, s.metadata) for name, s in first.symbol_table.items()}
+
+def test_ast_do_cache_e_interpretada(programa):
+
+    load_program(programa)
+    program = load_program(programa)
+    result = CoffeeInterpreter(debug=False).interpret(program.ast)
+    assert result['success']
+    assert set(result['environment']) == {'dados', 'grandes', 'nomes'}
+
+def test_mudanca_no_codigo_invalida_o_cache(programa):
+
+    load_program(programa)
+    with open(programa, 'a', encoding='utf-8') as f:
+        f.write('display dados\n')
+    program = load_program(programa)
+    assert not program.from_cache
+    assert len(program.ast.statements) == 5
+
+def test_outra_versao_do_compilador_invalida_o_cache(programa, monkeypatch):
+
+    load_program(programa)
+    monkeypatch.setattr(ast_cache, 'compiler_version', lambda: 'outra-versao')
+    assert not load_program(programa).from_cache
+    assert load_program(programa).from_cache
+
+def test_programa_com_erro_semantico_nao_e_guardado(tmp_path):
+
+    path = tmp_path / 'erro.coffee'
+    path.write_text('display nada\n', encoding='utf-8')
+    program = load_program(str(path))
+    assert not program.success
+    assert not os.path.exists(cache_path(str(path)))
+
+def test_cache_corrompido_e_recompilado(programa):
+
+    load_program(programa)
+    with open(cache_path(programa), 'wb') as f:
+        f.write(b'lixo')
+    program = load_program(programa)
+    assert not program.from_cache and program.success
+    assert load_program(programa).from_cache
+
+def test_sem_cache(programa):
+
+    load_program(programa, use_cache=False)
+    assert not os.path.exists(cache_path(programa))
+
+def test_programa_lido_em_blocos(tmp_path, monkeypatch):
+
+    # Quebras de linha do Windows e um comando por bloco de hash
+    path = tmp_path / 'programa.coffee'
+    path.write_bytes(PROGRAMA.replace('\n', '\r\n').encode('utf-8'))
+    monkeypatch.setattr(ast_cache, 'HASH_BLOCK_SIZE', 16)
+    sources = []
+    compile_source = ast_cache.compile_source
+    monkeypatch.setattr(ast_cache, 'compile_source',
+                        lambda source, fast=False: sources.append(source) or compile_source(source, fast))
+
+    first = load_program(str(path))
+    assert first.success and not isinstance(sources[0], str)
+    assert [(s.line, s.col) for s in first.ast.statements] == [(1, 1), (2, 1), (3, 1), (4, 1)]
+    assert load_program(str(path)).from_cache
+    with open(path, 'rb') as f:
+        assert ast_cache.cache_key(f) == ast_cache.cache_key(path.read_bytes())
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+LEXER_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'lexer')
+sys.path.append(LEXER_DIR)
+import batch_compiler
+from batch_compiler import compile_file, compile_files, find_sources
+
+
+@pytest.fixture
+def projeto(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'ok.coffee').write_text('d = load "a.csv"\nf = filter d where valor > 1\ndisplay f\n',
+                                        encoding='utf-8')
+    (tmp_path / 'sub' / 'ruim.dg').write_text('x = load 5\ny = select x (a b\n', encoding='utf-8')
+    (tmp_path / 'sub' / 'semantico.coffee').write_text('display nada\n', encoding='utf-8')
+    (tmp_path / 'notas.txt').write_text('não é um programa', encoding='utf-8')
+    return tmp_path
+
+def test_encontra_programas_em_ordem(projeto):
+
+    assert [os.path.relpath(path, projeto) for path in find_sources(str(projeto))] == [
+        'ok.coffee', os.path.join('sub', 'ruim.dg'), os.path.join('sub', 'semantico.coffee')]
+
+def test_resultado_por_arquivo(projeto):
+
+    ok, ruim, semantico = (compile_file(path) for path in find_sources(str(projeto)))
+    assert ok['success'] and ok['stage'] == 'semantic' and ok['errors'] == []
+    assert not ruim['success'] and ruim['stage'] == 'parse'
+    assert len(ruim['errors']) == 2
+    assert not semantico['success'] and semantico['stage'] == 'semantic'
+    assert "nada" in semantico['errors'][0]
+    assert set(ok['times']) == {'parse', 'semantic', 'total'}
+
+def test_arquivo_inexistente(tmp_path):
+
+    result = compile_file(str(tmp_path / 'sumiu.coffee'))
+    assert result['stage'] == 'io' and not result['success'] and result['errors']
+
+def test_excecao_em_um_arquivo_nao_interrompe_o_lote(projeto, monkeypatch):
+
+    def falha(self, ast):
+        raise ValueError('falha interna')
+    monkeypatch.setattr(batch_compiler.SemanticAnalyzer, 'analyze', falha)
+    ok, ruim, semantico = compile_files(find_sources(str(projeto)), workers=1)
+    assert not ok['success'] and ok['stage'] == 'semantic'
+    assert ok['errors'] == ['ValueError: falha interna'] and 'total' in ok['times']
+    assert ruim['stage'] == 'parse' and len(ruim['errors']) == 2
+    assert semantico['errors'] == ['ValueError: falha interna']
+    json.dumps([ok, ruim, semantico])
+
+def test_processos_produzem_mesmo_resultado(projeto):
+
+    paths = find_sources(str(projeto))
+    strip = lambda results: [{k: v for k, v in r.items() if k != 'times'} for r in results]
+    assert strip(compile_files(paths, workers=2)) == strip(compile_files(paths, workers=1))
+    assert strip(compile_files(paths, workers=2, fast=True)) == strip(compile_files(paths, workers=1))
+
+def test_linha_de_comando_emite_json_lines(projeto):
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(LEXER_DIR, 'batch_compiler.py'), str(projeto), '--workers', '2'],
+        capture_output=True, text=True, encoding='utf-8')
+    assert completed.returncode == 1
+    lines = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [line['success'] for line in lines] == [True, False, False]
+    assert "3 arquivos | 1 sem erros | 2 com erros" in completed.stderr
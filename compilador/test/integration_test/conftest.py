@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser
+from fast_lexer import create_lexer
+from coffee_interpreter import CoffeeInterpreter, DatasetOperations
+
+
+@pytest.fixture
+def vendas(tmp_path):
+    """CSV de vendas usado pelos testes do interpretador"""
+    path = tmp_path / 'vendas.csv'
+    pd.DataFrame({
+        'produto': ['Notebook', 'Mouse', 'Teclado', 'Monitor', 'Headset', 'Cabo', 'Hub'],
+        'quantidade': [2, 10, 5, 1, 4, 30, 5],
+        'preco': [2500.0, 50.0, 150.0, 800.0, 600.0, 20.0, 90.0],
+        'vendedor': ['Ana', 'Carlos', 'Ana', 'Bruno', 'Carlos', 'Ana', 'Bruno'],
+    }).to_csv(path, index=False)
+    return path
+
+@pytest.fixture
+def executar():
+    """
+    Executa um programa Coffee com a saída capturada; retorna (resultado,
+    saída). `interpreter` permite inspecionar o interpretador depois.
+    """
+    def executa(source, interpreter=None, **options):
+        interpreter = interpreter or CoffeeInterpreter(**options)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = interpreter.interpret(Parser(create_lexer(source)).parse())
+        return result, output.getvalue()
+    return executa
+
+@pytest.fixture
+def espiao(monkeypatch):
+    """
+    espiao(nome, argumento=0): troca o staticmethod `nome` de
+    DatasetOperations por um que registra o argumento de posição
+    `argumento` de cada chamada, em ordem, na lista retornada.
+    """
+    def espiona(name, argumento=0):
+        calls = []
+        original = getattr(DatasetOperations, name)
+        def spy(*args, **kwargs):
+            calls.append(args[argumento])
+            return original(*args, **kwargs)
+        monkeypatch.setattr(DatasetOperations, name, staticmethod(spy))
+        return calls
+    return espiona
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from coffee_interpreter import DatasetOperations
+
+
+@pytest.fixture
+def filtros(espiao):
+    """Predicados de cada chamada a DatasetOperations.filter_dataset_all"""
+    return espiao('filter_dataset_all', argumento=1)
+
+def test_cadeia_de_filtros_avaliada_de_uma_vez(vendas, executar, filtros):
+
+    source = f'''vendas = load "{vendas}"
+altas = filter vendas where preco >= 500
+poucas = filter altas where quantidade < 5
+ana = filter poucas where vendedor != "Carlos"
+display ana
+'''
+    result, _ = executar(source, lazy=True, pushdown=False)
+    assert result['success']
+    assert filtros[0] == [('preco', '>=', 500), ('quantidade', '<', 5), ('vendedor', '!=', 'Carlos')]
+    # Scan e os três Filters, como na execução sem fusão
+    assert result['statistics']['operations_executed'] == 4
+
+def test_intermediario_compartilhado_nao_e_fundido(vendas, executar, filtros):
+
+    source = f'''vendas = load "{vendas}"
+altas = filter vendas where preco >= 500
+poucas = filter altas where quantidade < 5
+ana = filter poucas where vendedor == "Ana"
+display ana
+display altas
+'''
+    result, _ = executar(source, lazy=True, pushdown=False)
+    assert result['success']
+    # `altas` é calculada uma vez e reaproveitada pelo segundo display
+    assert filtros == [[('preco', '>=', 500)], [('quantidade', '<', 5), ('vendedor', '==', 'Ana')]]
+
+def test_sem_fusao_um_filtro_por_vez(vendas, executar, filtros):
+
+    source = (f'vendas = load "{vendas}"\naltas = filter vendas where preco >= 500\n'
+              'poucas = filter altas where quantidade < 5\ndisplay poucas')
+    result, _ = executar(source, lazy=True, pushdown=False, fusion=False)
+    assert result['success'] and [len(predicates) for predicates in filtros] == [1, 1]
+
+def test_fusao_nos_blocos_do_csv(vendas, executar, filtros, monkeypatch):
+
+    monkeypatch.setattr(DatasetOperations, 'CSV_CHUNK_ROWS', 2)
+    source = f'''vendas = load "{vendas}"
+altas = filter vendas where preco >= 500
+bruno = filter altas where vendedor == "Bruno"
+display bruno
+'''
+    result, _ = executar(source, lazy=True)
+    assert result['success']
+    # Um bloco de 2 linhas por chamada, sempre com os dois predicados
+    assert len(filtros) == 4 and all(len(predicates) == 2 for predicates in filtros)
+    assert result['statistics']['datasets_loaded'] == 1
+
+def test_cadeia_fundida_no_modo_imediato(vendas, executar, filtros):
+
+    result, _ = executar(f'''vendas = load "{vendas}"
+altas = filter vendas where preco >= 500
+poucas = filter altas where quantidade < 5
+ana = filter poucas where vendedor != "Carlos"
+display ana
+''')
+    assert result['success']
+    assert filtros == [[('preco', '>=', 500), ('quantidade', '<', 5), ('vendedor', '!=', 'Carlos')]]
+    assert result['statistics']['operations_executed'] == 4
+    # Os intermediários nunca são calculados
+    assert result['environment']['poucas']['fused_filters'] == 2
+    assert result['environment']['ana']['rows'] == 2
+
+@pytest.mark.parametrize('source, cadeias', [
+    # `altas` também é exibida: só `poucas` é adiada
+    ('altas = filter v where preco >= 500\npoucas = filter altas where quantidade < 5\n'
+     'ana = filter poucas where vendedor == "Ana"\ndisplay ana\ndisplay altas', [1, 2]),
+    # Um select entre os filters interrompe a cadeia
+    ('altas = filter v where preco >= 500\nnomes = select altas (preco, vendedor)\n'
+     'ana = filter nomes where vendedor == "Ana"\ndisplay ana', [1, 1]),
+    # Reatribuída pelo filter seguinte, a variável não é lida depois
+    ('v = filter v where preco >= 500\nv = filter v where quantidade < 5\ndisplay v', [2]),
+    # O filter seguinte compara com uma variável: não continua a cadeia
+    ('altas = filter v where preco >= 500\nana = filter altas where preco > v\ndisplay ana', [1, 1]),
+])
+def test_so_filters_lidos_apenas_pelo_seguinte_sao_adiados(vendas, executar, filtros, source, cadeias):
+
+    executar(f'v = load "{vendas}"\n' + source)
+    assert [len(predicates) for predicates in filtros] == cadeias
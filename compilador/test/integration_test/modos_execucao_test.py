@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from coffee_interpreter import DatasetOperations
+
+# Opções do CoffeeInterpreter de cada modo de execução
+MODOS = {
+    'imediata': {},
+    'imediata sem pushdown': {'pushdown': False},
+    'imediata sem fusão': {'fusion': False},
+    'lazy': {'lazy': True},
+    'lazy sem pushdown': {'lazy': True, 'pushdown': False},
+    'lazy sem fusão': {'lazy': True, 'pushdown': False, 'fusion': False},
+}
+
+# Programas que devem ter o mesmo resultado, mensagem de erro e saída em
+# todos os modos; `{vendas}` é o caminho do CSV da fixture
+PROGRAMAS = [
+    pytest.param('''dados = load "{vendas}"
+caros = filter dados where preco > 100
+nomes = select caros (produto, preco)
+ana = filter dados where vendedor == "Ana"
+display nomes
+display ana
+display nomes
+''', id='plano-compartilhado'),
+    pytest.param('''dados = load "{vendas}"
+x = select dados (inexistente)
+display x
+''', id='coluna-inexistente-no-select'),
+    pytest.param('''dados = load "{vendas}"
+limite = load "{vendas}"
+caros = filter dados where preco > limite
+display caros
+''', id='variavel-na-condicao'),
+    pytest.param('''dados = load "{vendas}"
+caros = filter dados where preco > 100
+nomes = select caros (produto, quantidade)
+display nomes
+''', id='colunas-lidas-pelo-load'),
+    pytest.param('''dados = load "{vendas}"
+x = select dados (produto, inexistente)
+display x
+''', id='coluna-inexistente-com-pushdown'),
+    *(pytest.param(f'''dados = load "{{vendas}}"
+altas = filter dados where {condicao}
+nomes = select altas (produto, preco)
+display nomes
+''', id=f'filtro-na-leitura: {condicao}')
+      for condicao in ('preco >= 500', 'preco < 100', 'vendedor == "Ana"', 'vendedor != "Ana"',
+                       'preco > 99999')),
+    pytest.param('''dados = load "{vendas}"
+altas = filter dados where preco >= 500
+display altas
+display dados
+''', id='scan-compartilhado'),
+    pytest.param('''dados = load "{vendas}"
+altas = filter dados where total >= 500
+display altas
+''', id='coluna-inexistente-no-filter'),
+    pytest.param('''dados = load "{vendas}"
+altas = filter dados where preco >= 500
+poucas = filter altas where quantidade < 5
+ana = filter poucas where vendedor != "Carlos"
+display ana
+''', id='cadeia-de-filtros'),
+    pytest.param('''dados = load "{vendas}"
+altas = filter dados where preco >= 500
+poucas = filter altas where quantidade < 5
+ana = filter poucas where vendedor == "Ana"
+display ana
+display altas
+''', id='intermediario-compartilhado'),
+    pytest.param('''dados = load "{vendas}"
+altas = filter dados where preco >= 500
+erro = filter altas where total < 5
+ana = filter erro where vendedor == "Ana"
+display ana
+''', id='coluna-inexistente-no-meio-da-cadeia'),
+]
+
+
+@pytest.mark.parametrize('programa', PROGRAMAS)
+def test_mesmo_resultado_em_todos_os_modos(vendas, executar, monkeypatch, programa):
+
+    # Blocos pequenos para que a leitura em blocos atravesse vários deles
+    monkeypatch.setattr(DatasetOperations, 'CSV_CHUNK_ROWS', 2)
+    source = programa.format(vendas=vendas)
+    resultados = {}
+    for modo, options in MODOS.items():
+        result, output = executar(source, **options)
+        resultados[modo] = (result['success'], result.get('error'), output)
+    referencia = resultados['imediata']
+    assert all(resultado == referencia for resultado in resultados.values()), resultados
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from coffee_interpreter import CoffeeInterpreter
+from logical_plan import Filter, Project, Scan
+
+
+@pytest.fixture
+def leituras(espiao):
+    """Caminhos passados a DatasetOperations.load, em ordem"""
+    return espiao('load')
+
+def test_nada_e_executado_sem_display(vendas, executar, leituras):
+
+    interpreter = CoffeeInterpreter(lazy=True)
+    result, _ = executar(f'dados = load "{vendas}"\ncaros = filter dados where preco > 100',
+                         interpreter)
+    assert result['success'] and leituras == []
+    assert result['statistics']['operations_executed'] == 0
+    plan = interpreter.global_env.get('caros').value
+    assert isinstance(plan, Filter) and isinstance(plan.child, Scan)
+    assert result['environment']['caros']['plan'] == \
+        f'Filter(preco > 100)\n  Scan("{vendas}", colunas: preco)'
+
+def test_variavel_na_condicao_so_e_lida_com_o_filter(vendas, executar, leituras):
+
+    source = f'''dados = load "{vendas}"
+limite = load "{vendas}"
+caros = filter dados where preco > limite
+'''
+    result, _ = executar(source, lazy=True)
+    assert result['success'] and leituras == []
+
+def test_subplano_compartilhado_e_calculado_uma_vez(vendas, executar, leituras):
+
+    interpreter = CoffeeInterpreter(lazy=True)
+    result, _ = executar(f'''dados = load "{vendas}"
+caros = filter dados where preco > 100
+nomes = select dados (produto)
+morta = select caros (produto)
+display caros
+display nomes
+''', interpreter)
+    assert result['success']
+    assert leituras == [f'"{vendas}"']
+    # Scan, Filter e Project: `morta` nunca é executada
+    assert result['statistics']['operations_executed'] == 3
+    assert isinstance(interpreter.global_env.get('morta').value, Project)
+    # Depois do último consumidor nada fica guardado no executor
+    assert interpreter.executor.cache == {}
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from coffee_interpreter import DatasetOperations
+
+
+@pytest.fixture(autouse=True)
+def blocos_pequenos(monkeypatch):
+    # Blocos pequenos para que o filtro atravesse vários deles
+    monkeypatch.setattr(DatasetOperations, 'CSV_CHUNK_ROWS', 2)
+
+@pytest.fixture
+def blocos(espiao):
+    """Arquivos lidos em blocos por DatasetOperations.load_csv_chunks"""
+    return espiao('load_csv_chunks')
+
+def test_filtro_aplicado_na_leitura(vendas, executar, blocos):
+
+    source = f'''vendas = load "{vendas}"
+altas = filter vendas where preco >= 500
+nomes = select altas (produto, preco)
+display nomes
+'''
+    result, _ = executar(source, lazy=True)
+    assert result['success'] and blocos == [f'"{vendas}"']
+
+def test_scan_compartilhado_nao_recebe_o_filtro(vendas, executar, blocos):
+
+    source = f'''vendas = load "{vendas}"
+altas = filter vendas where preco >= 500
+display altas
+display vendas
+'''
+    result, _ = executar(source, lazy=True)
+    assert result['success'] and blocos == []
+    assert result['statistics']['datasets_loaded'] == 1
+
+def test_sem_pushdown_le_o_arquivo_inteiro(vendas, executar, blocos):
+
+    source = f'vendas = load "{vendas}"\naltas = filter vendas where preco >= 500\ndisplay altas'
+    result, _ = executar(source, lazy=True, pushdown=False)
+    assert result['success'] and blocos == []
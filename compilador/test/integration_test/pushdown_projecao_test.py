@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser
+from fast_lexer import create_lexer
+from query_planner import required_columns
+
+
+def colunas_por_load(source):
+    ast = Parser(create_lexer(source)).parse()
+    columns = required_columns(ast)
+    return {statement.identifier: set(columns[statement.expression])
+            for statement in ast.statements
+            if getattr(statement, 'expression', None) in columns}
+
+def test_colunas_usadas_por_load():
+
+    assert colunas_por_load('''dados = load "a.csv"
+caros = filter dados where preco > 100
+nomes = select caros (produto)
+outros = load "b.csv"
+todos = filter outros where preco > 1
+morto = load "c.csv"
+display nomes
+display todos
+''') == {'dados': {'preco', 'produto'}}
+
+def test_comando_morto_tambem_conta():
+
+    assert colunas_por_load('''dados = load "a.csv"
+morto = select dados (vendedor)
+nomes = select dados (produto)
+display nomes
+''') == {'dados': {'produto', 'vendedor'}}
+
+def test_load_le_so_as_colunas_usadas(vendas, executar):
+
+    result, _ = executar(f'''dados = load "{vendas}"
+caros = filter dados where preco > 100
+nomes = select caros (produto, quantidade)
+display nomes
+''')
+    assert result['success']
+    # Ordem das colunas do arquivo
+    assert result['environment']['dados']['columns'] == ['produto', 'quantidade', 'preco']
+
+def test_coluna_inexistente_lista_todas_as_colunas_do_arquivo(vendas, executar):
+
+    result, _ = executar(f'dados = load "{vendas}"\nx = select dados (produto, inexistente)\ndisplay x')
+    assert not result['success']
+    assert 'quantidade, preco, vendedor' in result['error']
@@ -0,0 +1,27 @@
+
+import pytest
+from lib.lexer.afds.afd_identificador import AfdIdentificador
+from lib.lexer.token import TokenType
+
+
+@pytest.fixture
+def afd_identificador():
+    return AfdIdentificador()
+
+def test_reconhece_identificador_simples(afd_identificador):
+    
+    token = afd_identificador.process("vendas", 0)
+    assert token is not None
+    assert token.type == TokenType.IDENTIFIER
+    assert token.lexeme == "vendas"
+
+def test_reconhece_underscore_e_digitos(afd_identificador):
+    
+    token = afd_identificador.process("_dados_2024 = 1", 0)
+    assert token is not None
+    assert token.lexeme == "_dados_2024"
+
+def test_falha_se_comecar_com_digito(afd_identificador):
+    
+    token = afd_identificador.process("1abc", 0)
+    assert token is None
\ No newline at end of file
@@ -0,0 +1,94 @@
+import itertools
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import DFA
+from afn_to_afd import (NFA, convert_nfa_to_dfa, epsilon_closure, minimize_dfa, move,
+                        to_runtime_tables)
+
+
+def nfa_token(nfa, word):
+    """Simula o AFN diretamente (referência para os AFDs gerados)"""
+    states = epsilon_closure(nfa, {nfa.start_state})
+    for symbol in word:
+        states = epsilon_closure(nfa, move(nfa, states, symbol))
+    finals = [s for s in states if s in nfa.final_states]
+    if not finals:
+        return None
+    if not nfa.token_types:
+        return 'ACCEPT'
+    order = list(nfa.token_types)
+    return nfa.token_types[min(finals, key=order.index)]
+
+def dfa_token(dfa, word):
+    state = dfa["start_state"]
+    for symbol in word:
+        state = dfa["transitions"].get((state, symbol))
+        if state is None:
+            return None
+    return dfa["token_types"].get(state) if state in dfa["final_states"] else None
+
+def classic_nfa():
+    """AFN de Thompson para (a|b)*abb"""
+    transitions = {
+        (0, ''): {1, 7}, (1, ''): {2, 4}, (2, 'a'): {3}, (4, 'b'): {5},
+        (3, ''): {6}, (5, ''): {6}, (6, ''): {1, 7},
+        (7, 'a'): {8}, (8, 'b'): {9}, (9, 'b'): {10},
+    }
+    return NFA(set(range(11)), {'a', 'b'}, transitions, 0, {10})
+
+def test_minimizacao_do_exemplo_classico():
+
+    dfa = convert_nfa_to_dfa(classic_nfa())
+    minimized = minimize_dfa(dfa)
+    assert len(dfa["states"]) == 5
+    assert len(minimized["states"]) == 4
+    assert minimized["start_state"] == "S0"
+
+def test_afd_minimo_carrega_no_dfa_do_lexer():
+
+    transitions, accepting_states = to_runtime_tables(minimize_dfa(convert_nfa_to_dfa(classic_nfa())))
+    dfa = DFA(transitions, accepting_states)
+    assert dfa.run("ababb") == (5, 'ACCEPT')
+    # Maior lexema: para no último estado de aceitação
+    assert dfa.run("abbab") == (3, 'ACCEPT')
+
+def test_tipos_de_token_nao_sao_fundidos_e_respeitam_prioridade():
+
+    # "if" é palavra-chave (prioridade maior) e também identificador
+    transitions = {
+        (0, ''): {1, 4},
+        (1, 'i'): {2}, (2, 'f'): {3},
+        (4, 'i'): {5}, (4, 'f'): {5}, (5, 'i'): {5}, (5, 'f'): {5},
+    }
+    nfa = NFA(set(range(6)), {'i', 'f'}, transitions, 0, {3, 5},
+              token_types={3: 'KEYWORD', 5: 'IDENTIFIER'})
+    minimized = minimize_dfa(convert_nfa_to_dfa(nfa))
+    assert dfa_token(minimized, "if") == 'KEYWORD'
+    assert dfa_token(minimized, "iff") == 'IDENTIFIER'
+    assert dfa_token(minimized, "i") == 'IDENTIFIER'
+
+def test_linguagem_preservada_em_afns_aleatorios():
+
+    rng = random.Random(11)
+    for _ in range(200):
+        states = list(range(rng.randint(1, 7)))
+        transitions = {}
+        for _ in range(rng.randint(0, 16)):
+            transitions.setdefault((rng.choice(states), rng.choice('ab')), set()).add(rng.choice(states))
+        for _ in range(rng.randint(0, 4)):
+            transitions.setdefault((rng.choice(states), ''), set()).add(rng.choice(states))
+        finals = set(rng.sample(states, rng.randint(0, len(states))))
+        token_types = {s: rng.choice(['X', 'Y']) for s in finals} if rng.random() < 0.5 else None
+        nfa = NFA(set(states), {'a', 'b'}, transitions, 0, finals, token_types)
+
+        dfa = convert_nfa_to_dfa(nfa)
+        minimized = minimize_dfa(dfa)
+        assert len(minimized["states"]) <= len(dfa["states"])
+        for length in range(6):
+            for word in itertools.product('ab', repeat=length):
+                expected = nfa_token(nfa, word)
+                assert dfa_token(dfa, word) == expected
+                assert dfa_token(minimized, word) == expected
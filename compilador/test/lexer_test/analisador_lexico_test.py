@@ -0,0 +1,67 @@
+
+import random
+
+import pytest
+from lib.lexer.analisador_lexico import AnalisadorLexico, AnalisadorLexicoPorAfd
+from lib.lexer.afd_base import AfdBase
+from lib.lexer.afds.afd_numero import AfdNumero
+from lib.lexer.afds.afd_identificador import AfdIdentificador
+from lib.lexer.token import TokenType
+
+
+@pytest.fixture
+def analisador():
+    return AnalisadorLexico()
+
+def test_tokeniza_expressao(analisador):
+    
+    tokens = analisador.tokenize("preco >= 50.75")
+    assert [(t.type, t.lexeme, t.position) for t in tokens] == [
+        (TokenType.IDENTIFIER, "preco", 0),
+        (TokenType.OPERATOR, ">=", 6),
+        (TokenType.NUMBER, "50.75", 9),
+    ]
+
+def test_correspondencia_maxima(analisador):
+    
+    assert analisador.proximo_token("==1", 0).lexeme == "=="
+    assert analisador.proximo_token("1.2.3", 0).lexeme == "1.2"
+    assert analisador.proximo_token("42.", 0).lexeme == "42"
+
+class AfdLetras(AfdBase):
+    # Só letras; concorre com o AFD de identificador
+    TRANSITIONS = {0: {'letter': 1}, 1: {'letter': 1}}
+    FINAL_STATES = frozenset({1})
+    TOKEN_TYPE = TokenType.OPERATOR
+
+    def _get_char_type(self, char):
+        return 'letter' if char.isalpha() else 'other'
+
+def test_prioridade_em_empate():
+    
+    letras_primeiro = AnalisadorLexico([AfdLetras, AfdIdentificador])
+    assert letras_primeiro.proximo_token("abc", 0).type == TokenType.OPERATOR
+    assert letras_primeiro.proximo_token("ab1", 0).type == TokenType.IDENTIFIER
+    identificador_primeiro = AnalisadorLexico([AfdIdentificador, AfdLetras])
+    assert identificador_primeiro.proximo_token("abc", 0).type == TokenType.IDENTIFIER
+
+def test_automato_montado_uma_vez():
+    
+    assert AnalisadorLexico().automato is AnalisadorLexico().automato
+    assert AnalisadorLexico([AfdNumero]).automato is not AnalisadorLexico.AUTOMATO
+
+def test_caractere_invalido(analisador):
+    
+    with pytest.raises(ValueError, match="Token inválido começando com '@' na posição 6"):
+        analisador.tokenize("valor @ 100")
+
+def test_equivalente_a_um_afd_por_vez(analisador):
+    
+    por_afd = AnalisadorLexicoPorAfd()
+    rng = random.Random(9)
+    for _ in range(300):
+        source = ''.join(rng.choice('ab_Z19.=!<> ç²') for _ in range(rng.randint(1, 20)))
+        for start in range(len(source)):
+            esperado = por_afd.proximo_token(source, start)
+            obtido = analisador.proximo_token(source, start)
+            assert (obtido and (obtido.type, obtido.lexeme)) == (esperado and (esperado.type, esperado.lexeme))
\ No newline at end of file
@@ -0,0 +1,63 @@
+import glob
+import os
+import random
+import sys
+
+import pytest
+
+COMPILADOR_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.append(os.path.join(COMPILADOR_DIR, 'lexer'))
+from parser import DFA, CompiledDFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, TokenType
+
+FIXTURES = sorted(
+    glob.glob(os.path.join(COMPILADOR_DIR, '**', '*.coffee'), recursive=True) +
+    glob.glob(os.path.join(COMPILADOR_DIR, '**', '*.dg'), recursive=True)
+)
+
+
+def token_stream(source, dfa):
+    """Tokeniza por completo, registrando o erro léxico como último item"""
+    lexer = Lexer(source, dfa)
+    stream = []
+    try:
+        while True:
+            token = lexer.next_token()
+            stream.append((token.type, token.value, token.line, token.col))
+            if token.type == TokenType.EOF:
+                return stream
+    except ValueError as e:
+        stream.append(('ERRO', str(e)))
+        return stream
+
+@pytest.fixture(scope="module")
+def engines():
+    return (DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES),
+            CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES))
+
+def test_existem_fixtures():
+
+    assert any(path.endswith('.coffee') for path in FIXTURES)
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_motores_equivalentes_nas_fixtures(path, engines):
+
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    reference, compiled = engines
+    assert token_stream(source, compiled) == token_stream(source, reference)
+
+def test_motores_equivalentes_em_entradas_aleatorias(engines):
+
+    reference, compiled = engines
+    alphabet = 'ab_Z19.",()#<>=! \t\r\nçé²$'
+    rng = random.Random(2025)
+    for _ in range(500):
+        source = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 30)))
+        assert token_stream(source, compiled) == token_stream(source, reference), source
+
+def test_tabela_ascii_tem_128_posicoes(engines):
+
+    _, compiled = engines
+    assert len(compiled.ascii_classes) == 128
+    assert all(len(row) == compiled.num_classes for row in compiled.table)
+    assert compiled.state_names[0] == 'S0'
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import DFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, TokenType
+
+
+@pytest.fixture
+def coffee_dfa():
+    return DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
+
+def tokenize(source, dfa):
+    lexer = Lexer(source, dfa)
+    tokens = []
+    while True:
+        token = lexer.next_token()
+        tokens.append(token)
+        if token.type == TokenType.EOF:
+            return tokens
+
+def test_run_retorna_posicao_final_a_partir_do_offset(coffee_dfa):
+
+    source = 'dados = load "vendas.csv"'
+    assert coffee_dfa.run(source, 0) == (5, TokenType.IDENTIFIER)
+    assert coffee_dfa.run(source, 6) == (7, TokenType.ASSIGN)
+    assert coffee_dfa.run(source, 13) == (len(source), TokenType.STRING)
+
+def test_run_aplica_maior_casamento_com_offset(coffee_dfa):
+
+    source = "x >= 12.5"
+    assert coffee_dfa.run(source, 2) == (4, TokenType.GE)
+    assert coffee_dfa.run(source, 5) == (9, TokenType.NUMBER)
+
+def test_run_reporta_string_nao_fechada(coffee_dfa):
+
+    with pytest.raises(ValueError, match="String não fechada"):
+        coffee_dfa.run('a = "aberta', 4)
+
+def test_lexer_mantem_linha_e_coluna(coffee_dfa):
+
+    tokens = tokenize('dados = load "a.csv"\n# comentario\ndisplay dados', coffee_dfa)
+    display = tokens[4]
+    assert (display.type, display.line, display.col) == (TokenType.DISPLAY, 3, 1)
+    assert (tokens[5].value, tokens[5].line, tokens[5].col) == ('dados', 3, 9)
+    assert tokens[-1].type == TokenType.EOF
+
+def test_lexer_informa_posicao_de_erro(coffee_dfa):
+
+    with pytest.raises(ValueError, match="linha 2, coluna 7"):
+        tokenize('a = load "x.csv"\ntotal $ 2', coffee_dfa)
+
+def test_palavras_chave_reconhecidas_pelo_afd(coffee_dfa):
+
+    assert coffee_dfa.run('display x', 0) == (7, TokenType.DISPLAY)
+    assert coffee_dfa.run('displayx', 0) == (8, TokenType.IDENTIFIER)
+    assert coffee_dfa.run('disp', 0) == (4, TokenType.IDENTIFIER)
+    assert coffee_dfa.run('Load', 0) == (4, TokenType.IDENTIFIER)
+
+def test_identificadores_sao_internados(coffee_dfa):
+
+    source = ''.join(['ven', 'das = load "a.csv"\ndisplay ', 'vendas'])
+    tokens = tokenize(source, coffee_dfa)
+    assert tokens[0].value is tokens[-2].value
@@ -0,0 +1,73 @@
+import glob
+import os
+import random
+import re
+import sys
+
+import pytest
+
+COMPILADOR_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.append(os.path.join(COMPILADOR_DIR, 'lexer'))
+from parser import CompiledDFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, Parser, TokenType
+from fast_lexer import FastLexer, build_master_regex, create_lexer
+
+FIXTURES = sorted(
+    glob.glob(os.path.join(COMPILADOR_DIR, '**', '*.coffee'), recursive=True) +
+    glob.glob(os.path.join(COMPILADOR_DIR, '**', '*.dg'), recursive=True)
+)
+
+
+def token_stream(lexer):
+    stream = []
+    try:
+        while True:
+            token = lexer.next_token()
+            stream.append((token.type, token.value, token.line, token.col))
+            if token.type == TokenType.EOF:
+                return stream
+    except ValueError as e:
+        stream.append(('ERRO', str(e)))
+        return stream
+
+def assert_mesmos_tokens(source):
+    reference = Lexer(source, CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES))
+    assert token_stream(FastLexer(source)) == token_stream(reference), repr(source)
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_fast_lexer_equivalente_nas_fixtures(path):
+
+    with open(path, encoding='utf-8') as f:
+        assert_mesmos_tokens(f.read())
+
+def test_fast_lexer_equivalente_em_entradas_aleatorias():
+
+    alphabet = 'ab_Z19.",()#<>=! \t\r\n$'
+    rng = random.Random(7)
+    for _ in range(500):
+        assert_mesmos_tokens(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 30))))
+
+@pytest.mark.parametrize("source", [
+    'cidade == "São Paulo"  # ação',
+    'ação = load "x.csv"',
+    'x = 12.٣',
+    'n²',
+    'x = €',
+])
+def test_fast_lexer_equivalente_com_unicode(source):
+
+    assert_mesmos_tokens(source)
+
+def test_regex_mestre_tem_um_grupo_por_estado_de_aceitacao():
+
+    pattern, group_types = build_master_regex()
+    re.compile(pattern)
+    # Os estados das palavras-chave voltam a S1_ID, que aparece em mais de um ramo
+    assert {name.split('_', 1)[1] for name in group_types} == set(DFA_ACCEPTING_STATES)
+    assert set(group_types.values()) == set(DFA_ACCEPTING_STATES.values())
+
+def test_create_lexer_seleciona_motor():
+
+    assert isinstance(create_lexer("a = 1", fast=True), FastLexer)
+    assert not isinstance(create_lexer("a = 1"), FastLexer)
+    ast = Parser(create_lexer('d = load "a.csv"\ndisplay d', fast=True)).parse()
+    assert len(ast.statements) == 2
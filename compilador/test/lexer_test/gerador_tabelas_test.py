@@ -0,0 +1,62 @@
+import os
+import random
+import sys
+import types
+
+import pytest
+
+COMPILADOR_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.append(os.path.join(COMPILADOR_DIR, 'lexer'))
+sys.path.append(os.path.join(COMPILADOR_DIR, 'tools'))
+from parser import DFA, CompiledDFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, TokenType
+from fast_lexer import create_lexer, precompiled_dfa
+from gerador_tabelas import DEFAULT_OUTPUT, build_tables, definitions_hash, render_module
+import tabelas_lexicas
+
+
+def token_stream(source, dfa):
+    lexer = Lexer(source, dfa)
+    stream = []
+    try:
+        while True:
+            token = lexer.next_token()
+            stream.append((token.type, token.value, token.line, token.col))
+            if token.type == TokenType.EOF:
+                return stream
+    except ValueError as e:
+        stream.append(('ERRO', str(e)))
+        return stream
+
+def test_modulo_gerado_esta_atualizado():
+
+    with open(DEFAULT_OUTPUT, encoding='utf-8') as f:
+        assert f.read() == render_module(build_tables())
+    assert tabelas_lexicas.TABLES_HASH == definitions_hash()
+
+def test_hash_muda_com_as_definicoes():
+
+    assert definitions_hash((('NUMBER', '{digito}+'),)) != definitions_hash()
+
+def test_tabelas_equivalentes_ao_afd_da_especificacao():
+
+    reference = DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
+    generated = precompiled_dfa()
+    alphabet = 'ab_Z19.",()#<>=! \t\r\nçé²$'
+    rng = random.Random(8)
+    for _ in range(1000):
+        source = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 30)))
+        assert token_stream(source, generated) == token_stream(source, reference), repr(source)
+
+def test_string_nao_fechada_nas_tabelas_geradas():
+
+    lexer = create_lexer('x = "abc')
+    with pytest.raises(ValueError, match="String não fechada na linha 1, coluna 5"):
+        while lexer.next_token().type != TokenType.EOF:
+            pass
+
+def test_formato_incompativel_e_rejeitado():
+
+    tables = types.SimpleNamespace(**vars(tabelas_lexicas))
+    tables.TABLE_FORMAT = CompiledDFA.TABLE_FORMAT + 1
+    with pytest.raises(ValueError, match="gerador_tabelas"):
+        CompiledDFA.from_tables(tables)
@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from token_buffer import tokenize_all
+from incremental_lexer import IncrementalLexer, relex
+
+PROGRAMA = '''dados = load "vendas.csv"
+caros = filter dados where preco >= 100
+resumo = select caros (produto, preco)
+display resumo
+'''
+
+
+def columns(buffer):
+    return (list(buffer.types), list(buffer.starts), list(buffer.lengths),
+            list(buffer.lines), list(buffer.cols))
+
+def test_edicao_no_meio_revarre_poucos_tokens():
+
+    offset = PROGRAMA.index('100')
+    buffer, change = relex(tokenize_all(PROGRAMA), offset, 3, '2500.75')
+    assert columns(buffer) == columns(tokenize_all(buffer.source))
+    assert buffer.value(change.first + 1) == '2500.75'
+    assert change.new_stop - change.first <= 3
+
+def test_insercao_de_linha_desloca_tokens_seguintes():
+
+    buffer, change = relex(tokenize_all(PROGRAMA), 0, 0, '# cabeçalho\n')
+    assert columns(buffer) == columns(tokenize_all(buffer.source))
+    assert buffer[change.new_stop].line == 2
+
+def test_edicao_que_cria_comentario_nao_sincroniza_cedo():
+
+    offset = PROGRAMA.index('where')
+    buffer, _ = relex(tokenize_all(PROGRAMA), offset, 0, '# ')
+    assert columns(buffer) == columns(tokenize_all(buffer.source))
+
+def test_edicao_com_erro_lexico_propaga_a_mensagem():
+
+    with pytest.raises(ValueError, match="linha 2"):
+        relex(tokenize_all(PROGRAMA), PROGRAMA.index('preco'), 0, '$')
+
+def test_edicoes_aleatorias_equivalem_a_tokenizacao_completa():
+
+    alphabet = 'ab_19.",()#<>= \n'
+    rng = random.Random(11)
+    checked = 0
+    while checked < 300:
+        source = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        offset = rng.randint(0, len(source))
+        deleted = rng.randint(0, len(source) - offset)
+        inserted = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+        edited = source[:offset] + inserted + source[offset + deleted:]
+        try:
+            expected = tokenize_all(edited)
+            original = tokenize_all(source)
+        except ValueError:
+            continue
+        buffer, _ = relex(original, offset, deleted, inserted)
+        assert columns(buffer) == columns(expected), (source, offset, deleted, inserted)
+        checked += 1
+
+def test_incremental_lexer_acumula_edicoes():
+
+    lexer = IncrementalLexer(PROGRAMA)
+    for i, char in enumerate('novos'):
+        lexer.edit(i, 0, char)
+    assert lexer.buffer.value(0) == 'novosdados'
+    assert columns(lexer.buffer) == columns(tokenize_all(lexer.source))
@@ -0,0 +1,126 @@
+import io
+import os
+import random
+import sys
+
+import pytest
+from lib.utils.source_location import SourceMap
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser, TokenType
+from fast_lexer import create_lexer
+from token_buffer import tokenize_all
+from semantic_analyzer import SemanticAnalyzer
+
+PROGRAMA = 'dados = load "a.csv"\n\n  # comentário\nx = select dados (a, b)\r\ndisplay x'
+
+
+def posicoes_contando(text):
+    """(linha, coluna) de cada offset, contando '\\n' um a um"""
+    result = []
+    line, col = 1, 1
+    for char in text + ' ':
+        result.append((line, col))
+        if char == '\n':
+            line, col = line + 1, 1
+        else:
+            col += 1
+    return result
+
+def test_offset_para_linha_e_coluna():
+
+    source_map = SourceMap(PROGRAMA)
+    assert [source_map.line_col(offset) for offset in range(len(PROGRAMA) + 1)] == \
+        posicoes_contando(PROGRAMA)
+    assert source_map.line_count == 5
+    assert source_map.offset(4, 5) == PROGRAMA.index('select')
+
+def test_texto_e_trecho_da_linha():
+
+    source_map = SourceMap(PROGRAMA)
+    assert source_map.line_text(2) == ''
+    assert source_map.line_text(5) == 'display x'
+    assert source_map.excerpt(4, 5).split('\n') == [
+        '    4 | x = select dados (a, b)\r',
+        '      |     ^']
+    with pytest.raises(ValueError):
+        source_map.line_text(6)
+
+def test_extend_em_blocos_equivale_ao_texto_inteiro():
+
+    source_map = SourceMap(keep_text=False)
+    for start in range(0, len(PROGRAMA), 7):
+        source_map.extend(PROGRAMA[start:start + 7])
+    assert source_map.line_starts == SourceMap(PROGRAMA).line_starts
+    with pytest.raises(ValueError):
+        source_map.line_text(1)
+
+def test_linhas_descartadas_na_leitura_em_blocos():
+
+    full = SourceMap(PROGRAMA)
+    source_map = SourceMap(PROGRAMA)
+    offset = PROGRAMA.index('select')
+    source_map.discard_before(offset)
+    assert source_map.first_line == 4 and source_map.line_count == full.line_count
+    for position in range(PROGRAMA.index('x ='), len(PROGRAMA)):
+        assert source_map.line_col(position) == full.line_col(position)
+    assert source_map.line_text(5) == 'display x'
+    with pytest.raises(ValueError):
+        source_map.line_col(0)
+
+def test_offsets_de_streams_maiores_que_4_gib():
+
+    # Offsets do StreamLexer são globais ao stream
+    base = 5 << 30
+    source_map = SourceMap(keep_text=False)
+    source_map.length = base
+    source_map.extend('ab\ncd')
+    source_map.discard_before(base)
+    assert source_map.line_col(base + 4) == (2, 2)
+    assert source_map.edited(base, 0, '\n').line_col(base + 5) == (3, 2)
+
+def test_edicao_recalcula_as_linhas():
+
+    rng = random.Random(7)
+    text = PROGRAMA
+    source_map = SourceMap(text)
+    for _ in range(200):
+        offset = rng.randrange(len(text) + 1)
+        deleted = rng.randrange(min(5, len(text) - offset) + 1)
+        inserted = rng.choice(['', 'x', '\n', 'a\nb', '\n\n', 'display y\n'])
+        source_map = source_map.edited(offset, deleted, inserted)
+        text = text[:offset] + inserted + text[offset + deleted:]
+        assert source_map.text == text
+        assert source_map.line_starts == SourceMap(text).line_starts
+
+def test_tokens_guardam_so_o_offset():
+
+    for lexer in (create_lexer(PROGRAMA), create_lexer(PROGRAMA, fast=True),
+                  create_lexer(io.StringIO(PROGRAMA)), tokenize_all(PROGRAMA).cursor()):
+        token = lexer.next_token()
+        while token.type != TokenType.SELECT:
+            token = lexer.next_token()
+        assert not hasattr(token, '__dict__')
+        assert token.offset == PROGRAMA.index('select')
+        assert token.position == (token.line, token.col) == (4, 5)
+
+def test_stream_em_blocos_pequenos_mantem_offsets_globais():
+
+    lexer = create_lexer(io.StringIO(PROGRAMA))
+    lexer.chunk_size = 3
+    tokens = []
+    while (token := lexer.next_token()).type != TokenType.EOF:
+        tokens.append((token.offset, token.position))
+    reference = create_lexer(PROGRAMA)
+    expected = []
+    while (token := reference.next_token()).type != TokenType.EOF:
+        expected.append((token.offset, token.position))
+    assert tokens == expected
+
+def test_erro_semantico_tem_posicao():
+
+    ast = Parser(create_lexer('a = load "a.csv"\n  b = filter c where x > 1\ndisplay a')).parse()
+    success, errors, _ = SemanticAnalyzer().analyze(ast)
+    assert not success
+    assert (errors[0].line, errors[0].col) == (2, 7)
+    assert str(errors[0]).endswith("na linha 2, coluna 7")
@@ -0,0 +1,91 @@
+import io
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import DFA, CompiledDFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, Parser, StreamLexer, TokenType
+from fast_lexer import create_lexer
+
+
+def token_stream(lexer):
+    stream = []
+    try:
+        while True:
+            token = lexer.next_token()
+            stream.append((token.type, token.value, token.line, token.col))
+            if token.type == TokenType.EOF:
+                return stream
+    except ValueError as e:
+        stream.append(('ERRO', str(e)))
+        return stream
+
+def assert_mesmos_tokens(source, chunk_size):
+    for dfa in (DFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES),
+                CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)):
+        expected = token_stream(Lexer(source, dfa))
+        streamed = token_stream(StreamLexer(io.StringIO(source), dfa, chunk_size=chunk_size))
+        assert streamed == expected, (repr(source), chunk_size)
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_stream_equivalente_em_entradas_aleatorias(chunk_size):
+
+    alphabet = 'ab_Z19.",()#<>=! \t\r\nçé$'
+    rng = random.Random(chunk_size)
+    for _ in range(200):
+        source = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        assert_mesmos_tokens(source, chunk_size)
+
+@pytest.mark.parametrize("source", [
+    'x = "' + 'longa string ' * 50 + '"\ndisplay x',
+    '# ' + 'comentario ' * 50 + '\ndisplay x',
+    'v = 123456789.987654321',
+    'x = "sem fim',
+    'a >= 1\n\n\tb != 2 $',
+])
+def test_tokens_atravessam_blocos(source):
+
+    assert_mesmos_tokens(source, 4)
+
+def test_buffer_limitado_ao_tamanho_do_bloco():
+
+    source = 'vendas = load "dados.csv"\ndisplay vendas\n' * 2000
+    lexer = StreamLexer(io.StringIO(source), CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES),
+                        chunk_size=256)
+    largest = 0
+    while lexer.next_token().type != TokenType.EOF:
+        largest = max(largest, len(lexer.source))
+    assert largest <= 256 + len('vendas = load "dados.csv"')
+
+def test_mapa_de_linhas_limitado_ao_buffer():
+
+    source = 'vendas = load "dados.csv"\ndisplay vendas\n' * 2000
+    lexer = StreamLexer(io.StringIO(source), CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES),
+                        chunk_size=256)
+    largest = 0
+    while (token := lexer.next_token()).type != TokenType.EOF:
+        largest = max(largest, len(lexer.source_map.line_starts))
+    assert largest <= 256 // len('display vendas\n') + 2
+    assert token.position == (4001, 1) and lexer.source_map.line_count == 4001
+
+def test_posicoes_da_ast_com_blocos_pequenos():
+
+    # O select é construído depois de lida a lista de colunas, vários blocos adiante
+    columns = ',\n'.join(f'c{i}' for i in range(50))
+    source = f'dados = load "a.csv"\nx = select dados (\n{columns})\ndisplay x'
+    def posicoes(lexer):
+        program = Parser(lexer).parse()
+        return [(node.line, node.col) for statement in program.statements
+                for node in (statement, getattr(statement, 'expression', statement))]
+    dfa = CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES)
+    assert posicoes(StreamLexer(io.StringIO(source), dfa, chunk_size=4)) == posicoes(Lexer(source, dfa))
+
+def test_create_lexer_aceita_stream():
+
+    code = 'd = load "a.csv"\ndisplay d'
+    assert isinstance(create_lexer(io.StringIO(code)), StreamLexer)
+    for fast in (False, True):
+        ast = Parser(create_lexer(io.StringIO(code), fast=fast)).parse()
+        assert len(ast.statements) == 2
@@ -0,0 +1,88 @@
+import glob
+import os
+import re
+import sys
+
+import pytest
+
+COMPILADOR_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.append(os.path.join(COMPILADOR_DIR, 'lexer'))
+from parser import CompiledDFA, DFA_TRANSITIONS, DFA_ACCEPTING_STATES, Lexer, Parser, TokenType
+from token_buffer import TOKEN_TYPES, TokenBuffer, tokenize_all
+
+FIXTURES = sorted(glob.glob(os.path.join(COMPILADOR_DIR, '**', '*.coffee'), recursive=True))
+
+PROGRAMA = '''dados = load "vendas.csv"
+# comentario
+caros = filter dados where preco >= 100.5
+resumo = select caros (produto, preco)
+display resumo
+'''
+
+
+def lexer_tokens(source):
+    lexer = Lexer(source, CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES))
+    tokens = []
+    while True:
+        token = lexer.next_token()
+        tokens.append((token.type, token.value, token.line, token.col))
+        if token.type == TokenType.EOF:
+            return tokens
+
+def as_tuples(buffer):
+    return [(t.type, t.value, t.line, t.col) for t in buffer]
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_buffer_equivale_ao_lexer(fast):
+
+    assert as_tuples(tokenize_all(PROGRAMA, fast=fast)) == lexer_tokens(PROGRAMA)
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_buffer_equivale_ao_lexer_nas_fixtures(path):
+
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    try:
+        expected = lexer_tokens(source)
+    except ValueError as e:
+        with pytest.raises(ValueError, match=re.escape(str(e))):
+            tokenize_all(source)
+        return
+    assert as_tuples(tokenize_all(source)) == expected
+
+def test_colunas_compactas():
+
+    buffer = tokenize_all(PROGRAMA)
+    assert len(buffer.types) == len(buffer.starts) == len(buffer.lines) == len(buffer)
+    assert buffer.type_name(0) == 'IDENTIFIER'
+    assert buffer.value(0) == 'dados'
+    assert TOKEN_TYPES[buffer.types[-1]] == 'EOF'
+    assert buffer[-1].value is None
+
+def test_parser_le_buffer_por_indice(monkeypatch):
+
+    from_lexer = Parser(Lexer(PROGRAMA, CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES))).parse()
+    # Sem erro de sintaxe, nenhum Token é criado a partir do buffer
+    monkeypatch.setattr(TokenBuffer, '__getitem__', lambda self, index: pytest.fail("Token criado"))
+    from_buffer = Parser(tokenize_all(PROGRAMA)).parse()
+    assert repr(from_buffer) == repr(from_lexer)
+    assert [(s.line, s.col) for s in from_buffer.statements] == \
+        [(s.line, s.col) for s in from_lexer.statements]
+    assert from_buffer.statements[0].identifier is from_lexer.statements[0].identifier
+
+@pytest.mark.parametrize('source', ['a = load 1', 'a = filter b where x', 'display a b', 'a = select b (c,)'])
+def test_erros_do_buffer_iguais_aos_do_lexer(source):
+
+    mensagens = []
+    for lexer in (tokenize_all(source), Lexer(source, CompiledDFA(DFA_TRANSITIONS, DFA_ACCEPTING_STATES))):
+        with pytest.raises(SyntaxError) as erro:
+            Parser(lexer).parse()
+        mensagens.append(str(erro.value))
+    assert mensagens[0] == mensagens[1]
+
+def test_cursor_repete_eof():
+
+    cursor = tokenize_all("a").cursor()
+    assert cursor.next_token().type == TokenType.IDENTIFIER
+    assert cursor.next_token().type == TokenType.EOF
+    assert cursor.next_token().type == TokenType.EOF
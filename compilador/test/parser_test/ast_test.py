@@ -0,0 +1,105 @@
+import os
+import sys
+
+import pytest
+from lib.parser.descendente.parser_ll1 import ParserLL1
+from lib.parser.ascendente.parser_lr import ParserLR
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser, SelectExpressionNode, TermNode
+from fast_lexer import create_lexer
+from flat_ast import FlatAST, ASSIGNMENT, FILTER, RELATIONAL, TERM_NUMBER
+
+PROGRAMA = '''dados = load "vendas.csv"
+  grandes = filter dados where valor >= 100.5
+nomes = select grandes (cliente, valor)
+display nomes
+'''
+
+
+def posicoes(node):
+    """Lista (tipo, linha, coluna) de todos os nós, em pré-ordem"""
+    result = [(type(node).__name__, node.line, node.col)]
+    for name in ('statements',):
+        for child in getattr(node, name, ()):
+            result.extend(posicoes(child))
+    for name in ('expression', 'condition', 'left', 'right'):
+        child = getattr(node, name, None)
+        if child is not None:
+            result.extend(posicoes(child))
+    return result
+
+def test_nos_guardam_a_posicao_do_token():
+
+    ast = Parser(create_lexer(PROGRAMA)).parse()
+    load, filtro, select, display = ast.statements
+    assert (load.line, load.col) == (1, 1)
+    assert (load.expression.line, load.expression.col) == (1, 9)
+    assert (filtro.line, filtro.col) == (2, 3)
+    condition = filtro.expression.condition
+    assert (condition.line, condition.col) == (condition.left.line, condition.left.col) == (2, 32)
+    assert (condition.right.line, condition.right.col) == (2, 41)
+    assert (select.expression.line, select.expression.col) == (3, 9)
+    assert (display.line, display.col) == (4, 1)
+
+def test_mesmas_posicoes_nos_tres_parsers():
+
+    reference = posicoes(Parser(create_lexer(PROGRAMA)).parse())
+    assert posicoes(ParserLL1(create_lexer(PROGRAMA)).parse()) == reference
+    assert posicoes(ParserLR(create_lexer(PROGRAMA)).parse()) == reference
+
+def test_nos_sao_imutaveis_e_sem_dict():
+
+    term = TermNode('x', 'IDENTIFIER', 1, 5)
+    with pytest.raises(AttributeError):
+        term.value = 'y'
+    with pytest.raises(AttributeError):
+        term.extra = 1
+    with pytest.raises(AttributeError):
+        del term.type
+    assert not hasattr(term, '__dict__')
+    assert (term.value, term.type, term.line, term.col) == ('x', 'IDENTIFIER', 1, 5)
+
+def test_sequencias_dos_nos_sao_tuplas():
+
+    columns = ['cliente', 'valor']
+    ast = Parser(create_lexer(PROGRAMA)).parse()
+    select = SelectExpressionNode('grandes', columns)
+    columns.append('extra')
+    assert select.columns == ('cliente', 'valor')
+    assert isinstance(ast.statements, tuple)
+    assert ast.statements[2].expression.columns == ('cliente', 'valor')
+    assert repr(select) == "Select(grandes, ['cliente', 'valor'])"
+
+def test_posicao_e_opcional():
+
+    term = TermNode('1', 'NUMBER')
+    assert term.line is None and term.col is None
+
+def test_ast_plana_reconstroi_a_mesma_arvore():
+
+    ast = Parser(create_lexer(PROGRAMA)).parse()
+    flat = FlatAST.from_ast(ast)
+    assert len(flat) == len(posicoes(ast))
+    rebuilt = flat.to_ast()
+    assert repr(rebuilt) == repr(ast)
+    assert posicoes(rebuilt) == posicoes(ast)
+
+def test_ast_plana_filhos_em_faixas_contiguas():
+
+    flat = FlatAST.from_ast(Parser(create_lexer(PROGRAMA)).parse())
+    assert [flat.kind_name(i) for i in flat.children(0)] == ['Assignment'] * 3 + ['Display']
+    filtro, = flat.find(FILTER)
+    relational, = flat.children(filtro)
+    assert flat.kinds[relational] == RELATIONAL
+    assert [flat.payload[i] for i in flat.children(relational)] == ['valor', '100.5']
+    assert flat.find(TERM_NUMBER) == [flat.children(relational)[1]]
+    assert flat.position(filtro) == (2, 13)
+    assert flat.find(ASSIGNMENT) == [1, 2, 3]
+
+def test_ast_plana_sem_posicoes():
+
+    ast = Parser(create_lexer('display x')).parse()
+    flat = FlatAST.from_ast(type(ast)(ast.statements))
+    assert flat.position(0) == (None, None)
+    assert flat.position(1) == (1, 1)
@@ -0,0 +1,115 @@
+import glob
+import os
+import random
+import sys
+
+import pytest
+
+LEXER_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'lexer')
+sys.path.append(LEXER_DIR)
+from parser import Parser
+from fast_lexer import create_lexer
+from flat_ast import FlatAST
+from semantic_analyzer import SemanticAnalyzer
+from skeleton_parser import (LazyAssignmentStatementNode, SkeletonParser, parse_skeleton,
+                             statement_dependencies)
+
+PROGRAMA = '''# dependências
+dados = load "vendas.csv"
+  grandes = filter dados where valor >= 100.5   # comentário
+nomes = select grandes (cliente, valor)
+display nomes
+'''
+
+
+def parse_completo(source):
+    try:
+        return repr(Parser(create_lexer(source, fast=True)).parse())
+    except (SyntaxError, ValueError) as error:
+        return type(error), str(error)
+
+def parse_esqueleto(source):
+    try:
+        return repr(parse_skeleton(source))
+    except (SyntaxError, ValueError) as error:
+        return type(error), str(error)
+
+@pytest.mark.parametrize('source', [
+    PROGRAMA,
+    '',
+    '  \n# só comentário',
+    'x = filter d where "a b"==limite\ny=select x(a)',
+    'preço = load "a.csv"\ndisplay preço',
+    'a = filter b where 1abc > 2',
+    'a = load "x" display a',
+    'display',
+    'a = select b (c,)',
+    'a = filter b where c = 1',
+    'a = load "sem fim',
+    'dados = load "a.csv"\ndisplay # dados\n',
+    'display # c\n >= x',
+    'a = filter b where c > # 1\n',
+    'a = select b (c, # d)\n)',
+])
+def test_mesma_ast_e_mesmos_erros_do_parser(source):
+
+    assert parse_esqueleto(source) == parse_completo(source)
+
+def test_comentarios_em_qualquer_posicao():
+
+    # Comentários onde o Parser espera um token: a regex não pode lê-los como código
+    pieces = ['display', 'a', 'b', 'c', '=', 'load', 'filter', 'select', 'where', '>=', '>',
+              '==', '(', ')', ',', '"x.csv"', '10', '\n', ' ', '# c', '# a = load "y"', '#display b']
+    rng = random.Random(19)
+    for _ in range(3000):
+        source = ' '.join(rng.choice(pieces) for _ in range(rng.randint(1, 12)))
+        assert parse_esqueleto(source) == parse_completo(source), source
+
+def test_exemplos_do_repositorio():
+
+    for path in glob.glob(os.path.join(LEXER_DIR, '*.coffee')):
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        assert parse_esqueleto(source) == parse_completo(source), path
+
+def test_expressao_construida_no_primeiro_acesso():
+
+    program = parse_skeleton(PROGRAMA)
+    lazy = [s for s in program.statements if isinstance(s, LazyAssignmentStatementNode)]
+    assert len(lazy) == 3
+    assert not any(statement.is_expanded for statement in lazy)
+    condition = lazy[1].expression.condition
+    assert (condition.operator, condition.right.value) == ('>=', '100.5')
+    assert [statement.is_expanded for statement in lazy] == [False, True, False]
+    assert lazy[1].expression is lazy[1].expression
+
+def test_dependencias_sem_expandir():
+
+    program = parse_skeleton(PROGRAMA)
+    assert [statement_dependencies(s) for s in program.statements] == [
+        ('dados', (), '"vendas.csv"'),
+        ('grandes', ('dados', 'valor'), None),
+        ('nomes', ('grandes',), None),
+        (None, ('nomes',), None),
+    ]
+    assert not any(s.is_expanded for s in program.statements[:3])
+    full = Parser(create_lexer(PROGRAMA)).parse()
+    assert [statement_dependencies(s) for s in full.statements] == \
+        [statement_dependencies(s) for s in program.statements]
+
+def test_inicio_e_posicao_dos_comandos():
+
+    parser = SkeletonParser(PROGRAMA)
+    program = parser.parse()
+    assert [PROGRAMA[start:start + 5] for start in parser.starts] == \
+        ['dados', 'grand', 'nomes', 'displ']
+    full = Parser(create_lexer(PROGRAMA)).parse()
+    assert FlatAST.from_ast(program).lines == FlatAST.from_ast(full).lines
+    assert FlatAST.from_ast(program).cols == FlatAST.from_ast(full).cols
+
+def test_analise_semantica_da_ast_esqueleto():
+
+    success, errors, _ = SemanticAnalyzer().analyze(parse_skeleton(PROGRAMA))
+    assert success and not errors
+    success, errors, _ = SemanticAnalyzer().analyze(parse_skeleton('a = select b (c)'))
+    assert not success and (errors[0].line, errors[0].col) == (1, 5)
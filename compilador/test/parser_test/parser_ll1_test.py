@@ -0,0 +1,115 @@
+import os
+import pickle
+import random
+import sys
+
+import pytest
+from lib.parser.descendente.tabela_parsing import (EPSILON, Gramatica, carregar_tabela,
+                                                   construir_tabela, salvar_tabela)
+from lib.parser.descendente.parser_ll1 import CAMINHO_TABELA, GRAMATICA, ParserLL1
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser
+from fast_lexer import create_lexer
+
+
+# Gramática de expressões clássica, sem recursão à esquerda
+EXPRESSOES = Gramatica((
+    ('E', ('T', 'E2')),
+    ('E2', ('MAIS', 'T', 'E2')),
+    ('E2', ()),
+    ('T', ('F', 'T2')),
+    ('T2', ('VEZES', 'F', 'T2')),
+    ('T2', ()),
+    ('F', ('ABRE', 'E', 'FECHA')),
+    ('F', ('ID',)),
+))
+
+PROGRAMA = '''dados = load "vendas.csv"
+# filtra as vendas grandes
+grandes = filter dados where valor >= 100.5
+nomes = select grandes (cliente, valor, data)
+iguais = filter nomes where cliente == "Ana"
+display iguais
+'''
+
+
+def analisa(parser_class, source):
+    try:
+        return repr(parser_class(create_lexer(source)).parse())
+    except (SyntaxError, ValueError) as e:
+        return f'{type(e).__name__}: {e}'
+
+def test_calcula_first_e_follow():
+
+    assert EXPRESSOES.primeiros['E'] == {'ABRE', 'ID'}
+    assert EXPRESSOES.primeiros['E2'] == {'MAIS', EPSILON}
+    assert EXPRESSOES.seguidores['E'] == {'FECHA', 'EOF'}
+    assert EXPRESSOES.seguidores['T'] == {'MAIS', 'FECHA', 'EOF'}
+    assert EXPRESSOES.seguidores['F'] == {'VEZES', 'MAIS', 'FECHA', 'EOF'}
+
+def test_tabela_usa_follow_nas_producoes_vazias():
+
+    tabela = construir_tabela(EXPRESSOES)
+    assert tabela['E2'] == {'MAIS': 1, 'FECHA': 2, 'EOF': 2}
+    assert tabela['F'] == {'ABRE': 6, 'ID': 7}
+
+def test_recusa_gramatica_com_conflito():
+
+    recursiva = Gramatica((('E', ('E', 'MAIS', 'ID')), ('E', ('ID',))))
+    with pytest.raises(ValueError, match="não é LL\\(1\\)"):
+        construir_tabela(recursiva)
+
+def test_tabela_em_disco_esta_atualizada():
+
+    with open(CAMINHO_TABELA, 'rb') as f:
+        dados = pickle.load(f)
+    assert dados['hash'] == GRAMATICA.hash()
+    assert dados['tabela'] == construir_tabela(GRAMATICA)
+
+def test_tabela_de_outra_gramatica_e_recalculada(tmp_path):
+
+    caminho = str(tmp_path / 'tabela.pickle')
+    salvar_tabela(EXPRESSOES, caminho)
+    assert carregar_tabela(GRAMATICA, caminho) == construir_tabela(GRAMATICA)
+    assert carregar_tabela(EXPRESSOES, caminho) == construir_tabela(EXPRESSOES)
+
+def test_constroi_mesma_ast_que_o_parser_recursivo():
+
+    assert analisa(ParserLL1, PROGRAMA) == analisa(Parser, PROGRAMA)
+    assert analisa(ParserLL1, '') == 'Program([])'
+
+@pytest.mark.parametrize("source", [
+    'x = load 5',
+    'x = 5',
+    'display',
+    '= load "a.csv"',
+    'y = select x (a, b',
+    'y = select x (a b)',
+    'y = filter x where a b',
+    'y = filter x where > 1',
+])
+def test_mesmas_mensagens_de_erro(source):
+
+    assert analisa(ParserLL1, source) == analisa(Parser, source)
+    assert analisa(ParserLL1, source).startswith('SyntaxError')
+
+def test_equivalente_em_sequencias_aleatorias():
+
+    words = ['display', 'x', '=', 'load', '"a.csv"', 'filter', 'where', 'select',
+             '(', ')', ',', '>', '>=', '==', '!=', '5', '1.5', '\n']
+    rng = random.Random(11)
+    for _ in range(2000):
+        source = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        assert analisa(ParserLL1, source) == analisa(Parser, source), repr(source)
+
+def test_programa_longo_sem_recursao():
+
+    source = 'x = load "a.csv"\n' * 50_000 + 'display x'
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(100)
+    try:
+        ast = ParserLL1(create_lexer(source)).parse()
+    finally:
+        sys.setrecursionlimit(limit)
+    assert len(ast.statements) == 50_001
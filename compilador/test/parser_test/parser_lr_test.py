@@ -0,0 +1,82 @@
+import os
+import pickle
+import random
+import sys
+
+import pytest
+from lib.parser.descendente.tabela_parsing import Gramatica
+from lib.parser.ascendente.parser_lr import (CAMINHO_TABELA, GRAMATICA, ParserLR,
+                                             construir_tabela_lalr)
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser
+from fast_lexer import create_lexer
+
+
+# Exemplo clássico de gramática LALR(1) que não é SLR(1)
+ATRIBUICOES = Gramatica((
+    ('S', ('L', 'IGUAL', 'R')),
+    ('S', ('R',)),
+    ('L', ('ESTRELA', 'R')),
+    ('L', ('ID',)),
+    ('R', ('L',)),
+))
+
+PROGRAMA = '''dados = load "vendas.csv"
+grandes = filter dados where valor >= 100.5
+nomes = select grandes (cliente, valor, data)
+display nomes
+'''
+
+
+def analisa(parser_class, source):
+    try:
+        return repr(parser_class(create_lexer(source)).parse())
+    except (SyntaxError, ValueError) as e:
+        return f'{type(e).__name__}: {e}'
+
+def test_gera_tabela_lalr_sem_conflitos():
+
+    tabela = construir_tabela_lalr(ATRIBUICOES)
+    # No estado após 'L' o LALR reduz R -> L só diante do fim da entrada
+    estado = tabela['desvios'][0]['L']
+    assert set(tabela['acoes'][estado]) == {'IGUAL', 'EOF'}
+    assert tabela['acoes'][estado]['IGUAL'][0] == 'empilha'
+    assert tabela['acoes'][estado]['EOF'] == ('reduz', 4)
+
+def test_recusa_gramatica_ambigua():
+
+    ambigua = Gramatica((('E', ('E', 'MAIS', 'E')), ('E', ('ID',))))
+    with pytest.raises(ValueError, match="não é LALR\\(1\\)"):
+        construir_tabela_lalr(ambigua)
+
+def test_tabela_em_disco_esta_atualizada():
+
+    with open(CAMINHO_TABELA, 'rb') as f:
+        dados = pickle.load(f)
+    assert dados['hash'] == GRAMATICA.hash()
+    assert dados['tabela'] == construir_tabela_lalr(GRAMATICA)
+
+def test_constroi_mesma_ast_que_o_parser_recursivo():
+
+    assert analisa(ParserLR, PROGRAMA) == analisa(Parser, PROGRAMA)
+    assert analisa(ParserLR, '') == 'Program([])'
+
+@pytest.mark.parametrize("source", [
+    'x = load 5',
+    'display',
+    '= load "a.csv"',
+    'y = filter x where > 1',
+])
+def test_mesmas_mensagens_de_erro(source):
+
+    assert analisa(ParserLR, source) == analisa(Parser, source)
+
+def test_equivalente_em_sequencias_aleatorias():
+
+    words = ['display', 'x', '=', 'load', '"a.csv"', 'filter', 'where', 'select',
+             '(', ')', ',', '>', '>=', '==', '!=', '5', '1.5', '\n']
+    rng = random.Random(12)
+    for _ in range(2000):
+        source = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        assert analisa(ParserLR, source) == analisa(Parser, source), repr(source)
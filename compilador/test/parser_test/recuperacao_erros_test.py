@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser, AssignmentStatementNode, DisplayStatementNode
+from fast_lexer import create_lexer
+from token_buffer import tokenize_all
+
+
+def recupera(source):
+    parser = Parser(create_lexer(source), recover=True)
+    ast = parser.parse()
+    return ast, [str(e) for e in parser.errors]
+
+def test_programa_valido_nao_tem_erros():
+
+    source = 'dados = load "a.csv"\ndisplay dados'
+    ast, errors = recupera(source)
+    assert errors == []
+    assert repr(ast) == repr(Parser(create_lexer(source)).parse())
+
+def test_reporta_todos_os_erros_em_uma_passada():
+
+    source = ('dados = load 42\n'
+              'ok = load "a.csv"\n'
+              'sel = select ok (a b)\n'
+              'f = filter ok where valor > 10\n'
+              '123 lixo\n'
+              'display f\n')
+    ast, errors = recupera(source)
+    assert len(errors) == 3
+    assert "Esperava 'STRING', mas encontrou '42' (NUMBER) na linha 1" in errors[0]
+    assert "Esperava 'RPAREN', mas encontrou 'b' (IDENTIFIER) na linha 3" in errors[1]
+    assert "Comando inválido" in errors[2] and "'123' (NUMBER) na linha 5" in errors[2]
+    assert [type(stmt) for stmt in ast.statements] == [
+        AssignmentStatementNode, AssignmentStatementNode, DisplayStatementNode]
+    assert [stmt.identifier for stmt in ast.statements] == ['ok', 'f', 'f']
+
+def test_sincroniza_em_identificador_seguido_de_atribuicao():
+
+    ast, errors = recupera('x = filter d where a b c = load "c.csv"')
+    assert len(errors) == 1
+    assert repr(ast) == 'Program([Assignment(c = Load("c.csv"))])'
+
+def test_primeiro_erro_igual_ao_do_modo_normal():
+
+    source = 'x = load "a.csv"\ny = filter x where > 1\ndisplay y'
+    with pytest.raises(SyntaxError) as excinfo:
+        Parser(create_lexer(source)).parse()
+    _, errors = recupera(source)
+    assert errors == [str(excinfo.value)]
+
+def test_erro_lexico_encerra_com_ast_parcial():
+
+    ast, errors = recupera('x = load "a.csv"\ny = load 5\nz = $\ndisplay x')
+    assert len(errors) == 2
+    assert "NUMBER" in errors[0]
+    assert "linha 3" in errors[1]
+    assert len(ast.statements) == 1
+
+def test_recupera_com_buffer_de_tokens():
+
+    parser = Parser(tokenize_all('a = load\ndisplay a\nb = select a (x)'), recover=True)
+    ast = parser.parse()
+    assert len(parser.errors) == 1
+    assert len(ast.statements) == 2
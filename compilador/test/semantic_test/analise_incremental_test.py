@@ -0,0 +1,123 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import Parser, ProgramNode
+from fast_lexer import create_lexer
+from semantic_analyzer import SemanticAnalyzer
+import incremental_semantic
+from incremental_semantic import IncrementalSemanticAnalyzer
+
+PROGRAMA = '''dados = load "vendas.csv"
+grandes = filter dados where valor > 100
+nomes = select grandes (cliente)
+outros = select dados (valor)
+display nomes
+'''
+
+
+def comandos(source):
+    return Parser(create_lexer(source)).parse().statements
+
+def resumo(result):
+    success, errors, info = result
+    return (success, [str(error) for error in errors], info['warnings'],
+            {name: (symbol.type, symbol.usage_count) for name, symbol in info['symbol_table'].items()},
+            info['statistics'])
+
+def analise_completa(statements):
+    return resumo(SemanticAnalyzer().analyze(ProgramNode(list(statements))))
+
+def test_resultado_inicial_igual_ao_da_analise_completa():
+
+    analyzer = IncrementalSemanticAnalyzer(Parser(create_lexer(PROGRAMA)).parse())
+    assert resumo(analyzer.result()) == analise_completa(comandos(PROGRAMA))
+    assert analyzer.success
+
+def test_so_os_dependentes_sao_reverificados():
+
+    analyzer = IncrementalSemanticAnalyzer(Parser(create_lexer(PROGRAMA)).parse())
+    # A nova condição não muda o que `grandes` declara: só ele e quem o lia
+    # na versão removida (o select de `nomes`) são verificados
+    rechecked = analyzer.edit(1, 2, comandos('grandes = filter dados where valor < 5'))
+    assert [state.statement.identifier for state in rechecked] == ['grandes', 'nomes']
+
+    # Renomear o load invalida quem lia `dados` e, transitivamente, os
+    # dependentes de `grandes` e de `nomes`, que deixam de ser declarados
+    rechecked = analyzer.edit(0, 1, comandos('base = load "vendas.csv"'))
+    assert [state.statement.identifier for state in rechecked] == \
+        ['base', 'grandes', 'nomes', 'outros', 'nomes']
+    assert not analyzer.success
+    assert [str(error) for error in rechecked[1].errors] == \
+        ["[FilterExpression] Dataset 'dados' não foi declarado (Contexto: dados) na linha 1, coluna 11",
+         "[AssignmentStatement] Erro na expressão atribuída à variável 'grandes' "
+         "(Contexto: grandes) na linha 1, coluna 1"]
+
+    # Um display novo só verifica a si mesmo
+    rechecked = analyzer.edit(5, 5, comandos('display base'))
+    assert [state.statement.identifier for state in rechecked] == ['base']
+    assert resumo(analyzer.result()) == analise_completa(analyzer.statements)
+
+def test_redeclaracao_removida_libera_a_seguinte():
+
+    analyzer = IncrementalSemanticAnalyzer(
+        Parser(create_lexer('a = load "x.csv"\na = load "y.csv"\ndisplay a')).parse())
+    assert not analyzer.success
+    analyzer.edit(0, 1, [])
+    assert analyzer.success
+    assert resumo(analyzer.result()) == analise_completa(analyzer.statements)
+
+def test_insercoes_no_mesmo_ponto_renumeram_as_chaves():
+
+    analyzer = IncrementalSemanticAnalyzer(Parser(create_lexer(PROGRAMA)).parse())
+    for i in range(60):
+        analyzer.edit(1, 1, comandos('display dados'))
+    keys = [state.key for state in analyzer.states]
+    assert keys == sorted(set(keys))
+    assert resumo(analyzer.result()) == analise_completa(analyzer.statements)
+
+def test_insercao_maior_que_a_distancia_entre_chaves(monkeypatch):
+
+    monkeypatch.setattr(incremental_semantic, 'KEY_GAP', 4)
+    analyzer = IncrementalSemanticAnalyzer(Parser(create_lexer(PROGRAMA)).parse())
+    analyzer.edit(1, 2, comandos('display dados\n' * 50))
+    analyzer.edit(2, 2, comandos('display dados\n' * 200))
+    keys = [state.key for state in analyzer.states]
+    assert len(keys) == 254 and keys == sorted(set(keys))
+    assert resumo(analyzer.result()) == analise_completa(analyzer.statements)
+
+def test_edicoes_aleatorias_equivalem_a_analise_completa():
+
+    rng = random.Random(11)
+    names = ['a', 'b', 'valor']
+
+    def comando():
+        target, dataset = rng.choice(names), rng.choice(names)
+        return rng.choice([
+            f'{target} = load "x.csv"',
+            f'{target} = load "x.bin"',
+            f'{target} = filter {dataset} where {rng.choice(names + ["1"])} > {rng.choice(names + ["2"])}',
+            f'{target} = filter {dataset} where {rng.choice(names)} == "s"',
+            f'{target} = select {dataset} (q)',
+            f'display {dataset}',
+        ])
+
+    for _ in range(60):
+        lines = [comando() for _ in range(rng.randrange(8))]
+        analyzer = IncrementalSemanticAnalyzer(Parser(create_lexer('\n'.join(lines))).parse())
+        for _ in range(15):
+            start = rng.randrange(len(lines) + 1)
+            stop = rng.randrange(start, min(len(lines), start + 2) + 1)
+            new = [comando() for _ in range(rng.randrange(3))]
+            lines[start:stop] = new
+            analyzer.edit(start, stop, comandos('\n'.join(new)) if new else [])
+            assert resumo(analyzer.result()) == analise_completa(analyzer.statements), lines
+
+def test_faixa_invalida():
+
+    analyzer = IncrementalSemanticAnalyzer(Parser(create_lexer(PROGRAMA)).parse())
+    with pytest.raises(ValueError):
+        analyzer.edit(3, 9, [])
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'lexer'))
+from parser import NodeVisitor, Parser, DisplayStatementNode, ProgramNode, TermNode
+from fast_lexer import create_lexer
+from semantic_analyzer import SemanticAnalyzer
+from coffee_interpreter import CoffeeInterpreter
+
+
+class Contador(NodeVisitor):
+
+    def __init__(self):
+        self.visitados = []
+
+    def visit_ProgramNode(self, node):
+        for statement in node.statements:
+            self.visit(statement)
+
+    def visit_DisplayStatementNode(self, node):
+        self.visitados.append(node.identifier)
+
+class ContadorDeTermos(Contador):
+
+    def visit_TermNode(self, node):
+        self.visitados.append(node.value)
+
+def test_handler_resolvido_uma_vez_por_classe(monkeypatch):
+
+    chamadas = []
+    original = Contador._resolve.__func__
+    monkeypatch.setattr(Contador, '_resolve',
+                        classmethod(lambda cls, node_class: chamadas.append(node_class) or
+                                    original(cls, node_class)))
+    Contador._dispatch.clear()
+    contador = Contador()
+    contador.visit(ProgramNode([DisplayStatementNode('a'), DisplayStatementNode('b')]))
+    contador.visit(DisplayStatementNode('c'))
+    assert contador.visitados == ['a', 'b', 'c']
+    assert chamadas == [ProgramNode, DisplayStatementNode]
+
+def test_cada_subclasse_tem_a_sua_tabela():
+
+    assert ContadorDeTermos._dispatch is not Contador._dispatch
+    contador = ContadorDeTermos()
+    contador.visit(TermNode('1', 'NUMBER'))
+    assert contador.visitados == ['1']
+    with pytest.raises(NotImplementedError):
+        Contador().visit(TermNode('1', 'NUMBER'))
+
+def test_generic_visit_da_subclasse():
+
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(object())
+    assert "Nó não implementado: object" in str(analyzer.errors[0])
+
+def test_analise_e_execucao_pela_tabela():
+
+    ast = Parser(create_lexer('dados = load "vendas.csv"\nnomes = select dados (produto)')).parse()
+    success, errors, _ = SemanticAnalyzer().analyze(ast)
+    assert success and not errors
+    result = CoffeeInterpreter().interpret(ast)
+    assert result['success'] and set(result['environment']) == {'dados', 'nomes'}
+    assert set(CoffeeInterpreter._dispatch) >= {ProgramNode, type(ast.statements[0]),
+                                                 type(ast.statements[0].expression)}
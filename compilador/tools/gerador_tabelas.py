@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GERADOR DE TABELAS LÉXICAS
+==========================
+
+Converte as definições regulares da especificação léxica da linguagem
+Coffee (docs/Linguagens Regulares e Expressões Regulares.md) em um AFN
+pela construção de Thompson, determiniza e minimiza o resultado com
+`afn_to_afd` e grava um módulo Python congelado (lexer/tabelas_lexicas.py)
+com tabelas compactas em tuplas e bytes.
+
+O lexer importa esse módulo na inicialização (CompiledDFA.from_tables),
+sem montar dicionários nem classes de caracteres em tempo de execução.
+O módulo gerado carrega o hash das definições que o originaram; use
+`--verificar` para conferir se ele está atualizado.
+
+Uso:
+    python tools/gerador_tabelas.py [--saida ARQUIVO] [--verificar]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+LEXER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lexer')
+sys.path.append(LEXER_DIR)
+from parser import KEYWORDS, CompiledDFA, get_char_class
+from afn_to_afd import NFA, convert_nfa_to_dfa, minimize_dfa
+
+GENERATOR_VERSION = 1
+
+DEFAULT_OUTPUT = os.path.join(LEXER_DIR, 'tabelas_lexicas.py')
+
+# Letras que aparecem em palavras-chave precisam de colunas próprias
+KEYWORD_LETTERS = tuple(sorted(set(''.join(KEYWORDS))))
+
+# Alfabeto das tabelas: as classes de get_char_class, com os caracteres
+# que o AFD cita literalmente ('"', ',' e as letras das palavras-chave)
+# em colunas próprias
+SYMBOLS = ('letra', 'digito', 'ponto', 'espaco', 'novalinha', '"', '(', ')',
+           '#', '>', '<', '=', '!', ',', 'outro') + KEYWORD_LETTERS
+
+# Classes usadas nas definições ({nome}) que cobrem mais de um símbolo
+CLASS_SYMBOLS = {'letra': ('letra',) + KEYWORD_LETTERS}
+
+# Definições regulares, em ordem de prioridade (a primeira vence em caso de empate).
+# Sintaxe: {classe}, caractere, \escape, [conjunto], [^complemento], ( ), |, *, +, ?
+REGULAR_DEFINITIONS = tuple(
+    (token_type.name, keyword) for keyword, token_type in KEYWORDS.items()
+) + (
+    ('IDENTIFIER', '{letra}({letra}|{digito})*'),
+    ('NUMBER', '{digito}+(.{digito}+)?'),
+    ('GE', '>='),
+    ('GT', '>'),
+    ('LE', '<='),
+    ('LT', '<'),
+    ('EQEQ', '=='),
+    ('ASSIGN', '='),
+    ('NE', '!='),
+    ('STRING', '"[^"]*"'),
+    ('LPAREN', r'\('),
+    ('RPAREN', r'\)'),
+    ('COMMA', ','),
+    ('COMMENT', r'#[^#\n]*'),
+    ('WHITESPACE', '{espaco}+'),
+    ('NEWLINE', r'\n'),
+)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+
+def symbol_of(char):
+    """Símbolo do alfabeto das tabelas correspondente a um caractere"""
+    if char in SYMBOLS:
+        return char
+    char_class = get_char_class(char)
+    if char_class not in SYMBOLS:
+        raise ValueError(f"Caractere '{char}' não pertence ao alfabeto das tabelas")
+    return char_class
+
+
+class ThompsonBuilder:
+    """Constrói um AFN de Thompson a partir das definições regulares"""
+
+    def __init__(self):
+        self.transitions = {}
+        self.num_states = 0
+
+    def new_state(self):
+        self.num_states += 1
+        return self.num_states - 1
+
+    def add(self, source, symbol, target):
+        self.transitions.setdefault((source, symbol), set()).add(target)
+
+    def symbol_fragment(self, symbols):
+        start, end = self.new_state(), self.new_state()
+        for symbol in symbols:
+            self.add(start, symbol, end)
+        return start, end
+
+    def compile(self, pattern):
+        """Retorna o fragmento (início, fim) do AFN que reconhece `pattern`"""
+        self.pattern = pattern
+        self.pos = 0
+        fragment = self._alternation()
+        if self.pos != len(pattern):
+            raise ValueError(f"Definição regular inválida: '{pattern}' (posição {self.pos})")
+        return fragment
+
+    def _peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _alternation(self):
+        fragments = [self._concatenation()]
+        while self._peek() == '|':
+            self.pos += 1
+            fragments.append(self._concatenation())
+        if len(fragments) == 1:
+            return fragments[0]
+        start, end = self.new_state(), self.new_state()
+        for fragment_start, fragment_end in fragments:
+            self.add(start, '', fragment_start)
+            self.add(fragment_end, '', end)
+        return start, end
+
+    def _concatenation(self):
+        fragment = None
+        while self._peek() not in (None, '|', ')'):
+            next_fragment = self._repetition()
+            if fragment is None:
+                fragment = next_fragment
+            else:
+                self.add(fragment[1], '', next_fragment[0])
+                fragment = (fragment[0], next_fragment[1])
+        if fragment is None:
+            state = self.new_state()
+            fragment = (state, state)
+        return fragment
+
+    def _repetition(self):
+        inner_start, inner_end = self._atom()
+        operator = self._peek()
+        if operator not in ('*', '+', '?'):
+            return inner_start, inner_end
+        self.pos += 1
+        start, end = self.new_state(), self.new_state()
+        self.add(start, '', inner_start)
+        self.add(inner_end, '', end)
+        if operator in ('*', '?'):
+            self.add(start, '', end)
+        if operator in ('*', '+'):
+            self.add(inner_end, '', inner_start)
+        return start, end
+
+    def _atom(self):
+        char = self._peek()
+        if char == '(':
+            self.pos += 1
+            fragment = self._alternation()
+            self._expect(')')
+            return fragment
+        if char == '[':
+            return self.symbol_fragment(self._charset())
+        return self.symbol_fragment(self._symbols())
+
+    def _charset(self):
+        self._expect('[')
+        negated = self._peek() == '^'
+        if negated:
+            self.pos += 1
+        symbols = set()
+        while self._peek() != ']':
+            if self._peek() is None:
+                raise ValueError(f"Conjunto não fechado em '{self.pattern}'")
+            symbols.update(self._symbols())
+        self.pos += 1
+        if negated:
+            return [symbol for symbol in SYMBOLS if symbol not in symbols]
+        return sorted(symbols)
+
+    def _symbols(self):
+        """Símbolos do alfabeto denotados pelo próximo átomo"""
+        char = self._peek()
+        if char is None:
+            raise ValueError(f"Definição regular incompleta: '{self.pattern}'")
+        if char == '{':
+            end = self.pattern.index('}', self.pos)
+            name = self.pattern[self.pos + 1:end]
+            if name not in SYMBOLS:
+                raise ValueError(f"Classe de caracteres desconhecida: '{name}'")
+            self.pos = end + 1
+            return list(CLASS_SYMBOLS.get(name, (name,)))
+        if char == '\\':
+            char = self.pattern[self.pos + 1]
+            self.pos += 2
+            return [symbol_of(ESCAPES.get(char, char))]
+        self.pos += 1
+        return [symbol_of(char)]
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Esperava '{char}' em '{self.pattern}' (posição {self.pos})")
+        self.pos += 1
+
+
+def build_nfa(definitions=REGULAR_DEFINITIONS):
+    """AFN com um estado inicial ligado por épsilon a cada definição regular"""
+    builder = ThompsonBuilder()
+    start = builder.new_state()
+    token_types = {}
+    for token_type, pattern in definitions:
+        fragment_start, fragment_end = builder.compile(pattern)
+        builder.add(start, '', fragment_start)
+        token_types[fragment_end] = token_type
+    return NFA(set(range(builder.num_states)), set(SYMBOLS), builder.transitions,
+               start, set(token_types), token_types)
+
+def definitions_hash(definitions=REGULAR_DEFINITIONS):
+    """Hash que identifica a versão das tabelas geradas"""
+    content = repr((GENERATOR_VERSION, CompiledDFA.TABLE_FORMAT, SYMBOLS, tuple(definitions)))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def build_tables(definitions=REGULAR_DEFINITIONS):
+    """
+    Gera as tabelas no formato lido por CompiledDFA.from_tables:
+    uma linha (tupla) por estado, uma coluna por símbolo de SYMBOLS.
+    """
+    dfa = minimize_dfa(convert_nfa_to_dfa(build_nfa(definitions)))
+    state_names = sorted(dfa["states"], key=lambda name: int(name[1:]))
+    state_ids = {name: i for i, name in enumerate(state_names)}
+    symbol_ids = {symbol: i for i, symbol in enumerate(SYMBOLS)}
+
+    table = [[CompiledDFA.DEAD_STATE] * len(SYMBOLS) for _ in state_names]
+    for (state, symbol), target in dfa["transitions"].items():
+        table[state_ids[state]][symbol_ids[symbol]] = state_ids[target]
+
+    # Estado em que o AFD fica parado dentro de uma string sem as aspas finais
+    string_state = dfa["transitions"].get((dfa["start_state"], '"'))
+
+    return {
+        'TABLES_HASH': definitions_hash(definitions),
+        'TABLE_FORMAT': CompiledDFA.TABLE_FORMAT,
+        'SYMBOLS': SYMBOLS,
+        'ASCII_CLASSES': bytes(symbol_ids[symbol_of(chr(code))] for code in range(128)),
+        'NAMED_CLASSES': {name: symbol_ids[name] for name in ('letra', 'digito', 'outro')},
+        'TABLE': tuple(tuple(row) for row in table),
+        'ACCEPTING': tuple(dfa["token_types"].get(name) for name in state_names),
+        'UNCLOSED_STRING_STATE': state_ids[string_state] if string_state else CompiledDFA.DEAD_STATE,
+    }
+
+def render_module(tables):
+    """Texto do módulo Python congelado com as tabelas"""
+    lines = [
+        '"""',
+        'TABELAS LÉXICAS PRÉ-COMPILADAS DA LINGUAGEM COFFEE',
+        '',
+        'Arquivo gerado por tools/gerador_tabelas.py - não edite manualmente.',
+        'Para regenerar: python tools/gerador_tabelas.py',
+        '"""',
+        '',
+        f"TABLES_HASH = {tables['TABLES_HASH']!r}",
+        f"TABLE_FORMAT = {tables['TABLE_FORMAT']!r}",
+        '',
+        f"SYMBOLS = {tables['SYMBOLS']!r}",
+        '',
+        f"ASCII_CLASSES = {tables['ASCII_CLASSES']!r}",
+        '',
+        f"NAMED_CLASSES = {tables['NAMED_CLASSES']!r}",
+        '',
+        '# Uma linha por estado (o inicial é o 0), uma coluna por símbolo; -1 = sem transição',
+        'TABLE = (',
+    ]
+    lines += [f'    {row!r},' for row in tables['TABLE']]
+    lines += [
+        ')',
+        '',
+        f"ACCEPTING = {tables['ACCEPTING']!r}",
+        '',
+        f"UNCLOSED_STRING_STATE = {tables['UNCLOSED_STRING_STATE']!r}",
+        '',
+    ]
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as tabelas léxicas pré-compiladas da Coffee")
+    parser.add_argument('--saida', default=DEFAULT_OUTPUT, help="Módulo Python a ser gerado")
+    parser.add_argument('--verificar', action='store_true',
+                        help="Apenas confere se o módulo existente está atualizado")
+    args = parser.parse_args()
+
+    tables = build_tables()
+    source = render_module(tables)
+
+    if args.verificar:
+        try:
+            with open(args.saida, 'r', encoding='utf-8') as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current != source:
+            print(f"Tabelas desatualizadas: {args.saida}")
+            sys.exit(1)
+        print(f"Tabelas atualizadas ({tables['TABLES_HASH'][:12]})")
+        return
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        f.write(source)
+    print(f"{len(tables['TABLE'])} estados x {len(SYMBOLS)} símbolos gravados em {args.saida} "
+          f"({tables['TABLES_HASH'][:12]})")
+
+if __name__ == '__main__':
+    main()